@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import GrammarLesson, GrammarProgress
+from .models import GrammarLesson, GrammarMistake, GrammarProgress
 
 
 @admin.register(GrammarLesson)
@@ -26,3 +26,15 @@ class GrammarProgressAdmin(admin.ModelAdmin):
         "updated_at",
     )
     list_filter = ("lesson__level",)
+
+
+@admin.register(GrammarMistake)
+class GrammarMistakeAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "user",
+        "question",
+        "wrong_count",
+        "last_wrong_at",
+    )
+    raw_id_fields = ("user", "question")
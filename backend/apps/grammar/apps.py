@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GrammarConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.grammar"
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
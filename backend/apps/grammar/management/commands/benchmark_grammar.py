@@ -0,0 +1,121 @@
+"""
+Benchmark danh sách / chi tiết bài ngữ pháp và bộ luyện tập trên bộ dữ liệu tổng hợp.
+Chạy: python manage.py benchmark_grammar
+      python manage.py benchmark_grammar --write-budgets   (ghi lại budget mới)
+
+Dữ liệu được tạo trong một transaction và rollback khi kết thúc,
+không để lại gì trong database.
+"""
+from pathlib import Path
+
+from apps.accounts.models import User
+from apps.study.benchmarking import ORDER_OFFSET, BenchmarkCommand, measure, merge_worst
+from apps.study.models import Question, Choice
+from apps.grammar.models import GrammarLesson, GrammarMistake, GrammarProgress
+from apps.grammar.views import GrammarLessonListView, GrammarLessonDetailView, GrammarPracticeSetView
+
+
+LEVELS = ['N5', 'N4', 'N3', 'N2', 'N1']
+
+
+class Command(BenchmarkCommand):
+    help = 'Đo số query, thời gian và bộ nhớ của các API ngữ pháp, so với budget trong repo'
+    budgets_path = Path(__file__).resolve().parents[2] / 'benchmark_budgets.json'
+    label = 'ngữ pháp'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--lessons-per-level', type=int, default=200)
+        parser.add_argument('--questions-per-lesson', type=int, default=10)
+
+    # =========================
+    # SEED
+    # =========================
+    def seed_catalog(self):
+        opts = self.options
+        self.stdout.write('Đang tạo dữ liệu tổng hợp...')
+
+        self.lessons = {}
+        self.question_ids = []
+        through = GrammarLesson.questions.through
+
+        for level in LEVELS:
+            lessons = GrammarLesson.objects.bulk_create([
+                GrammarLesson(
+                    level=level,
+                    order=ORDER_OFFSET + i,
+                    title=f'Bench {level} {i}',
+                    grammar_point_count=3,
+                    content='',
+                )
+                for i in range(opts['lessons_per_level'])
+            ])
+            questions = Question.objects.bulk_create([
+                Question(prompt=f'{level}-{i}-{q}')
+                for i in range(len(lessons))
+                for q in range(opts['questions_per_lesson'])
+            ], batch_size=1000)
+            Choice.objects.bulk_create([
+                Choice(question=question, text=str(c), is_correct=c == 0)
+                for question in questions
+                for c in range(4)
+            ], batch_size=1000)
+            through.objects.bulk_create([
+                through(grammarlesson_id=lesson.pk, question_id=question.pk)
+                for index, lesson in enumerate(lessons)
+                for question in questions[
+                    index * opts['questions_per_lesson']:(index + 1) * opts['questions_per_lesson']
+                ]
+            ], batch_size=1000)
+            self.lessons[level] = lessons
+            self.question_ids.extend(question.pk for question in questions)
+
+    def seed_users(self):
+        users = []
+        for i in range(self.options['users']):
+            user = User.objects.create(email=f'bench-grammar-{i}@benchmark.local', full_name=f'Bench {i}')
+            progress = []
+            for level in LEVELS:
+                lessons = self.lessons[level]
+                for lesson in self.rng.sample(lessons, int(len(lessons) * self.rng.uniform(0.1, 0.9))):
+                    progress.append(GrammarProgress(
+                        user=user,
+                        lesson=lesson,
+                        correct_count=self.rng.randrange(self.options['questions_per_lesson'] + 1),
+                    ))
+            GrammarProgress.objects.bulk_create(progress, batch_size=1000)
+
+            # Câu sai rải khắp các level để bộ luyện tập phải trộn câu sai
+            GrammarMistake.objects.bulk_create([
+                GrammarMistake(user=user, question_id=question_id, wrong_count=self.rng.randrange(1, 5))
+                for question_id in self.rng.sample(self.question_ids, min(200, len(self.question_ids)))
+            ], batch_size=1000)
+            users.append(user)
+
+        self.stdout.write(
+            f'Đã tạo {len(users)} users, '
+            f'{GrammarProgress.objects.filter(user__in=users).count()} grammar progress'
+        )
+        return users
+
+    # =========================
+    # MEASURE
+    # =========================
+    def run_benchmarks(self, users):
+        repeat = self.options['repeat']
+        list_view = GrammarLessonListView.as_view()
+        detail_view = GrammarLessonDetailView.as_view()
+
+        endpoints = {'list:all': (list_view, {}, {})}
+        for level in LEVELS:
+            endpoints[f'list:{level}'] = (list_view, {'level': level}, {})
+        endpoints['detail'] = (detail_view, {}, {'pk': self.lessons[LEVELS[-1]][-1].pk})
+        # Bộ 30 câu bốc từ mảng id của level, không ORDER BY RANDOM() trên cả kho
+        endpoints['practice:30'] = (GrammarPracticeSetView.as_view(), {'level': 'N3', 'count': 30}, {})
+
+        results = {}
+        for name, (view, query, kwargs) in endpoints.items():
+            calls = [self.view_call(view, user, '/api/grammar/lessons/', query, **kwargs) for user in users]
+            self.check_repeated(name, calls[0])
+            results[name] = merge_worst([measure(call, repeat) for call in calls])
+        return results
@@ -1,7 +1,9 @@
 from django.core.management.base import BaseCommand
+from apps.study.catalog import schedule_catalog_bump
 from django.db import transaction
 from apps.grammar.models import GrammarLesson, GrammarProgress
-from apps.study.models import Question, Choice
+from apps.study.models import Question
+from apps.study.questions import get_or_create_question
 
 
 class Command(BaseCommand):
@@ -11,16 +13,17 @@ class Command(BaseCommand):
         parser.add_argument('--clear', action='store_true', help='Clear existing data before populating')
 
     def handle(self, *args, **options):
-        if options['clear']:
-            self.stdout.write('Clearing existing grammar data...')
-            GrammarProgress.objects.all().delete()
-            GrammarLesson.objects.all().delete()
-            Question.objects.filter(grammarlesson__isnull=False).delete()
-            self.stdout.write(self.style.SUCCESS('Data cleared'))
+        with transaction.atomic():
+            if options['clear']:
+                self.stdout.write('Clearing existing grammar data...')
+                GrammarProgress.objects.all().delete()
+                # Xóa câu hỏi trước khi xóa bài, sau đó không còn liên kết để lọc
+                Question.objects.filter(grammarlesson__isnull=False).delete()
+                GrammarLesson.objects.all().delete()
+                self.stdout.write(self.style.SUCCESS('Data cleared'))
 
-        self.stdout.write('Starting grammar data population...')
+            self.stdout.write('Starting grammar data population...')
         
-        with transaction.atomic():
             # N5 LESSONS
             self.create_n5_lessons()
             # N4 LESSONS
@@ -28,6 +31,10 @@ class Command(BaseCommand):
             # N3 LESSONS
             self.create_n3_lessons()
 
+            # Nội dung đã đổi -> thống kê catalog (số bài, số từ...) phải tính lại;
+            # version đổi một lần khi transaction commit
+            schedule_catalog_bump()
+
         self.stdout.write(self.style.SUCCESS('\nSuccessfully populated grammar data!'))
         self.stdout.write(f'Total lessons: {GrammarLesson.objects.count()}')
 
@@ -57,28 +64,25 @@ class Command(BaseCommand):
 '''
         )
         
-        q1 = Question.objects.create(prompt='私___学生です。')
-        Choice.objects.bulk_create([
-            Choice(question=q1, text='は', is_correct=True),
-            Choice(question=q1, text='が', is_correct=False),
-            Choice(question=q1, text='を', is_correct=False),
-            Choice(question=q1, text='に', is_correct=False),
+        q1 = get_or_create_question('私___学生です。', [
+            ('は', True),
+            ('が', False),
+            ('を', False),
+            ('に', False),
         ])
         
-        q2 = Question.objects.create(prompt='これ___本です。')
-        Choice.objects.bulk_create([
-            Choice(question=q2, text='は', is_correct=True),
-            Choice(question=q2, text='も', is_correct=False),
-            Choice(question=q2, text='が', is_correct=False),
-            Choice(question=q2, text='で', is_correct=False),
+        q2 = get_or_create_question('これ___本です。', [
+            ('は', True),
+            ('も', False),
+            ('が', False),
+            ('で', False),
         ])
         
-        q3 = Question.objects.create(prompt='山田さん___日本人です。')
-        Choice.objects.bulk_create([
-            Choice(question=q3, text='は', is_correct=True),
-            Choice(question=q3, text='の', is_correct=False),
-            Choice(question=q3, text='を', is_correct=False),
-            Choice(question=q3, text='へ', is_correct=False),
+        q3 = get_or_create_question('山田さん___日本人です。', [
+            ('は', True),
+            ('の', False),
+            ('を', False),
+            ('へ', False),
         ])
         
         lesson1.questions.add(q1, q2, q3)
@@ -106,28 +110,25 @@ class Command(BaseCommand):
 '''
         )
         
-        q1 = Question.objects.create(prompt='これは田中さん___本です。')
-        Choice.objects.bulk_create([
-            Choice(question=q1, text='の', is_correct=True),
-            Choice(question=q1, text='は', is_correct=False),
-            Choice(question=q1, text='が', is_correct=False),
-            Choice(question=q1, text='を', is_correct=False),
+        q1 = get_or_create_question('これは田中さん___本です。', [
+            ('の', True),
+            ('は', False),
+            ('が', False),
+            ('を', False),
         ])
         
-        q2 = Question.objects.create(prompt='日本___料理が好きです。')
-        Choice.objects.bulk_create([
-            Choice(question=q2, text='の', is_correct=True),
-            Choice(question=q2, text='で', is_correct=False),
-            Choice(question=q2, text='に', is_correct=False),
-            Choice(question=q2, text='と', is_correct=False),
+        q2 = get_or_create_question('日本___料理が好きです。', [
+            ('の', True),
+            ('で', False),
+            ('に', False),
+            ('と', False),
         ])
         
-        q3 = Question.objects.create(prompt='私___車は白いです。')
-        Choice.objects.bulk_create([
-            Choice(question=q3, text='の', is_correct=True),
-            Choice(question=q3, text='は', is_correct=False),
-            Choice(question=q3, text='が', is_correct=False),
-            Choice(question=q3, text='も', is_correct=False),
+        q3 = get_or_create_question('私___車は白いです。', [
+            ('の', True),
+            ('は', False),
+            ('が', False),
+            ('も', False),
         ])
         
         lesson2.questions.add(q1, q2, q3)
@@ -165,36 +166,32 @@ class Command(BaseCommand):
 '''
         )
         
-        q1 = Question.objects.create(prompt='毎日学校へ___。(Hằng ngày đi đến trường)')
-        Choice.objects.bulk_create([
-            Choice(question=q1, text='行きます', is_correct=True),
-            Choice(question=q1, text='行きました', is_correct=False),
-            Choice(question=q1, text='行きません', is_correct=False),
-            Choice(question=q1, text='行く', is_correct=False),
+        q1 = get_or_create_question('毎日学校へ___。(Hằng ngày đi đến trường)', [
+            ('行きます', True),
+            ('行きました', False),
+            ('行きません', False),
+            ('行く', False),
         ])
         
-        q2 = Question.objects.create(prompt='昨日映画を___。(Hôm qua đã xem phim)')
-        Choice.objects.bulk_create([
-            Choice(question=q2, text='見ました', is_correct=True),
-            Choice(question=q2, text='見ます', is_correct=False),
-            Choice(question=q2, text='見る', is_correct=False),
-            Choice(question=q2, text='見て', is_correct=False),
+        q2 = get_or_create_question('昨日映画を___。(Hôm qua đã xem phim)', [
+            ('見ました', True),
+            ('見ます', False),
+            ('見る', False),
+            ('見て', False),
         ])
         
-        q3 = Question.objects.create(prompt='今日は朝ごはんを___。(Hôm nay không ăn sáng)')
-        Choice.objects.bulk_create([
-            Choice(question=q3, text='食べませんでした', is_correct=True),
-            Choice(question=q3, text='食べません', is_correct=False),
-            Choice(question=q3, text='食べました', is_correct=False),
-            Choice(question=q3, text='食べます', is_correct=False),
+        q3 = get_or_create_question('今日は朝ごはんを___。(Hôm nay không ăn sáng)', [
+            ('食べませんでした', True),
+            ('食べません', False),
+            ('食べました', False),
+            ('食べます', False),
         ])
         
-        q4 = Question.objects.create(prompt='明日友達に___。(Ngày mai sẽ gặp bạn)')
-        Choice.objects.bulk_create([
-            Choice(question=q4, text='会います', is_correct=True),
-            Choice(question=q4, text='会いました', is_correct=False),
-            Choice(question=q4, text='会う', is_correct=False),
-            Choice(question=q4, text='会って', is_correct=False),
+        q4 = get_or_create_question('明日友達に___。(Ngày mai sẽ gặp bạn)', [
+            ('会います', True),
+            ('会いました', False),
+            ('会う', False),
+            ('会って', False),
         ])
         
         lesson3.questions.add(q1, q2, q3, q4)
@@ -230,28 +227,25 @@ class Command(BaseCommand):
 '''
         )
         
-        q1 = Question.objects.create(prompt='ちょっと___ください。(Xin hãy chờ một chút)')
-        Choice.objects.bulk_create([
-            Choice(question=q1, text='待って', is_correct=True),
-            Choice(question=q1, text='待ち', is_correct=False),
-            Choice(question=q1, text='待つ', is_correct=False),
-            Choice(question=q1, text='待った', is_correct=False),
+        q1 = get_or_create_question('ちょっと___ください。(Xin hãy chờ một chút)', [
+            ('待って', True),
+            ('待ち', False),
+            ('待つ', False),
+            ('待った', False),
         ])
         
-        q2 = Question.objects.create(prompt='今、勉強___います。(Bây giờ đang học)')
-        Choice.objects.bulk_create([
-            Choice(question=q2, text='して', is_correct=True),
-            Choice(question=q2, text='する', is_correct=False),
-            Choice(question=q2, text='した', is_correct=False),
-            Choice(question=q2, text='し', is_correct=False),
+        q2 = get_or_create_question('今、勉強___います。(Bây giờ đang học)', [
+            ('して', True),
+            ('する', False),
+            ('した', False),
+            ('し', False),
         ])
         
-        q3 = Question.objects.create(prompt='朝起きて、顔を___。(Sáng dậy rồi rửa mặt)')
-        Choice.objects.bulk_create([
-            Choice(question=q3, text='洗います', is_correct=True),
-            Choice(question=q3, text='洗う', is_correct=False),
-            Choice(question=q3, text='洗いました', is_correct=False),
-            Choice(question=q3, text='洗って', is_correct=False),
+        q3 = get_or_create_question('朝起きて、顔を___。(Sáng dậy rồi rửa mặt)', [
+            ('洗います', True),
+            ('洗う', False),
+            ('洗いました', False),
+            ('洗って', False),
         ])
         
         lesson4.questions.add(q1, q2, q3)
@@ -294,28 +288,25 @@ class Command(BaseCommand):
 '''
         )
         
-        q1 = Question.objects.create(prompt='この部屋は___です。(Phòng này yên tĩnh)')
-        Choice.objects.bulk_create([
-            Choice(question=q1, text='静か', is_correct=True),
-            Choice(question=q1, text='静かい', is_correct=False),
-            Choice(question=q1, text='静かな', is_correct=False),
-            Choice(question=q1, text='静かに', is_correct=False),
+        q1 = get_or_create_question('この部屋は___です。(Phòng này yên tĩnh)', [
+            ('静か', True),
+            ('静かい', False),
+            ('静かな', False),
+            ('静かに', False),
         ])
         
-        q2 = Question.objects.create(prompt='昨日の試験は___かったです。(Bài kiểm tra hôm qua khó)')
-        Choice.objects.bulk_create([
-            Choice(question=q2, text='難し', is_correct=True),
-            Choice(question=q2, text='難しい', is_correct=False),
-            Choice(question=q2, text='難しく', is_correct=False),
-            Choice(question=q2, text='難しくない', is_correct=False),
+        q2 = get_or_create_question('昨日の試験は___かったです。(Bài kiểm tra hôm qua khó)', [
+            ('難し', True),
+            ('難しい', False),
+            ('難しく', False),
+            ('難しくない', False),
         ])
         
-        q3 = Question.objects.create(prompt='あの人は___人です。(Người đó là người tử tế)')
-        Choice.objects.bulk_create([
-            Choice(question=q3, text='親切な', is_correct=True),
-            Choice(question=q3, text='親切', is_correct=False),
-            Choice(question=q3, text='親切い', is_correct=False),
-            Choice(question=q3, text='親切に', is_correct=False),
+        q3 = get_or_create_question('あの人は___人です。(Người đó là người tử tế)', [
+            ('親切な', True),
+            ('親切', False),
+            ('親切い', False),
+            ('親切に', False),
         ])
         
         lesson5.questions.add(q1, q2, q3)
@@ -353,28 +344,25 @@ class Command(BaseCommand):
 '''
         )
         
-        q1 = Question.objects.create(prompt='田中さんは東京に___います。(Anh Tanaka đang sống ở Tokyo)')
-        Choice.objects.bulk_create([
-            Choice(question=q1, text='住んで', is_correct=True),
-            Choice(question=q1, text='住む', is_correct=False),
-            Choice(question=q1, text='住み', is_correct=False),
-            Choice(question=q1, text='住んだ', is_correct=False),
+        q1 = get_or_create_question('田中さんは東京に___います。(Anh Tanaka đang sống ở Tokyo)', [
+            ('住んで', True),
+            ('住む', False),
+            ('住み', False),
+            ('住んだ', False),
         ])
         
-        q2 = Question.objects.create(prompt='窓が___います。(Cửa sổ đang mở)')
-        Choice.objects.bulk_create([
-            Choice(question=q2, text='開いて', is_correct=True),
-            Choice(question=q2, text='開く', is_correct=False),
-            Choice(question=q2, text='開けて', is_correct=False),
-            Choice(question=q2, text='開き', is_correct=False),
+        q2 = get_or_create_question('窓が___います。(Cửa sổ đang mở)', [
+            ('開いて', True),
+            ('開く', False),
+            ('開けて', False),
+            ('開き', False),
         ])
         
-        q3 = Question.objects.create(prompt='あの人を___いますか。(Bạn có biết người đó không?)')
-        Choice.objects.bulk_create([
-            Choice(question=q3, text='知って', is_correct=True),
-            Choice(question=q3, text='知る', is_correct=False),
-            Choice(question=q3, text='知り', is_correct=False),
-            Choice(question=q3, text='知った', is_correct=False),
+        q3 = get_or_create_question('あの人を___いますか。(Bạn có biết người đó không?)', [
+            ('知って', True),
+            ('知る', False),
+            ('知り', False),
+            ('知った', False),
         ])
         
         lesson1.questions.add(q1, q2, q3)
@@ -408,20 +396,18 @@ class Command(BaseCommand):
 '''
         )
         
-        q1 = Question.objects.create(prompt='日本へ___ことがありますか。(Bạn đã từng đi Nhật Bản chưa?)')
-        Choice.objects.bulk_create([
-            Choice(question=q1, text='行った', is_correct=True),
-            Choice(question=q1, text='行く', is_correct=False),
-            Choice(question=q1, text='行って', is_correct=False),
-            Choice(question=q1, text='行き', is_correct=False),
+        q1 = get_or_create_question('日本へ___ことがありますか。(Bạn đã từng đi Nhật Bản chưa?)', [
+            ('行った', True),
+            ('行く', False),
+            ('行って', False),
+            ('行き', False),
         ])
         
-        q2 = Question.objects.create(prompt='この本を___ことがありません。(Tôi chưa từng đọc cuốn sách này)')
-        Choice.objects.bulk_create([
-            Choice(question=q2, text='読んだ', is_correct=True),
-            Choice(question=q2, text='読む', is_correct=False),
-            Choice(question=q2, text='読んで', is_correct=False),
-            Choice(question=q2, text='読み', is_correct=False),
+        q2 = get_or_create_question('この本を___ことがありません。(Tôi chưa từng đọc cuốn sách này)', [
+            ('読んだ', True),
+            ('読む', False),
+            ('読んで', False),
+            ('読み', False),
         ])
         
         lesson2.questions.add(q1, q2)
@@ -455,20 +441,18 @@ class Command(BaseCommand):
 '''
         )
         
-        q1 = Question.objects.create(prompt='宿題を___しまいました。(Đã làm xong bài tập)')
-        Choice.objects.bulk_create([
-            Choice(question=q1, text='して', is_correct=True),
-            Choice(question=q1, text='する', is_correct=False),
-            Choice(question=q1, text='した', is_correct=False),
-            Choice(question=q1, text='し', is_correct=False),
+        q1 = get_or_create_question('宿題を___しまいました。(Đã làm xong bài tập)', [
+            ('して', True),
+            ('する', False),
+            ('した', False),
+            ('し', False),
         ])
         
-        q2 = Question.objects.create(prompt='財布を___しまいました。(Đã quên ví mất rồi)')
-        Choice.objects.bulk_create([
-            Choice(question=q2, text='忘れて', is_correct=True),
-            Choice(question=q2, text='忘れる', is_correct=False),
-            Choice(question=q2, text='忘れた', is_correct=False),
-            Choice(question=q2, text='忘れ', is_correct=False),
+        q2 = get_or_create_question('財布を___しまいました。(Đã quên ví mất rồi)', [
+            ('忘れて', True),
+            ('忘れる', False),
+            ('忘れた', False),
+            ('忘れ', False),
         ])
         
         lesson3.questions.add(q1, q2)
@@ -508,20 +492,18 @@ class Command(BaseCommand):
 '''
         )
         
-        q1 = Question.objects.create(prompt='会議の前に資料を___おきます。(Đọc tài liệu trước cuộc họp)')
-        Choice.objects.bulk_create([
-            Choice(question=q1, text='読んで', is_correct=True),
-            Choice(question=q1, text='読む', is_correct=False),
-            Choice(question=q1, text='読み', is_correct=False),
-            Choice(question=q1, text='読んだ', is_correct=False),
+        q1 = get_or_create_question('会議の前に資料を___おきます。(Đọc tài liệu trước cuộc họp)', [
+            ('読んで', True),
+            ('読む', False),
+            ('読み', False),
+            ('読んだ', False),
         ])
         
-        q2 = Question.objects.create(prompt='旅行の前に切符を___おきました。(Đã mua vé trước chuyến du lịch)')
-        Choice.objects.bulk_create([
-            Choice(question=q2, text='買って', is_correct=True),
-            Choice(question=q2, text='買う', is_correct=False),
-            Choice(question=q2, text='買い', is_correct=False),
-            Choice(question=q2, text='買った', is_correct=False),
+        q2 = get_or_create_question('旅行の前に切符を___おきました。(Đã mua vé trước chuyến du lịch)', [
+            ('買って', True),
+            ('買う', False),
+            ('買い', False),
+            ('買った', False),
         ])
         
         lesson1.questions.add(q1, q2)
@@ -553,20 +535,18 @@ class Command(BaseCommand):
 '''
         )
         
-        q1 = Question.objects.create(prompt='人___考え方が違います。(Cách suy nghĩ khác nhau tùy người)')
-        Choice.objects.bulk_create([
-            Choice(question=q1, text='によって', is_correct=True),
-            Choice(question=q1, text='について', is_correct=False),
-            Choice(question=q1, text='にとって', is_correct=False),
-            Choice(question=q1, text='において', is_correct=False),
+        q1 = get_or_create_question('人___考え方が違います。(Cách suy nghĩ khác nhau tùy người)', [
+            ('によって', True),
+            ('について', False),
+            ('にとって', False),
+            ('において', False),
         ])
         
-        q2 = Question.objects.create(prompt='この小説は夏目漱石___書かれました。(Tiểu thuyết này được viết bởi Natsume Soseki)')
-        Choice.objects.bulk_create([
-            Choice(question=q2, text='によって', is_correct=True),
-            Choice(question=q2, text='について', is_correct=False),
-            Choice(question=q2, text='にとって', is_correct=False),
-            Choice(question=q2, text='に対して', is_correct=False),
+        q2 = get_or_create_question('この小説は夏目漱石___書かれました。(Tiểu thuyết này được viết bởi Natsume Soseki)', [
+            ('によって', True),
+            ('について', False),
+            ('にとって', False),
+            ('に対して', False),
         ])
         
         lesson2.questions.add(q1, q2)
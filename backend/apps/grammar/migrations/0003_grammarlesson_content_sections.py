@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+from apps.grammar.rendering import content_hash, render_sections
+
+
+def prerender_existing_lessons(apps, schema_editor):
+    # Các bài có sẵn trước khi có nội dung dựng sẵn
+    GrammarLesson = apps.get_model('grammar', 'GrammarLesson')
+    lessons = list(GrammarLesson.objects.only('id', 'content'))
+    for lesson in lessons:
+        lesson.content_sections = render_sections(lesson.content)
+        lesson.content_hash = content_hash(lesson.content)
+    GrammarLesson.objects.bulk_update(lessons, ['content_sections', 'content_hash'], batch_size=200)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grammar', '0002_remove_grammarprogress_total_questions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grammarlesson',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='grammarlesson',
+            name='content_sections',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(prerender_existing_lessons, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grammar', '0003_grammarlesson_content_sections'),
+        ('study', '0004_catalogversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GrammarMistake',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('wrong_count', models.PositiveIntegerField(default=0)),
+                ('last_wrong_at', models.DateTimeField(auto_now=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='study.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'question')},
+            },
+        ),
+    ]
@@ -11,6 +11,10 @@ class GrammarLesson(models.Model):
     grammar_point_count = models.PositiveIntegerField()
     content = models.TextField()
 
+    # Nội dung tách sẵn theo từng điểm ngữ pháp (xem rendering.py)
+    content_sections = models.JSONField(default=list, blank=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+
     questions = models.ManyToManyField(Question)
 
     class Meta:
@@ -29,3 +33,18 @@ class GrammarProgress(models.Model):
 
     class Meta:
         unique_together = ("user", "lesson")
+
+
+class GrammarMistake(models.Model):
+    """
+    Câu hỏi ngữ pháp user đã làm sai (bài học hoặc bộ luyện tập);
+    làm đúng lại thì câu được xóa khỏi danh sách.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    question = models.ForeignKey(Question, on_delete=models.CASCADE)
+
+    wrong_count = models.PositiveIntegerField(default=0)
+    last_wrong_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "question")
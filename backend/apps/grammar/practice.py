@@ -0,0 +1,179 @@
+import bisect
+import math
+import random
+from array import array
+
+from apps.study.catalog import get_versioned
+from apps.study.models import Question
+
+from .models import GrammarLesson, GrammarMistake
+
+
+# Bộ luyện tập ngữ pháp ngẫu nhiên lấy từ kho câu hỏi chung của các bài.
+# Mỗi level giữ mảng id câu hỏi xếp theo thứ tự bài (kèm mảng thứ tự bài song song),
+# dựng một lần cho mỗi version nội dung: lọc theo khoảng bài là hai lần bisect,
+# bốc ngẫu nhiên là chọn chỉ số trong mảng, không ORDER BY RANDOM() trên cả kho.
+
+LEVELS = ['N5', 'N4', 'N3', 'N2', 'N1']
+
+DEFAULT_SET_SIZE = 10
+MAX_SET_SIZE = 50
+DEFAULT_MISTAKE_SHARE = 0.5
+
+# Số câu sai gần nhất của user được xét khi trộn vào bộ luyện tập
+MAX_MISTAKES_SCANNED = 500
+
+
+class QuestionBank:
+    def __init__(self, rows):
+        """rows: (level, thứ tự bài, question_id, choice_id, is_correct)"""
+        entries = {}
+        self.correct = {}
+        for level, order, question_id, choice_id, is_correct in rows:
+            # Câu dùng ở nhiều bài cùng level -> tính theo bài đứng trước
+            key = (level, question_id)
+            if key not in entries or order < entries[key]:
+                entries[key] = order
+            answers = self.correct.setdefault(question_id, set())
+            if is_correct:
+                answers.add(choice_id)
+
+        self.orders = {}
+        self.ids = {}
+        for level in LEVELS:
+            pairs = sorted(
+                (order, question_id)
+                for (entry_level, question_id), order in entries.items()
+                if entry_level == level
+            )
+            self.orders[level] = array('q', (order for order, _ in pairs))
+            self.ids[level] = array('q', (question_id for _, question_id in pairs))
+
+    def candidates(self, level, lesson_from=None, lesson_to=None):
+        """Mảng id câu hỏi của level trong khoảng thứ tự bài [lesson_from, lesson_to]"""
+        orders = self.orders.get(level, array('q'))
+        start = bisect.bisect_left(orders, lesson_from) if lesson_from is not None else 0
+        end = bisect.bisect_right(orders, lesson_to) if lesson_to is not None else len(orders)
+        return self.ids[level][start:end] if level in self.ids else array('q')
+
+
+def build_bank():
+    rows = GrammarLesson.questions.through.objects.values_list(
+        'grammarlesson__level',
+        'grammarlesson__order',
+        'question_id',
+        'question__choices__id',
+        'question__choices__is_correct',
+    )
+    return QuestionBank(rows)
+
+
+def get_bank():
+    """Kho câu hỏi của version nội dung hiện tại"""
+    return get_versioned('grammar-question-bank', build_bank)
+
+
+# =========================
+# BỐC CÂU HỎI
+# =========================
+def _recent_mistakes(user, candidates):
+    """Câu sai của user nằm trong candidates, sai nhiều / gần đây trước"""
+    if not user.is_authenticated:
+        return []
+    question_ids = (
+        GrammarMistake.objects
+        .filter(user=user)
+        .order_by('-wrong_count', '-last_wrong_at')
+        .values_list('question_id', flat=True)[:MAX_MISTAKES_SCANNED]
+    )
+    allowed = set(candidates)
+    return [question_id for question_id in question_ids if question_id in allowed]
+
+
+def sample_question_ids(user, level, size=DEFAULT_SET_SIZE, lesson_from=None, lesson_to=None,
+                        mistake_share=DEFAULT_MISTAKE_SHARE, rng=random):
+    """
+    id câu hỏi của một bộ luyện tập: tối đa size * mistake_share câu user từng làm sai,
+    phần còn lại bốc ngẫu nhiên trong khoảng bài, thứ tự đã xáo trộn.
+    """
+    candidates = get_bank().candidates(level, lesson_from, lesson_to)
+    size = min(size, len(candidates))
+    if not size:
+        return []
+
+    chosen = []
+    mistake_quota = round(size * mistake_share)
+    if mistake_quota:
+        # Bốc trong nhóm câu sai nổi bật nhất để các lần luyện không lặp y hệt
+        pool = _recent_mistakes(user, candidates)[:mistake_quota * 2]
+        chosen = rng.sample(pool, min(mistake_quota, len(pool)))
+
+    taken = set(chosen)
+    # size lần bốc trùng với câu sai đã chọn nhiều nhất len(chosen) lần -> luôn đủ size câu
+    for index in rng.sample(range(len(candidates)), size):
+        if len(chosen) >= size:
+            break
+        question_id = candidates[index]
+        if question_id not in taken:
+            taken.add(question_id)
+            chosen.append(question_id)
+
+    rng.shuffle(chosen)
+    return chosen
+
+
+def get_practice_questions(question_ids):
+    """Câu hỏi kèm lựa chọn theo đúng thứ tự question_ids (2 query)"""
+    questions = Question.objects.filter(pk__in=question_ids).prefetch_related('choices').in_bulk()
+    return [questions[question_id] for question_id in question_ids if question_id in questions]
+
+
+# =========================
+# THAM SỐ
+# =========================
+def _int(params, name):
+    try:
+        return int(params[name])
+    except ValueError:
+        raise ValueError(f"{name} phải là số nguyên")
+
+
+def parse_practice_params(params):
+    """
+    Tham số bộ luyện tập từ query string:
+    level=N4 (bắt buộc), count=30, lessons=3-8 (thứ tự bài), mistakes=0.5, seed=123.
+    Giá trị không hợp lệ -> ValueError.
+    """
+    level = params.get('level')
+    if level not in LEVELS:
+        raise ValueError(f"level không hợp lệ: {level}")
+
+    options = {'level': level, 'size': DEFAULT_SET_SIZE, 'mistake_share': DEFAULT_MISTAKE_SHARE}
+
+    if params.get('count'):
+        options['size'] = min(max(_int(params, 'count'), 1), MAX_SET_SIZE)
+
+    lessons = params.get('lessons')
+    if lessons:
+        lesson_from, _, lesson_to = lessons.partition('-')
+        try:
+            options['lesson_from'] = int(lesson_from)
+            options['lesson_to'] = int(lesson_to or lesson_from)
+        except ValueError:
+            raise ValueError(f"lessons không hợp lệ: {lessons}")
+        if options['lesson_from'] > options['lesson_to']:
+            raise ValueError(f"lessons không hợp lệ: {lessons}")
+
+    if params.get('mistakes'):
+        try:
+            mistake_share = float(params['mistakes'])
+        except ValueError:
+            mistake_share = math.nan
+        if not math.isfinite(mistake_share):
+            raise ValueError(f"mistakes không hợp lệ: {params['mistakes']}")
+        options['mistake_share'] = min(max(mistake_share, 0.0), 1.0)
+
+    if params.get('seed'):
+        options['seed'] = _int(params, 'seed')
+
+    return options
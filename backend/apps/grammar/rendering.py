@@ -0,0 +1,141 @@
+import hashlib
+import re
+
+
+# Nội dung bài ngữ pháp (GrammarLesson.content) là text tự do dạng:
+#
+#   【です (desu)】
+#   - Cấu trúc: [Danh từ] + です
+#   - Ví dụ:
+#     • 私は学生です。(Watashi wa gakusei desu.) - Tôi là học sinh.
+#
+# Trước đây client tự cắt chuỗi này mỗi lần mở bài. Giờ nội dung được tách một lần
+# khi ghi bài (populate_grammar / admin) thành các phần theo từng điểm ngữ pháp,
+# mỗi phần gồm các block có cấu trúc và vị trí (start, end) trong content gốc.
+# content_hash cho biết bản dựng sẵn còn khớp content hay không.
+
+_HEADING_RE = re.compile(r"^【(?P<title>[^】]*)】\s*$", re.MULTILINE)
+_FIELD_RE = re.compile(r"^-\s*(?P<label>[^:：]{1,40})[:：]\s*(?P<text>.*)$")
+_BULLET_RE = re.compile(r"^[-•・]\s*(?P<text>.+)$")
+# 私は学生です。(Watashi wa gakusei desu.) - Tôi là học sinh.
+_EXAMPLE_RE = re.compile(
+    r"^(?P<japanese>[^(（]+?)\s*[(（](?P<romaji>[^)）]+)[)）]\s*[-–]\s*(?P<meaning>.+)$"
+)
+# 会議の前に資料を読んでおきます。(Đọc tài liệu trước cuộc họp.)
+_NOTE_EXAMPLE_RE = re.compile(r"^(?P<japanese>[^(（]+?)\s*[(（](?P<note>[^)）]+)[)）]$")
+# 大きくないです - Không lớn
+_DASH_EXAMPLE_RE = re.compile(r"^(?P<japanese>[^-–]+?)\s+[-–]\s+(?P<meaning>.+)$")
+
+
+def content_hash(content):
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+
+def _example(text):
+    """
+    Tách ví dụ thành {"japanese", "romaji", "meaning"} khi nhận ra dạng quen thuộc,
+    không thì giữ nguyên {"text"}
+    """
+    match = _EXAMPLE_RE.match(text)
+    if match:
+        return {key: value.strip() for key, value in match.groupdict().items()}
+
+    match = _NOTE_EXAMPLE_RE.match(text)
+    if match:
+        note = match["note"].strip()
+        # Trong ngoặc toàn ASCII là romaji, còn lại là nghĩa tiếng Việt
+        key = "romaji" if note.isascii() else "meaning"
+        return {"japanese": match["japanese"].strip(), key: note}
+
+    match = _DASH_EXAMPLE_RE.match(text)
+    if match:
+        return {"japanese": match["japanese"].strip(), "meaning": match["meaning"].strip()}
+    return {"text": text}
+
+
+def parse_blocks(text):
+    """
+    Các block của một phần:
+      {"type": "field", "label": "Cấu trúc", "text": "...", "items": [ví dụ]}
+      {"type": "bullet", "text": "..."}
+      {"type": "text", "text": "..."}
+    Dòng "• ..." thụt vào là ví dụ của field / bullet ngay trước nó.
+    """
+    blocks = []
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        indented = raw_line[:1].isspace()
+        if line.startswith("•") or (indented and blocks and _BULLET_RE.match(line)):
+            item = _example(_BULLET_RE.match(line).group("text").strip())
+            if blocks and blocks[-1]["type"] in ("field", "bullet"):
+                blocks[-1].setdefault("items", []).append(item)
+            else:
+                blocks.append({"type": "bullet", "text": "", "items": [item]})
+            continue
+
+        field = _FIELD_RE.match(line)
+        if field:
+            blocks.append({"type": "field", "label": field["label"].strip(), "text": field["text"].strip()})
+            continue
+
+        bullet = _BULLET_RE.match(line)
+        if bullet:
+            blocks.append({"type": "bullet", "text": bullet["text"].strip()})
+            continue
+
+        blocks.append({"type": "text", "text": line})
+    return blocks
+
+
+def render_sections(content):
+    """
+    Tách content thành các phần theo tiêu đề 【...】:
+    [{"title", "start", "end", "blocks"}], start/end là vị trí ký tự trong content.
+    Phần chữ trước tiêu đề đầu tiên (nếu có) là một phần không tiêu đề.
+    """
+    content = content or ""
+    headings = list(_HEADING_RE.finditer(content))
+
+    spans = []
+    first = headings[0].start() if headings else len(content)
+    if content[:first].strip():
+        spans.append(("", 0, 0, first))
+    for index, heading in enumerate(headings):
+        end = headings[index + 1].start() if index + 1 < len(headings) else len(content)
+        spans.append((heading["title"].strip(), heading.start(), heading.end(), end))
+
+    return [
+        {
+            "title": title,
+            "start": start,
+            "end": len(content[:end].rstrip()),
+            "blocks": parse_blocks(content[body_start:end]),
+        }
+        for title, start, body_start, end in spans
+    ]
+
+
+def prerender(lesson):
+    """
+    Dựng lại content_sections nếu content đã đổi kể từ lần dựng trước.
+    Trả về True nếu có thay đổi (chưa lưu).
+    """
+    digest = content_hash(lesson.content)
+    if lesson.content_hash == digest:
+        return False
+    lesson.content_sections = render_sections(lesson.content)
+    lesson.content_hash = digest
+    return True
+
+
+def get_sections(lesson):
+    """
+    content_sections của bài; bản dựng sẵn lệch content (ghi bằng update / bulk_*
+    không qua save()) thì dựng lại tại chỗ.
+    """
+    if lesson.content_hash == content_hash(lesson.content):
+        return lesson.content_sections
+    return render_sections(lesson.content)
@@ -1,7 +1,33 @@
 from .models import GrammarLesson, GrammarProgress
+from .rendering import get_sections
 from apps.study.serializers import QuestionSerializer
 from rest_framework import serializers
 
+
+def lesson_progress(context, lesson, total):
+    """
+    Tiến độ của user trong bài; context["progress_map"] = {lesson_id: correct_count}
+    do view nạp sẵn bằng một query.
+    """
+    request = context.get("request")
+    if not request or not request.user.is_authenticated:
+        return None
+
+    correct_count = context.get("progress_map", {}).get(lesson.id)
+
+    if correct_count is None:
+        return {
+            "correct_count": 0,
+            "total_questions": total,
+            "percent": 0,
+        }
+
+    return {
+        "correct_count": correct_count,
+        "total_questions": total,
+        "percent": round(correct_count / total * 100) if total else 0,
+    }
+
 class GrammarLessonListSerializer(serializers.ModelSerializer):
     progress = serializers.SerializerMethodField()
 
@@ -16,33 +42,13 @@ class GrammarLessonListSerializer(serializers.ModelSerializer):
             "progress",
         ]
 
+    # question_count được annotate sẵn, progress_map do view nạp một lần cho cả danh sách
     def get_progress(self, lesson):
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return None
-
-        progress = GrammarProgress.objects.filter(
-            user=request.user,
-            lesson=lesson
-        ).first()
-
-        total = lesson.questions.count()
-
-        if not progress:
-            return {
-                "correct_count": 0,
-                "total_questions": total,
-                "percent": 0,
-            }
-
-        return {
-            "correct_count": progress.correct_count,
-            "total_questions": total,
-            "percent": round(progress.correct_count / total * 100) if total else 0,
-        }
+        return lesson_progress(self.context, lesson, lesson.question_count)
 
 class GrammarLessonDetailSerializer(serializers.ModelSerializer):
     questions = QuestionSerializer(many=True)
+    sections = serializers.SerializerMethodField()
     progress = serializers.SerializerMethodField()
 
     class Meta:
@@ -54,36 +60,33 @@ class GrammarLessonDetailSerializer(serializers.ModelSerializer):
             "title",
             "grammar_point_count",
             "content",
+            "content_hash",
+            "sections",
             "questions",
             "progress",
         ]
 
-    def get_progress(self, lesson):
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return None
-
-        progress = GrammarProgress.objects.filter(
-            user=request.user,
-            lesson=lesson
-        ).first()
-
-        total = lesson.questions.count()
-
-        if not progress:
-            return {
-                "correct_count": 0,
-                "total_questions": total,
-                "percent": 0,
-            }
+    def get_sections(self, lesson):
+        # Chỉ mục lục (tiêu đề + vị trí trong content); từng phần tải qua endpoint sections
+        return [
+            {"index": index, "title": section["title"], "start": section["start"], "end": section["end"]}
+            for index, section in enumerate(get_sections(lesson))
+        ]
 
-        return {
-            "correct_count": progress.correct_count,
-            "total_questions": total,
-            "percent": round(progress.correct_count / total * 100) if total else 0,
-        }
+    def get_progress(self, lesson):
+        # questions đã prefetch cùng choices
+        return lesson_progress(self.context, lesson, len(lesson.questions.all()))
 
 class GrammarProgressSerializer(serializers.ModelSerializer):
     class Meta:
         model = GrammarProgress
         fields = ["lesson", "correct_count"]
+
+class GrammarSubmitSerializer(serializers.Serializer):
+    lesson_id = serializers.IntegerField()
+    # { question_id: choice_id }
+    answers = serializers.DictField(child=serializers.IntegerField())
+
+class GrammarPracticeSubmitSerializer(serializers.Serializer):
+    # { question_id: choice_id } của các câu trong bộ luyện tập
+    answers = serializers.DictField(child=serializers.IntegerField())
@@ -0,0 +1,127 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.notebook.models import NotebookCategory
+from apps.notebook.signals import schedule_rollup_refresh
+from apps.study.catalog import get_catalog_version
+
+from .models import GrammarLesson, GrammarMistake, GrammarProgress
+
+
+# Đáp án của bài chỉ đổi theo version nội dung -> cache theo version
+ANSWER_KEY_TIMEOUT = 60 * 60 * 24
+
+
+# =========================
+# ĐÁP ÁN
+# =========================
+def _load_answer_key(lesson_id):
+    # LEFT JOIN từ bài -> câu hỏi -> lựa chọn: một query, bài không tồn tại thì rỗng
+    rows = GrammarLesson.objects.filter(pk=lesson_id).values_list(
+        'level', 'questions__id', 'questions__choices__id', 'questions__choices__is_correct'
+    )
+
+    key = None
+    for level, question_id, choice_id, is_correct in rows:
+        if key is None:
+            key = {'level': level, 'answers': {}}
+        if question_id is None:
+            continue
+        correct = key['answers'].setdefault(question_id, set())
+        if is_correct:
+            correct.add(choice_id)
+    return key
+
+
+def get_answer_key(lesson_id):
+    """
+    Đáp án của bài: {'level': 'N5', 'answers': {question_id: {choice_id đúng}}},
+    None nếu bài không tồn tại.
+    """
+    cache_key = f"grammar:answer-key:{get_catalog_version()}:{lesson_id}"
+    key = cache.get(cache_key)
+    if key is None:
+        key = _load_answer_key(lesson_id)
+        if key is None:
+            return None
+        cache.set(cache_key, key, ANSWER_KEY_TIMEOUT)
+    return key
+
+
+def split_answers(correct_choices, answers):
+    """
+    Chấm answers = {question_id: choice_id} theo correct_choices = {question_id: {choice_id đúng}}.
+    Trả về (id câu đúng, id câu sai); câu không có trong correct_choices bị bỏ qua.
+    """
+    right, wrong = [], []
+    for question_id, choice_id in answers.items():
+        try:
+            question_id, choice_id = int(question_id), int(choice_id)
+        except (TypeError, ValueError):
+            continue
+        if question_id not in correct_choices:
+            continue
+        if choice_id in correct_choices[question_id]:
+            right.append(question_id)
+        else:
+            wrong.append(question_id)
+    return right, wrong
+
+
+# =========================
+# GHI ĐIỂM
+# =========================
+def record_best_score(user, lesson_id, level, correct):
+    """
+    Lưu điểm cao nhất của user cho bài:
+    UPDATE correct_count = GREATEST(correct_count, correct) trên dòng progress,
+    chưa có dòng thì tạo (bỏ qua nếu request song song vừa tạo) rồi UPDATE lại.
+    Trả về correct_count sau khi ghi.
+    """
+    progress = GrammarProgress.objects.filter(user=user, lesson_id=lesson_id)
+
+    def raise_best():
+        # update() bỏ qua auto_now -> ghi updated_at tường minh
+        return progress.update(correct_count=Greatest(F('correct_count'), correct), updated_at=timezone.now())
+
+    with transaction.atomic():
+        if not raise_best():
+            GrammarProgress.objects.bulk_create(
+                [GrammarProgress(user=user, lesson_id=lesson_id, correct_count=correct)],
+                ignore_conflicts=True,
+            )
+            # Dòng vừa được request khác tạo trước thì lần UPDATE này mới ghi điểm vào
+            raise_best()
+        best = progress.values_list('correct_count', flat=True).get()
+
+    # update() / bulk_create() không phát post_save: đánh dấu rollup như signal
+    # progress_saved, level đã có sẵn trong đáp án nên không phải query lại
+    schedule_rollup_refresh(user.pk, NotebookCategory.GRAMMAR, level)
+    return best
+
+
+# =========================
+# CÂU SAI
+# =========================
+def record_mistakes(user, right, wrong):
+    """
+    Ghi kết quả từng câu vào danh sách câu sai của user:
+    câu sai -> tạo nếu chưa có rồi tăng wrong_count bằng một UPDATE,
+    câu làm đúng -> xóa khỏi danh sách.
+    """
+    with transaction.atomic():
+        if wrong:
+            GrammarMistake.objects.bulk_create(
+                [GrammarMistake(user=user, question_id=question_id) for question_id in wrong],
+                ignore_conflicts=True,
+            )
+            # update() bỏ qua auto_now -> ghi last_wrong_at tường minh
+            GrammarMistake.objects.filter(user=user, question_id__in=wrong).update(
+                wrong_count=F('wrong_count') + 1,
+                last_wrong_at=timezone.now(),
+            )
+        if right:
+            GrammarMistake.objects.filter(user=user, question_id__in=right).delete()
@@ -0,0 +1,14 @@
+from django.apps import apps
+from django.db.models.signals import pre_save
+
+from .rendering import prerender
+
+
+def prerender_content(sender, instance, **kwargs):
+    # Bài được ghi qua save() (populate_grammar, admin) -> dựng lại nội dung nếu content đổi
+    prerender(instance)
+
+
+def connect_signals():
+    lesson_model = apps.get_model("grammar.GrammarLesson")
+    pre_save.connect(prerender_content, sender=lesson_model, dispatch_uid="grammar_prerender_content")
@@ -1,3 +1,86 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.notebook.models import NotebookCategory, NotebookProgressRollup
+from apps.study.catalog import bump_catalog_version, clear_catalog_cache
+from apps.study.instrumentation import query_budget
+from apps.study.models import Question
+
+from .models import GrammarLesson, GrammarProgress
+from .services import record_best_score
+
+
+class GrammarLessonListQueryBudgetTest(TestCase):
+    """
+    GET /api/grammar/lessons/: số câu hỏi đếm trong cùng query danh sách bài,
+    progress của user lấy một lần cho cả danh sách.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='grammar-budget@example.com', password='x')
+        for order in range(1, 6):
+            lesson = GrammarLesson.objects.create(
+                level='N5', order=order, title=f'Bài {order}', grammar_point_count=1, content=''
+            )
+            lesson.questions.add(*[Question.objects.create(prompt=f'{order}-{index}') for index in range(2)])
+            if order <= 3:
+                GrammarProgress.objects.create(user=cls.user, lesson=lesson, correct_count=1)
+        # on_commit không chạy trong TestCase -> tạo version nội dung như populate_* khi commit
+        bump_catalog_version()
+
+    def setUp(self):
+        cache.clear()
+        clear_catalog_cache()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_has_no_repeated_queries(self):
+        # Request đầu nạp version / thống kê nội dung vào cache
+        self.client.get('/api/grammar/lessons/', {'level': 'N5'})
+        # watermark progress + progress của user + bài
+        with query_budget(3):
+            response = self.client.get('/api/grammar/lessons/', {'level': 'N5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 5)
+
+
+class RecordBestScoreTest(TestCase):
+    """record_best_score: chỉ giữ điểm cao nhất và cập nhật rollup notebook khi commit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='grammar-best@example.com', password='x')
+        cls.lesson = GrammarLesson.objects.create(
+            level='N5', order=1, title='Bài 1', grammar_point_count=1, content=''
+        )
+        cls.lesson.questions.add(*[Question.objects.create(prompt=f'Câu {index}') for index in range(5)])
+        # on_commit không chạy trong TestCase -> tạo version nội dung như populate_* khi commit
+        bump_catalog_version()
+
+    def setUp(self):
+        cache.clear()
+        clear_catalog_cache()
+
+    def test_creates_then_keeps_best_score(self):
+        self.assertEqual(record_best_score(self.user, self.lesson.pk, 'N5', 3), 3)
+        self.assertEqual(record_best_score(self.user, self.lesson.pk, 'N5', 1), 3)
+        self.assertEqual(record_best_score(self.user, self.lesson.pk, 'N5', 5), 5)
+        self.assertEqual(
+            list(GrammarProgress.objects.filter(user=self.user).values_list('correct_count', flat=True)), [5]
+        )
+
+    def test_refreshes_notebook_rollup_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record_best_score(self.user, self.lesson.pk, 'N5', 2)
+        rollup = NotebookProgressRollup.objects.get(
+            user=self.user, category=NotebookCategory.GRAMMAR, level='N5'
+        )
+        self.assertEqual((rollup.reviewed_count, rollup.mastered_count), (1, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            record_best_score(self.user, self.lesson.pk, 'N5', 5)
+        rollup.refresh_from_db()
+        self.assertEqual((rollup.reviewed_count, rollup.mastered_count), (1, 1))
@@ -2,13 +2,19 @@ from django.urls import path
 from .views import (
     GrammarLessonListView,
     GrammarLessonDetailView,
+    GrammarLessonSectionView,
     GrammarProgressCreateUpdateView,
     SubmitGrammarAnswerView,
+    GrammarPracticeSetView,
+    GrammarPracticeSubmitView,
 )
 
 urlpatterns = [
     path("lessons/", GrammarLessonListView.as_view()),
     path("lessons/<int:pk>/", GrammarLessonDetailView.as_view()),
+    path("lessons/<int:pk>/sections/<int:index>/", GrammarLessonSectionView.as_view()),
     path("progress/", GrammarProgressCreateUpdateView.as_view()),
     path("submit/", SubmitGrammarAnswerView.as_view()),
+    path("practice/", GrammarPracticeSetView.as_view()),
+    path("practice/submit/", GrammarPracticeSubmitView.as_view()),
 ]
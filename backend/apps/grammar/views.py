@@ -1,11 +1,16 @@
+import random
+
 from rest_framework import generics, permissions
 from .models import GrammarLesson, GrammarProgress
 from .serializers import (
     GrammarLessonListSerializer,
     GrammarLessonDetailSerializer,
     GrammarProgressSerializer,
+    GrammarSubmitSerializer,
+    GrammarPracticeSubmitSerializer,
 )
 from rest_framework.exceptions import ValidationError
+from apps.study.conditional import conditional_on_progress
 from apps.study.models import JlptLevel
 from rest_framework.generics import RetrieveAPIView
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
@@ -13,8 +18,14 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from django.db.models import Count
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from apps.study.models import Choice
+from apps.study.payloads import prebuilt_json_response
+from apps.study.serializers import QuestionSerializer
+from .rendering import get_sections
+from .practice import get_bank, get_practice_questions, parse_practice_params, sample_question_ids
+from .services import get_answer_key, record_best_score, record_mistakes, split_answers
 
 class GrammarLessonListView(generics.ListAPIView):
     serializer_class = GrammarLessonListSerializer
@@ -22,7 +33,7 @@ class GrammarLessonListView(generics.ListAPIView):
 
     def get_queryset(self):
         level = self.request.query_params.get("level")
-        qs = GrammarLesson.objects.all()
+        qs = GrammarLesson.objects.annotate(question_count=Count("questions")).order_by("level", "order")
 
         if level:
             if level not in JlptLevel.values:
@@ -33,6 +44,20 @@ class GrammarLessonListView(generics.ListAPIView):
 
         return qs
 
+    @conditional_on_progress((GrammarProgress, "updated_at"))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # Progress của user cho cả danh sách trong một query
+        progress = GrammarProgress.objects.filter(user=self.request.user)
+        level = self.request.query_params.get("level")
+        if level:
+            progress = progress.filter(lesson__level=level)
+        context["progress_map"] = dict(progress.values_list("lesson_id", "correct_count"))
+        return context
+
 
 class GrammarLessonDetailView(RetrieveAPIView):
     queryset = GrammarLesson.objects.prefetch_related(
@@ -41,6 +66,40 @@ class GrammarLessonDetailView(RetrieveAPIView):
     serializer_class = GrammarLessonDetailSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.user.is_authenticated:
+            context["progress_map"] = dict(
+                GrammarProgress.objects.filter(
+                    user=self.request.user,
+                    lesson_id=self.kwargs["pk"]
+                ).values_list("lesson_id", "correct_count")
+            )
+        return context
+
+class GrammarLessonSectionView(APIView):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get(self, request, pk, index):
+        def build():
+            lesson = get_object_or_404(
+                GrammarLesson.objects.only("id", "content", "content_sections", "content_hash"),
+                pk=pk
+            )
+            sections = get_sections(lesson)
+            if index >= len(sections):
+                raise Http404("No section matches the given query.")
+            return {
+                "lesson": lesson.id,
+                "index": index,
+                "count": len(sections),
+                "content_hash": lesson.content_hash,
+                **sections[index],
+            }
+
+        # Một điểm ngữ pháp đã tách sẵn, không phụ thuộc user -> build một lần theo version nội dung
+        return prebuilt_json_response(request, f"grammar-section:{pk}:{index}", build)
+
 class GrammarProgressCreateUpdateView(generics.CreateAPIView):
     serializer_class = GrammarProgressSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -55,7 +114,6 @@ class GrammarProgressCreateUpdateView(generics.CreateAPIView):
             lesson=lesson,
             defaults={
                 "correct_count": serializer.validated_data["correct_count"],
-                "total_questions": serializer.validated_data["total_questions"],
             },
         )
 
@@ -68,38 +126,78 @@ class SubmitGrammarAnswerView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        lesson_id = request.data.get("lesson_id")
-        answers = request.data.get("answers")  
+        serializer = GrammarSubmitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        lesson_id = serializer.validated_data["lesson_id"]
+        answers = serializer.validated_data["answers"]
         # answers = { question_id: choice_id }
 
-        lesson = get_object_or_404(GrammarLesson, id=lesson_id)
-
-        correct = 0
-        for question_id, choice_id in answers.items():
-            try:
-                choice = Choice.objects.get(
-                    id=choice_id,
-                    question_id=question_id,
-                    is_correct=True
-                )
-                correct += 1
-            except Choice.DoesNotExist:
-                pass
-
-        progress, _ = GrammarProgress.objects.get_or_create(
-            user=request.user,
-            lesson=lesson,
-            defaults={"correct_count": 0},
-        )
+        # Đáp án cả bài lấy một lần (cache theo version nội dung), chấm trong bộ nhớ
+        answer_key = get_answer_key(lesson_id)
+        if answer_key is None:
+            raise Http404("No GrammarLesson matches the given query.")
 
-        progress.correct_count = max(progress.correct_count, correct)
-        progress.save()
+        right, wrong = split_answers(answer_key["answers"], answers)
+        best = record_best_score(request.user, lesson_id, answer_key["level"], len(right))
+        record_mistakes(request.user, right, wrong)
 
-        total = lesson.questions.count()
+        total = len(answer_key["answers"])
 
         return Response({
-            "correct_count": progress.correct_count,
+            "correct_count": best,
             "total_questions": total,
-            "percent": round(progress.correct_count / total * 100) if total else 0,
+            "percent": round(best / total * 100) if total else 0,
         })
 
+
+class GrammarPracticeSetView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            options = parse_practice_params(request.query_params)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # seed cho phép client dựng lại đúng bộ câu hỏi (làm lại / chia sẻ)
+        seed = options.pop("seed", None)
+        if seed is None:
+            seed = random.randrange(2 ** 31)
+
+        question_ids = sample_question_ids(request.user, rng=random.Random(seed), **options)
+        questions = get_practice_questions(question_ids)
+
+        return Response({
+            "level": options["level"],
+            "seed": seed,
+            "questions": QuestionSerializer(questions, many=True, context={"request": request}).data,
+        })
+
+class GrammarPracticeSubmitView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = GrammarPracticeSubmitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Đáp án lấy từ kho câu hỏi trong bộ nhớ, không query
+        correct_choices = get_bank().correct
+        right, wrong = split_answers(correct_choices, serializer.validated_data["answers"])
+        record_mistakes(request.user, right, wrong)
+
+        total = len(right) + len(wrong)
+        right_ids = set(right)
+        return Response({
+            "correct_count": len(right),
+            "total_questions": total,
+            "percent": round(len(right) / total * 100) if total else 0,
+            "results": [
+                {
+                    "question_id": question_id,
+                    "is_correct": question_id in right_ids,
+                    "correct_choice_ids": sorted(correct_choices[question_id]),
+                }
+                for question_id in right + wrong
+            ],
+        })
@@ -1,5 +1,7 @@
 # apps/jlpt_practice/management/commands/populate_jlpt_practice.py
 from django.core.management.base import BaseCommand
+from apps.study.catalog import schedule_catalog_bump
+from django.db import transaction
 from apps.jlpt_practice.models import (
     JLPTTest,
     JLPTSection,
@@ -20,15 +22,20 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        if options['clear']:
-            self.stdout.write('Clearing existing data...')
-            JLPTTest.objects.all().delete()
-            self.stdout.write(self.style.SUCCESS('Cleared!'))
+        with transaction.atomic():
+            if options['clear']:
+                self.stdout.write('Clearing existing data...')
+                JLPTTest.objects.all().delete()
+                self.stdout.write(self.style.SUCCESS('Cleared!'))
 
-        self.stdout.write('Populating JLPT Practice data...')
+            self.stdout.write('Populating JLPT Practice data...')
 
-        # Create N5 Tests
-        self.create_n5_tests()
+            # Create N5 Tests
+            self.create_n5_tests()
+
+            # Nội dung đã đổi -> thống kê catalog (số bài, số từ...) phải tính lại;
+            # version đổi một lần khi transaction commit
+            schedule_catalog_bump()
 
         self.stdout.write(self.style.SUCCESS('Successfully populated JLPT Practice data!'))
 
@@ -148,28 +148,21 @@ class JLPTTestListSerializer(serializers.ModelSerializer):
             'last_attempt_id',
         ]
     
+    # attempt_map do view nạp một lần cho cả danh sách:
+    # {test_id: {'best_score', 'last_attempt_id'}}, không có key = chưa nộp bài
+    def _attempt_summary(self, obj):
+        return self.context.get('attempt_map', {}).get(obj.id)
+    
     def get_user_best_score(self, obj):
-        user = self.context.get('request').user if self.context.get('request') else None
-        if not user or not user.is_authenticated:
-            return None
-        
-        best_attempt = obj.attempts.filter(user=user, status='submitted').order_by('-score').first()
-        return best_attempt.score if best_attempt else None
+        summary = self._attempt_summary(obj)
+        return summary['best_score'] if summary else None
     
     def get_has_attempted(self, obj):
-        user = self.context.get('request').user if self.context.get('request') else None
-        if not user or not user.is_authenticated:
-            return False
-        
-        return obj.attempts.filter(user=user, status='submitted').exists()
+        return self._attempt_summary(obj) is not None
     
     def get_last_attempt_id(self, obj):
-        user = self.context.get('request').user if self.context.get('request') else None
-        if not user or not user.is_authenticated:
-            return None
-        
-        last_attempt = obj.attempts.filter(user=user, status='submitted').order_by('-submitted_at').first()
-        return last_attempt.id if last_attempt else None
+        summary = self._attempt_summary(obj)
+        return summary['last_attempt_id'] if summary else None
 
 
 class JLPTTestDetailSerializer(serializers.ModelSerializer):
@@ -0,0 +1,49 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.study.catalog import bump_catalog_version, clear_catalog_cache
+from apps.study.instrumentation import query_budget
+
+from .models import JLPTTest, JLPTAttempt
+
+
+class JLPTTestListQueryBudgetTest(TestCase):
+    """
+    GET /api/jlpt-practice/tests/ gom lần nộp bài của user trên mọi đề trong một query:
+    số query không được tăng theo số đề.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='jlpt-budget@example.com', password='x')
+        tests = [
+            JLPTTest.objects.create(level='N5', order=order, title=f'Test {order}')
+            for order in range(1, 6)
+        ]
+        for test in tests[:3]:
+            for score in (60, 120):
+                JLPTAttempt.objects.create(
+                    user=cls.user, test=test, status='submitted', score=score, submitted_at=timezone.now()
+                )
+        # on_commit không chạy trong TestCase -> tạo version nội dung như populate_* khi commit
+        bump_catalog_version()
+
+    def setUp(self):
+        cache.clear()
+        clear_catalog_cache()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_has_no_repeated_queries(self):
+        # Request đầu nạp version nội dung vào cache
+        self.client.get('/api/jlpt-practice/tests/', {'level': 'N5'})
+        # watermark progress + đề + lần nộp bài
+        with query_budget(3):
+            response = self.client.get('/api/jlpt-practice/tests/', {'level': 'N5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(response.data[0]['user_best_score'], 120)
+        self.assertFalse(response.data[4]['has_attempted'])
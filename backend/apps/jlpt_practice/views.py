@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from collections import defaultdict
 
+from apps.study.conditional import conditional_on_progress
 from .models import (
     JLPTTest,
     JLPTAttempt,
@@ -31,10 +32,31 @@ class JLPTTestListAPIView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
     
+    @conditional_on_progress((JLPTAttempt, 'updated_at'))
     def get(self, request):
         level = request.query_params.get('level', 'N5')
-        tests = JLPTTest.objects.filter(level=level, is_published=True).prefetch_related('attempts')
-        serializer = JLPTTestListSerializer(tests, many=True, context={'request': request})
+        tests = list(JLPTTest.objects.filter(level=level, is_published=True))
+        
+        # Một query cho các lần nộp bài của user trên mọi đề trong danh sách,
+        # thay vì ba query cho mỗi đề trong serializer
+        attempt_map = {}
+        attempts = (
+            JLPTAttempt.objects
+            .filter(user=request.user, status='submitted', test__in=tests)
+            .order_by('-submitted_at', '-id')
+            .values_list('test_id', 'id', 'score')
+        )
+        for test_id, attempt_id, score in attempts:
+            summary = attempt_map.setdefault(
+                test_id, {'best_score': score, 'last_attempt_id': attempt_id}
+            )
+            summary['best_score'] = max(summary['best_score'], score)
+        
+        serializer = JLPTTestListSerializer(
+            tests,
+            many=True,
+            context={'request': request, 'attempt_map': attempt_map}
+        )
         return Response(serializer.data)
 
 
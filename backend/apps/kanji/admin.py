@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import KanjiUnit, KanjiLesson, Kanji, KanjiVocabulary, KanjiProgress, KanjiFavorite
+from .models import KanjiUnit, KanjiLesson, Kanji, KanjiComponent, KanjiVocabulary, KanjiProgress, KanjiFavorite
 
 
 class KanjiLessonInline(admin.TabularInline):
@@ -44,6 +44,7 @@ class KanjiAdmin(admin.ModelAdmin):
     list_filter = ('lesson__unit__level', 'lesson__unit')
     search_fields = ('kanji', 'vietnamese', 'meaning')
     ordering = ('lesson', 'order')
+    filter_horizontal = ('components',)
     inlines = [KanjiVocabularyInline]
     
     def get_level(self, obj):
@@ -52,6 +53,12 @@ class KanjiAdmin(admin.ModelAdmin):
     get_level.admin_order_field = 'lesson__unit__level'
 
 
+@admin.register(KanjiComponent)
+class KanjiComponentAdmin(admin.ModelAdmin):
+    list_display = ('character',)
+    search_fields = ('character',)
+
+
 @admin.register(KanjiVocabulary)
 class KanjiVocabularyAdmin(admin.ModelAdmin):
     list_display = ('kanji_word', 'hiragana', 'reading', 'meaning', 'kanji')
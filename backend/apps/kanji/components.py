@@ -0,0 +1,70 @@
+
+from apps.study.catalog import get_versioned
+
+from .models import Kanji
+
+
+# Tra kanji theo bộ thủ / thành phần (bộ chọn nhiều bộ thủ):
+# mỗi kanji là một bit, mỗi thành phần giữ bitset các kanji chứa nó.
+# Chọn thêm một thành phần = AND hai số nguyên, không query DB.
+# Bitset được dựng lại khi version catalog đổi (populate_kanji / admin).
+
+
+class ComponentIndex:
+    def __init__(self, kanji_rows, links):
+        # Một bit cho mỗi chữ (chữ lặp lại ở nhiều bài chỉ lấy dòng đầu),
+        # thứ tự bit = thứ tự kết quả: ít nét trước
+        self.kanjis = []
+        bit_of = {}
+        for row in sorted(kanji_rows, key=lambda row: (row["stroke_count"], row["id"])):
+            if row["kanji"] not in bit_of:
+                bit_of[row["kanji"]] = len(self.kanjis)
+                self.kanjis.append(row)
+        character_of = {row["id"]: row["kanji"] for row in kanji_rows}
+
+        self.bitsets = {}
+        for kanji_id, component in links:
+            bit = bit_of[character_of[kanji_id]]
+            self.bitsets[component] = self.bitsets.get(component, 0) | (1 << bit)
+
+    def components(self):
+        """[{'component', 'kanji_count'}] theo thứ tự ký tự"""
+        return [
+            {"component": component, "kanji_count": bitset.bit_count()}
+            for component, bitset in sorted(self.bitsets.items())
+        ]
+
+    def lookup(self, components):
+        """
+        Kanji chứa đủ mọi thành phần đã chọn, cùng các thành phần còn chọn tiếp được
+        (có ít nhất một kanji trong kết quả) để bộ chọn làm mờ các bộ thủ còn lại.
+        """
+        matched = (1 << len(self.kanjis)) - 1
+        for component in components:
+            matched &= self.bitsets.get(component, 0)
+
+        kanjis = []
+        bits = matched
+        while bits:
+            lowest = bits & -bits
+            kanjis.append(self.kanjis[lowest.bit_length() - 1])
+            bits ^= lowest
+
+        available = [component for component, bitset in sorted(self.bitsets.items()) if bitset & matched]
+        return {"kanjis": kanjis, "available_components": available}
+
+
+def build_index():
+    kanji_rows = list(Kanji.objects.values("id", "kanji", "vietnamese", "stroke_count"))
+    links = Kanji.components.through.objects.values_list("kanji_id", "kanjicomponent__character")
+    return ComponentIndex(kanji_rows, links)
+
+
+def get_index():
+    """Bitset của version nội dung hiện tại"""
+    return get_versioned("kanji-components", build_index)
+
+
+def parse_components(value):
+    """'日,土' / '日 土' / '日土' -> ['日', '土'] (mỗi thành phần là một ký tự)"""
+    return list(dict.fromkeys(char for char in value if not char.isspace() and char not in ",、"))
@@ -0,0 +1,216 @@
+from collections import Counter
+
+from django.db.models import BooleanField, F, Q, Value
+
+from apps.study.catalog import get_versioned
+
+from .models import Kanji, KanjiFavorite, KanjiProgress
+
+
+# Duyệt kanji theo bộ lọc (level, số nét, có âm on / kun, trạng thái học của user)
+# kèm số lượng của từng lựa chọn lọc.
+# Mỗi kanji thuộc một "ô" (level, nhóm số nét, có on, có kun); histogram số kanji
+# theo ô được dựng một lần cho mỗi version nội dung. Đếm một facet chỉ là cộng
+# các ô khớp bộ lọc (vài chục ô), trạng thái của user lấy bằng một query.
+
+LEVELS = ['N5', 'N4', 'N3', 'N2', 'N1']
+
+# (key, số nét nhỏ nhất, số nét lớn nhất)
+STROKE_BUCKETS = [
+    ('1-4', 1, 4),
+    ('5-8', 5, 8),
+    ('9-12', 9, 12),
+    ('13-16', 13, 16),
+    ('17+', 17, None),
+]
+
+STATE_LEARNED = 'learned'
+STATE_MASTERED = 'mastered'
+STATE_FAVORITE = 'favorite'
+STATE_NOT_LEARNED = 'not_learned'
+STATES = [STATE_LEARNED, STATE_MASTERED, STATE_FAVORITE, STATE_NOT_LEARNED]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Vị trí của từng facet nội dung trong ô
+CELL_FACETS = {'level': 0, 'strokes': 1, 'onyomi': 2, 'kunyomi': 3}
+
+
+def stroke_bucket(stroke_count):
+    for key, low, high in STROKE_BUCKETS:
+        if stroke_count >= low and (high is None or stroke_count <= high):
+            return key
+    return STROKE_BUCKETS[0][0]
+
+
+class FacetIndex:
+    def __init__(self, rows):
+        # rows theo thứ tự duyệt: level (N5 trước), số nét, id
+        self.rows = sorted(
+            rows,
+            key=lambda row: (
+                LEVELS.index(row['level']) if row['level'] in LEVELS else len(LEVELS),
+                row['stroke_count'],
+                row['id'],
+            ),
+        )
+        self.cell_of = {
+            row['id']: (row['level'], stroke_bucket(row['stroke_count']), bool(row['onyomi']), bool(row['kunyomi']))
+            for row in self.rows
+        }
+        self.histogram = Counter(self.cell_of.values())
+
+    @staticmethod
+    def cell_matches(cell, filters, skip=None):
+        return all(
+            cell[position] == filters[facet]
+            for facet, position in CELL_FACETS.items()
+            if facet != skip and filters.get(facet) is not None
+        )
+
+    def population(self, state, user_state):
+        """Histogram theo ô của các kanji ở trạng thái `state` (None = tất cả)"""
+        if state is None:
+            return self.histogram
+        if state == STATE_NOT_LEARNED:
+            return self.histogram - self.population(STATE_LEARNED, user_state)
+        return Counter(self.cell_of[kanji_id] for kanji_id in user_state[state] if kanji_id in self.cell_of)
+
+    def facet_counts(self, filters, user_state):
+        """
+        Số lượng của từng lựa chọn trong mỗi facet; mỗi facet được đếm với
+        mọi bộ lọc khác đang chọn (trừ chính nó) để chip hiện đúng số khi bấm.
+        """
+        population = self.population(filters.get('state'), user_state)
+        counts = {facet: Counter() for facet in CELL_FACETS}
+        for cell, count in population.items():
+            for facet, position in CELL_FACETS.items():
+                if self.cell_matches(cell, filters, skip=facet):
+                    counts[facet][cell[position]] += count
+
+        state_counts = {}
+        for state in STATES:
+            state_counts[state] = sum(
+                count
+                for cell, count in self.population(state, user_state).items()
+                if self.cell_matches(cell, filters)
+            )
+
+        return {
+            'level': {level: counts['level'][level] for level in LEVELS},
+            'strokes': {key: counts['strokes'][key] for key, _, _ in STROKE_BUCKETS},
+            'onyomi': {'true': counts['onyomi'][True], 'false': counts['onyomi'][False]},
+            'kunyomi': {'true': counts['kunyomi'][True], 'false': counts['kunyomi'][False]},
+            'state': state_counts,
+        }
+
+    def filter_rows(self, filters, user_state):
+        state = filters.get('state')
+        for row in self.rows:
+            if not self.cell_matches(self.cell_of[row['id']], filters):
+                continue
+            if state == STATE_NOT_LEARNED:
+                if row['id'] in user_state[STATE_LEARNED]:
+                    continue
+            elif state is not None and row['id'] not in user_state[state]:
+                continue
+            yield row
+
+
+def build_index():
+    rows = Kanji.objects.values(
+        'id', 'kanji', 'hiragana', 'vietnamese', 'meaning', 'stroke_count', 'onyomi', 'kunyomi',
+        level=F('lesson__unit__level'),
+    )
+    return FacetIndex(list(rows))
+
+
+def get_index():
+    """Histogram của version nội dung hiện tại"""
+    return get_versioned('kanji-facets', build_index)
+
+
+def get_user_state(user):
+    """
+    {'learned': set(kanji_id), 'mastered': set, 'favorite': set} của user,
+    lấy bằng một query (UNION progress + favorite).
+    """
+    user_state = {STATE_LEARNED: set(), STATE_MASTERED: set(), STATE_FAVORITE: set()}
+    if not user.is_authenticated:
+        return user_state
+
+    false = Value(False, output_field=BooleanField())
+    true = Value(True, output_field=BooleanField())
+    progress = (
+        KanjiProgress.objects
+        .filter(Q(is_learned=True) | Q(is_mastered=True), user=user)
+        .order_by()
+        .values_list('kanji_id', 'is_learned', 'is_mastered', false)
+    )
+    favorites = (
+        KanjiFavorite.objects
+        .filter(user=user)
+        .order_by()
+        .values_list('kanji_id', false, false, true)
+    )
+
+    for kanji_id, is_learned, is_mastered, is_favorite in progress.union(favorites, all=True):
+        if is_learned:
+            user_state[STATE_LEARNED].add(kanji_id)
+        if is_mastered:
+            user_state[STATE_MASTERED].add(kanji_id)
+        if is_favorite:
+            user_state[STATE_FAVORITE].add(kanji_id)
+    return user_state
+
+
+# =========================
+# THAM SỐ
+# =========================
+def parse_filters(params):
+    """
+    Bộ lọc từ query string: level=N5, strokes=5-8, onyomi=true, kunyomi=false, state=learned.
+    Giá trị không hợp lệ -> ValueError.
+    """
+    filters = {}
+
+    level = params.get('level')
+    if level:
+        if level not in LEVELS:
+            raise ValueError(f"level không hợp lệ: {level}")
+        filters['level'] = level
+
+    strokes = params.get('strokes')
+    if strokes:
+        if strokes not in {key for key, _, _ in STROKE_BUCKETS}:
+            raise ValueError(f"strokes không hợp lệ: {strokes}")
+        filters['strokes'] = strokes
+
+    for facet in ('onyomi', 'kunyomi'):
+        value = params.get(facet)
+        if value:
+            if value not in ('true', 'false'):
+                raise ValueError(f"{facet} phải là true hoặc false")
+            filters[facet] = value == 'true'
+
+    state = params.get('state')
+    if state:
+        if state not in STATES:
+            raise ValueError(f"state không hợp lệ: {state}")
+        filters['state'] = state
+
+    return filters
+
+
+def parse_page(params):
+    """(limit, offset) của trang kết quả, limit trong [1, MAX_PAGE_SIZE]"""
+    try:
+        limit = min(max(int(params.get('limit')), 1), MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        limit = DEFAULT_PAGE_SIZE
+    try:
+        offset = max(int(params.get('offset')), 0)
+    except (TypeError, ValueError):
+        offset = 0
+    return limit, offset
@@ -1,9 +1,18 @@
 """
 Django Management Command để thêm dữ liệu kanji
 Chạy: python manage.py populate_kanji
+      python manage.py populate_kanji --kradfile /path/to/kradfile --kradfile-encoding euc-jp
 """
-from django.core.management.base import BaseCommand
-from apps.kanji.models import KanjiUnit, KanjiLesson, Kanji, KanjiVocabulary
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.study.catalog import schedule_catalog_bump
+from django.db import transaction
+from apps.kanji.models import KanjiUnit, KanjiLesson, Kanji, KanjiVocabulary, KanjiComponent
+
+
+# Bảng thành phần cấu tạo kanji đi kèm repo (định dạng KRADFILE)
+DEFAULT_KRADFILE = Path(__file__).resolve().parents[2] / 'data' / 'kradfile.txt'
 
 
 class Command(BaseCommand):
@@ -15,29 +24,48 @@ class Command(BaseCommand):
             action='store_true',
             help='Xóa tất cả dữ liệu cũ trước khi thêm mới',
         )
+        parser.add_argument(
+            '--kradfile',
+            default=str(DEFAULT_KRADFILE),
+            help='File KRADFILE (mỗi dòng "<kanji> : <thành phần> ...") để nạp bộ thủ',
+        )
+        parser.add_argument(
+            '--kradfile-encoding',
+            default='utf-8',
+            help='Encoding của KRADFILE (bản gốc của EDRDG dùng euc-jp)',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write("=" * 60)
         self.stdout.write(self.style.SUCCESS("POPULATE KANJI DATA"))
         self.stdout.write("=" * 60)
         
-        # Xóa dữ liệu cũ nếu có flag --clear
-        if options['clear']:
-            count_kanji = Kanji.objects.count()
-            count_vocab = KanjiVocabulary.objects.count()
-            if count_kanji > 0 or count_vocab > 0:
-                KanjiVocabulary.objects.all().delete()
-                Kanji.objects.all().delete()
-                KanjiLesson.objects.all().delete()
-                KanjiUnit.objects.all().delete()
-                self.stdout.write(self.style.WARNING(f"Đã xóa {count_kanji} kanjis và {count_vocab} vocabularies cũ"))
-        
-        self.stdout.write("\nĐang thêm dữ liệu mới...")
-        
-        # Thêm dữ liệu
-        self.add_n5_data()
-        self.add_n4_data()
-        
+        with transaction.atomic():
+            # Xóa dữ liệu cũ nếu có flag --clear
+            if options['clear']:
+                count_kanji = Kanji.objects.count()
+                count_vocab = KanjiVocabulary.objects.count()
+                if count_kanji > 0 or count_vocab > 0:
+                    KanjiVocabulary.objects.all().delete()
+                    Kanji.objects.all().delete()
+                    KanjiLesson.objects.all().delete()
+                    KanjiUnit.objects.all().delete()
+                    KanjiComponent.objects.all().delete()
+                    self.stdout.write(self.style.WARNING(f"Đã xóa {count_kanji} kanjis và {count_vocab} vocabularies cũ"))
+        
+            self.stdout.write("\nĐang thêm dữ liệu mới...")
+        
+            # Thêm dữ liệu
+            self.add_n5_data()
+            self.add_n4_data()
+        
+            # Bộ thủ / thành phần của các kanji vừa thêm
+            self.load_components(options['kradfile'], options['kradfile_encoding'])
+
+            # Nội dung đã đổi -> thống kê catalog (số bài, số từ...) phải tính lại;
+            # version đổi một lần khi transaction commit
+            schedule_catalog_bump()
+
         # Thống kê
         self.stdout.write("\n" + "=" * 60)
         self.stdout.write(self.style.SUCCESS("THỐNG KÊ"))
@@ -47,15 +75,70 @@ class Command(BaseCommand):
         total_lessons = KanjiLesson.objects.count()
         total_kanjis = Kanji.objects.count()
         total_vocabs = KanjiVocabulary.objects.count()
+        total_components = KanjiComponent.objects.count()
         
         self.stdout.write(f"Units: {total_units}")
         self.stdout.write(f"Lessons: {total_lessons}")
         self.stdout.write(f"Kanjis: {total_kanjis}")
         self.stdout.write(f"Vocabularies: {total_vocabs}")
+        self.stdout.write(f"Components: {total_components}")
         self.stdout.write("\n" + "=" * 60)
         self.stdout.write(self.style.SUCCESS("HOÀN THÀNH!"))
         self.stdout.write("=" * 60)
 
+    def load_components(self, path, encoding):
+        """
+        Nạp bảng thành phần từ KRADFILE cho các kanji đang có trong DB.
+        Dòng bắt đầu bằng '#' là chú thích; kanji không có trong DB bị bỏ qua
+        (KRADFILE đầy đủ có hơn 6000 chữ).
+        """
+        try:
+            with open(path, encoding=encoding) as kradfile:
+                lines = kradfile.read().splitlines()
+        except OSError as exc:
+            raise CommandError(f"Không đọc được KRADFILE {path}: {exc}")
+        
+        # Một chữ có thể xuất hiện ở nhiều bài -> nhiều dòng Kanji
+        kanji_ids = {}
+        for kanji_id, character in Kanji.objects.values_list('id', 'kanji'):
+            kanji_ids.setdefault(character, []).append(kanji_id)
+        
+        decompositions = {}
+        for line in lines:
+            if not line.strip() or line.startswith('#'):
+                continue
+            character, _, components = line.partition(':')
+            character = character.strip()
+            if character in kanji_ids:
+                decompositions[character] = components.split()
+        
+        characters = {component for components in decompositions.values() for component in components}
+        KanjiComponent.objects.bulk_create(
+            [KanjiComponent(character=character) for character in characters],
+            ignore_conflicts=True,
+        )
+        component_ids = dict(
+            KanjiComponent.objects.filter(character__in=characters).values_list('character', 'id')
+        )
+        
+        # Ghi lại toàn bộ liên kết của các kanji có trong file
+        Through = Kanji.components.through
+        affected = [kanji_id for character in decompositions for kanji_id in kanji_ids[character]]
+        Through.objects.filter(kanji_id__in=affected).delete()
+        Through.objects.bulk_create([
+            Through(kanji_id=kanji_id, kanjicomponent_id=component_ids[component])
+            for character, components in decompositions.items()
+            for kanji_id in kanji_ids[character]
+            for component in dict.fromkeys(components)
+        ])
+        
+        missing = sorted(set(kanji_ids) - set(decompositions))
+        self.stdout.write(self.style.SUCCESS(
+            f"Đã nạp thành phần cho {len(decompositions)} kanji ({len(characters)} bộ thủ)"
+        ))
+        if missing:
+            self.stdout.write(self.style.WARNING(f"Không có trong KRADFILE: {''.join(missing)}"))
+
     def add_n5_data(self):
         """Thêm dữ liệu kanji N5"""
         
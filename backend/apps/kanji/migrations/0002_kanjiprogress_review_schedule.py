@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:20
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def schedule_existing_progress(apps, schema_editor):
+    # Các mục đã học trước khi có lịch ôn: cần ôn ngay từ lần ôn gần nhất
+    KanjiProgress = apps.get_model('kanji', 'KanjiProgress')
+    KanjiProgress.objects.update(due_at=F('last_reviewed_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanji', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kanjiprogress',
+            name='due_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Thời điểm cần ôn lại'),
+        ),
+        migrations.AddField(
+            model_name='kanjiprogress',
+            name='ease_factor',
+            field=models.FloatField(default=2.5),
+        ),
+        migrations.AddField(
+            model_name='kanjiprogress',
+            name='interval_days',
+            field=models.PositiveIntegerField(default=0, help_text='Khoảng cách hiện tại giữa hai lần ôn (ngày)'),
+        ),
+        migrations.AddField(
+            model_name='kanjiprogress',
+            name='lapse_count',
+            field=models.PositiveIntegerField(default=0, help_text='Số lần quên sau khi đã nhớ'),
+        ),
+        migrations.RunPython(schedule_existing_progress, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='kanjiprogress',
+            index=models.Index(fields=['user', 'due_at'], name='kanji_progress_due_idx'),
+        ),
+    ]
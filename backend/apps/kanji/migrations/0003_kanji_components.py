@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanji', '0002_kanjiprogress_review_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KanjiComponent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('character', models.CharField(help_text='Ký tự bộ thủ / thành phần', max_length=1, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Kanji Component',
+                'verbose_name_plural': 'Kanji Components',
+                'ordering': ['character'],
+            },
+        ),
+        migrations.AddField(
+            model_name='kanji',
+            name='components',
+            field=models.ManyToManyField(blank=True, help_text='Các bộ thủ / thành phần cấu tạo', related_name='kanjis', to='kanji.kanjicomponent'),
+        ),
+    ]
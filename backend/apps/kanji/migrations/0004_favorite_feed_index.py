@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanji', '0003_kanji_components'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kanjifavorite',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='kanji_favorite_feed_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from apps.study.models import ReviewSchedule
+
 
 class KanjiUnit(models.Model):
     """
@@ -85,6 +87,26 @@ class KanjiLesson(models.Model):
         return f"{self.unit.unit_name} - ({self.lesson_number}) {self.lesson_name}"
 
 
+class KanjiComponent(models.Model):
+    """
+    Bộ thủ / thành phần cấu tạo kanji (theo KRADFILE)
+    Ví dụ: 日, 木, 氵 (汁 trong KRADFILE)
+    """
+    character = models.CharField(
+        max_length=1,
+        unique=True,
+        help_text="Ký tự bộ thủ / thành phần"
+    )
+    
+    class Meta:
+        ordering = ['character']
+        verbose_name = "Kanji Component"
+        verbose_name_plural = "Kanji Components"
+    
+    def __str__(self):
+        return self.character
+
+
 class Kanji(models.Model):
     """
     Chữ Kanji
@@ -137,6 +159,13 @@ class Kanji(models.Model):
         help_text="Thứ tự trong bài học"
     )
     
+    components = models.ManyToManyField(
+        KanjiComponent,
+        blank=True,
+        related_name='kanjis',
+        help_text="Các bộ thủ / thành phần cấu tạo"
+    )
+    
     class Meta:
         ordering = ['lesson', 'order']
         verbose_name = "Kanji"
@@ -195,7 +224,7 @@ class KanjiVocabulary(models.Model):
         return f"{self.kanji_word} ({self.meaning})"
 
 
-class KanjiProgress(models.Model):
+class KanjiProgress(ReviewSchedule):
     """
     Tiến độ học kanji của user
     """
@@ -231,6 +260,10 @@ class KanjiProgress(models.Model):
     
     class Meta:
         unique_together = ['user', 'kanji']
+        indexes = [
+            # Hàng đợi cần ôn: WHERE user_id = ? AND due_at <= now ORDER BY due_at
+            models.Index(fields=['user', 'due_at'], name='kanji_progress_due_idx'),
+        ]
         verbose_name = "Kanji Progress"
         verbose_name_plural = "Kanji Progress"
     
@@ -258,6 +291,10 @@ class KanjiFavorite(models.Model):
     class Meta:
         unique_together = ['user', 'kanji']
         ordering = ['-created_at']
+        indexes = [
+            # Danh sách yêu thích phân trang keyset: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+            models.Index(fields=['user', '-created_at', '-id'], name='kanji_favorite_feed_idx'),
+        ]
         verbose_name = "Kanji Favorite"
         verbose_name_plural = "Kanji Favorites"
     
@@ -0,0 +1,167 @@
+import bisect
+import re
+import unicodedata
+
+from apps.study.catalog import get_versioned
+
+from .models import Kanji
+
+
+# Chỉ mục tìm kiếm kanji giữ trong bộ nhớ của process:
+# term đã chuẩn hóa -> id kanji, cộng danh sách term đã sắp xếp để tìm theo tiền tố.
+# Bộ kanji chỉ vài nghìn dòng và chỉ đổi qua populate_kanji / admin (đổi version
+# catalog), nên chỉ mục được dựng lại khi version đổi thay vì quét bảng mỗi lần gõ.
+
+MAX_RESULTS = 20
+
+# Thứ hạng kết quả (nhỏ hơn = liên quan hơn)
+RANK_CHARACTER = 0      # đúng chữ kanji
+RANK_READING = 1        # đúng âm Hán Việt / on / kun
+RANK_MEANING = 2        # đúng một nghĩa / một từ trong nghĩa
+RANK_READING_PREFIX = 3
+RANK_MEANING_PREFIX = 4
+RANK_SUBSTRING = 5      # chuỗi con của nghĩa
+
+# Tách âm đọc (キョウ、ゴウ / NHẬT, THÁI) và nghĩa (xe, xe cộ; ngày)
+_READING_SPLIT_RE = re.compile(r"[、,，;；/・\s]+")
+_PHRASE_SPLIT_RE = re.compile(r"[、,，;；/.。()（）]+")
+_WORD_SPLIT_RE = re.compile(r"\W+")
+
+
+# =========================
+# CHUẨN HÓA
+# =========================
+def normalize(text):
+    """
+    Chuẩn hóa để so khớp không phân biệt hoa thường / dấu tiếng Việt
+    và katakana / hiragana: 'NHẬT' -> 'nhat', 'Đóng' -> 'dong', 'キョウ' -> 'きょう'
+    """
+    text = unicodedata.normalize("NFD", text.lower())
+    chars = []
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        if char == "đ":
+            char = "d"
+        elif "ァ" <= char <= "ヶ":
+            # Katakana -> hiragana tương ứng
+            char = chr(ord(char) - 0x60)
+        chars.append(char)
+    # Okurigana trong âm kun: まな-ぶ / た.べる
+    return unicodedata.normalize("NFC", "".join(chars)).replace("-", "").strip()
+
+
+def _is_kanji(char):
+    return "一" <= char <= "鿿" or "㐀" <= char <= "䶿"
+
+
+def _reading_terms(*values):
+    terms = set()
+    for value in values:
+        for part in _READING_SPLIT_RE.split(value):
+            term = normalize(part).replace(".", "")
+            if term:
+                terms.add(term)
+    return terms
+
+
+def _meaning_terms(meaning):
+    """Cả cụm nghĩa ('xe co') lẫn từng từ ('xe', 'co')"""
+    terms = set()
+    for phrase in _PHRASE_SPLIT_RE.split(meaning):
+        phrase = " ".join(normalize(phrase).split())
+        if not phrase:
+            continue
+        terms.add(phrase)
+        terms.update(word for word in _WORD_SPLIT_RE.split(phrase) if word)
+    return terms
+
+
+# =========================
+# CHỈ MỤC
+# =========================
+class KanjiSearchIndex:
+    def __init__(self, rows):
+        # rows theo thứ tự mặc định (unit, bài, thứ tự trong bài) -> dùng làm tiêu chí phụ
+        self.position = {}
+        self.level = {}
+        self.by_character = {}
+        self.readings = {}
+        self.meanings = {}
+        self.meaning_text = []
+
+        for position, row in enumerate(rows):
+            kanji_id = row["id"]
+            self.position[kanji_id] = position
+            self.level[kanji_id] = row["lesson__unit__level"]
+            self.by_character.setdefault(row["kanji"], []).append(kanji_id)
+
+            for term in _reading_terms(row["vietnamese"], row["hiragana"], row["onyomi"], row["kunyomi"]):
+                self.readings.setdefault(term, []).append(kanji_id)
+            for term in _meaning_terms(row["meaning"]):
+                self.meanings.setdefault(term, []).append(kanji_id)
+            self.meaning_text.append((kanji_id, " ".join(normalize(row["meaning"]).split())))
+
+        self.reading_terms = sorted(self.readings)
+        self.meaning_terms = sorted(self.meanings)
+
+    @staticmethod
+    def _prefix_matches(terms, postings, prefix):
+        start = bisect.bisect_left(terms, prefix)
+        for term in terms[start:]:
+            if not term.startswith(prefix):
+                break
+            yield from postings[term]
+
+    def search(self, query, level=None, limit=MAX_RESULTS):
+        """Danh sách id kanji khớp `query`, xếp theo độ liên quan"""
+        ranks = {}
+
+        def add(kanji_ids, rank):
+            for kanji_id in kanji_ids:
+                if rank < ranks.get(kanji_id, RANK_SUBSTRING + 1):
+                    ranks[kanji_id] = rank
+
+        # Gõ trực tiếp kanji (日 / 日本) -> khớp từng chữ
+        for char in query:
+            if _is_kanji(char):
+                add(self.by_character.get(char, ()), RANK_CHARACTER)
+
+        term = " ".join(normalize(query).split())
+        if term:
+            add(self.readings.get(term, ()), RANK_READING)
+            add(self.meanings.get(term, ()), RANK_MEANING)
+            add(self._prefix_matches(self.reading_terms, self.readings, term), RANK_READING_PREFIX)
+            add(self._prefix_matches(self.meaning_terms, self.meanings, term), RANK_MEANING_PREFIX)
+            # Chỉ quét chuỗi con khi các bước trên chưa đủ kết quả
+            if len(ranks) < limit:
+                add((kanji_id for kanji_id, text in self.meaning_text if term in text), RANK_SUBSTRING)
+
+        if level:
+            ranks = {kanji_id: rank for kanji_id, rank in ranks.items() if self.level[kanji_id] == level}
+
+        return sorted(ranks, key=lambda kanji_id: (ranks[kanji_id], self.position[kanji_id]))[:limit]
+
+
+def build_index():
+    rows = Kanji.objects.values(
+        "id", "kanji", "hiragana", "vietnamese", "onyomi", "kunyomi", "meaning", "lesson__unit__level"
+    )
+    return KanjiSearchIndex(rows)
+
+
+def get_index():
+    """Chỉ mục của version nội dung hiện tại, dựng lại khi populate_kanji / admin đổi nội dung"""
+    return get_versioned("kanji-search", build_index)
+
+
+def search_kanji(query, level=None, limit=MAX_RESULTS):
+    """
+    Tìm kanji theo chữ, âm Hán Việt, on/kun hoặc nghĩa.
+    Trả về list Kanji đã xếp hạng (kèm prefetch vocabularies).
+    """
+    kanji_ids = get_index().search(query, level=level, limit=limit)
+    if not kanji_ids:
+        return []
+    kanjis = Kanji.objects.filter(pk__in=kanji_ids).prefetch_related("vocabularies").in_bulk()
+    return [kanjis[kanji_id] for kanji_id in kanji_ids if kanji_id in kanjis]
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from apps.study.srs import ReviewGrade
+from .services import MAX_BATCH_UPDATES
 from .models import KanjiUnit, KanjiLesson, Kanji, KanjiVocabulary, KanjiProgress, KanjiFavorite
 
 
@@ -30,7 +32,8 @@ class KanjiSerializer(serializers.ModelSerializer):
     
     def get_vocabulary(self, obj):
         """Lấy từ vựng đầu tiên của kanji"""
-        first_vocab = obj.vocabularies.first()
+        # Đọc từ danh sách vocabularies đã prefetch, không query riêng cho từng kanji
+        first_vocab = next(iter(obj.vocabularies.all()), None)
         if first_vocab:
             return {
                 'kanji': first_vocab.kanji_word,
@@ -70,7 +73,8 @@ class KanjiLessonSerializer(serializers.ModelSerializer):
         fields = ['id', 'lesson_number', 'lesson_name', 'kanji_count', 'kanjis']
     
     def get_kanji_count(self, obj):
-        return obj.kanjis.count()
+        # Dùng danh sách kanjis đã prefetch thay vì thêm một COUNT mỗi bài
+        return len(obj.kanjis.all())
 
 
 class KanjiUnitSerializer(serializers.ModelSerializer):
@@ -93,10 +97,10 @@ class KanjiUnitSerializer(serializers.ModelSerializer):
         ]
     
     def get_lesson_count(self, obj):
-        return obj.lessons.count()
+        return len(obj.lessons.all())
     
     def get_total_kanji_count(self, obj):
-        return Kanji.objects.filter(lesson__unit=obj).count()
+        return sum(len(lesson.kanjis.all()) for lesson in obj.lessons.all())
 
 
 class KanjiUnitListSerializer(serializers.ModelSerializer):
@@ -137,15 +141,42 @@ class KanjiProgressSerializer(serializers.ModelSerializer):
             'is_learned',
             'is_mastered',
             'review_count',
-            'last_reviewed_at'
+            'last_reviewed_at',
+            'ease_factor',
+            'interval_days',
+            'due_at',
+            'lapse_count',
         ]
-        read_only_fields = ['last_reviewed_at']
+        read_only_fields = ['last_reviewed_at', 'ease_factor', 'interval_days', 'due_at', 'lapse_count']
     
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
 
 
+class KanjiReviewSerializer(serializers.Serializer):
+    """Kết quả một lần ôn kanji"""
+    kanji_id = serializers.IntegerField()
+    grade = serializers.ChoiceField(choices=ReviewGrade.choices)
+
+
+class KanjiProgressBatchItemSerializer(serializers.Serializer):
+    """Delta progress của một kanji; cờ không gửi thì giữ nguyên"""
+    kanji_id = serializers.IntegerField()
+    is_learned = serializers.BooleanField(required=False)
+    is_mastered = serializers.BooleanField(required=False)
+    review_increment = serializers.IntegerField(min_value=0, max_value=1000, default=0)
+
+
+class KanjiProgressBatchSerializer(serializers.Serializer):
+    """Lô delta progress kanji"""
+    updates = KanjiProgressBatchItemSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=MAX_BATCH_UPDATES
+    )
+
+
 class KanjiFavoriteSerializer(serializers.ModelSerializer):
     """Serializer cho kanji yêu thích"""
     kanji = KanjiSerializer(read_only=True)
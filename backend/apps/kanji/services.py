@@ -0,0 +1,92 @@
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from apps.notebook.models import NotebookCategory
+from apps.notebook.signals import schedule_rollup_refresh
+
+from .models import Kanji, KanjiProgress
+
+
+# Số kanji tối đa trong một lần cập nhật hàng loạt
+MAX_BATCH_UPDATES = 500
+
+
+# =========================
+# CẬP NHẬT PROGRESS HÀNG LOẠT
+# =========================
+def _merge_updates(updates):
+    """
+    Gộp các delta của cùng một kanji trong lô:
+    số lần ôn cộng dồn, cờ learned / mastered lấy giá trị gửi sau cùng.
+    """
+    merged = {}
+    for item in updates:
+        delta = merged.setdefault(item['kanji_id'], {'review_increment': 0})
+        delta['review_increment'] += item.get('review_increment', 0)
+        for flag in ('is_learned', 'is_mastered'):
+            if flag in item:
+                delta[flag] = item[flag]
+    return merged
+
+
+def _case(deltas, field, default):
+    """CASE kanji_id WHEN ... THEN <giá trị của field> ELSE default END"""
+    whens = [
+        When(kanji_id=kanji_id, then=Value(delta[field]))
+        for kanji_id, delta in deltas.items()
+        if field in delta
+    ]
+    if not whens:
+        return default
+    return Case(*whens, default=default)
+
+
+def apply_progress_batch(user, updates):
+    """
+    Áp một lô delta progress kanji.
+    updates: [{'kanji_id': int, 'is_learned': bool?, 'is_mastered': bool?, 'review_increment': int}]
+
+    Dòng chưa có được tạo bằng một INSERT ... ON CONFLICT DO NOTHING, sau đó
+    mọi dòng được cập nhật bằng một UPDATE duy nhất. review_count tăng bằng
+    F-expression trong DB nên hai thiết bị gửi cùng lúc không làm mất lượt ôn.
+
+    Trả về {'progress': [KanjiProgress], 'unknown': [kanji_id]}
+    """
+    deltas = _merge_updates(updates)
+
+    kanji_levels = dict(
+        Kanji.objects.filter(pk__in=deltas).values_list('pk', 'lesson__unit__level')
+    )
+    unknown = sorted(set(deltas) - set(kanji_levels))
+    deltas = {kanji_id: delta for kanji_id, delta in deltas.items() if kanji_id in kanji_levels}
+    if not deltas:
+        return {'progress': [], 'unknown': unknown}
+
+    with transaction.atomic():
+        KanjiProgress.objects.bulk_create(
+            [KanjiProgress(user=user, kanji_id=kanji_id) for kanji_id in deltas],
+            ignore_conflicts=True,
+        )
+
+        increments = {kanji_id: delta for kanji_id, delta in deltas.items() if delta['review_increment']}
+        KanjiProgress.objects.filter(user=user, kanji_id__in=deltas).update(
+            is_learned=_case(deltas, 'is_learned', F('is_learned')),
+            is_mastered=_case(deltas, 'is_mastered', F('is_mastered')),
+            review_count=F('review_count') + _case(increments, 'review_increment', Value(0)),
+            # update() bỏ qua auto_now -> ghi thời điểm cập nhật tường minh
+            last_reviewed_at=timezone.now(),
+        )
+
+        # bulk_create / update không phát signal -> tự đánh dấu rollup notebook cần tính lại
+        for level in set(kanji_levels.values()):
+            schedule_rollup_refresh(user.pk, NotebookCategory.KANJI, level)
+
+        progress = list(
+            KanjiProgress.objects.filter(user=user, kanji_id__in=deltas)
+            .select_related('kanji')
+            .prefetch_related('kanji__vocabularies')
+            .order_by('kanji_id')
+        )
+
+    return {'progress': progress, 'unknown': unknown}
@@ -1,3 +1,61 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.study.catalog import bump_catalog_version, clear_catalog_cache
+from apps.study.instrumentation import query_budget
+
+from .models import KanjiUnit, KanjiLesson, Kanji, KanjiVocabulary
+
+
+class KanjiUnitListQueryBudgetTest(TestCase):
+    """
+    GET /api/kanji/units/ trả cả cây unit -> lesson -> kanji -> từ vựng của level:
+    số query không được tăng theo số unit / bài / kanji.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='kanji-budget@example.com', password='x')
+        for unit_number in range(1, 4):
+            unit = KanjiUnit.objects.create(
+                level='N5', unit_number=unit_number, unit_name=f'第{unit_number}週', order=unit_number
+            )
+            for lesson_number in range(1, 4):
+                lesson = KanjiLesson.objects.create(
+                    unit=unit, lesson_number=lesson_number, lesson_name=f'Bài {lesson_number}', order=lesson_number
+                )
+                for order in range(1, 4):
+                    kanji = Kanji.objects.create(
+                        lesson=lesson,
+                        kanji=chr(0x4E00 + unit_number * 100 + lesson_number * 10 + order),
+                        hiragana='か',
+                        vietnamese='X',
+                        stroke_count=1,
+                        meaning='x',
+                        order=order,
+                    )
+                    KanjiVocabulary.objects.create(
+                        kanji=kanji, kanji_word=kanji.kanji, hiragana='か', meaning='x', order=1
+                    )
+        # on_commit không chạy trong TestCase -> tạo version nội dung như populate_* khi commit
+        bump_catalog_version()
+
+    def setUp(self):
+        cache.clear()
+        clear_catalog_cache()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_cold_list_has_no_repeated_queries(self):
+        # version catalog + unit + lesson + kanji + từ vựng
+        with query_budget(5):
+            response = self.client.get('/api/kanji/units/', {'level': 'N5'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_prebuilt_list_skips_database(self):
+        self.client.get('/api/kanji/units/', {'level': 'N5'})
+        with query_budget(0):
+            response = self.client.get('/api/kanji/units/', {'level': 'N5'})
+        self.assertEqual(response.status_code, 200)
@@ -5,8 +5,14 @@ from .views import (
     KanjiLessonDetailAPIView,
     KanjiDetailAPIView,
     KanjiSearchAPIView,
+    KanjiBrowseAPIView,
+    KanjiComponentListAPIView,
+    KanjiComponentLookupAPIView,
     KanjiProgressListAPIView,
+    KanjiProgressBatchAPIView,
     KanjiProgressDetailAPIView,
+    KanjiReviewDueAPIView,
+    KanjiReviewAPIView,
     KanjiFavoriteListAPIView,
     KanjiFavoriteDetailAPIView,
 )
@@ -22,11 +28,21 @@ urlpatterns = [
     # Kanji
     path('<int:kanji_id>/', KanjiDetailAPIView.as_view(), name='kanji-detail'),
     path('search/', KanjiSearchAPIView.as_view(), name='kanji-search'),
+    path('browse/', KanjiBrowseAPIView.as_view(), name='kanji-browse'),
+    
+    # Tra theo bộ thủ / thành phần
+    path('components/', KanjiComponentListAPIView.as_view(), name='kanji-component-list'),
+    path('components/lookup/', KanjiComponentLookupAPIView.as_view(), name='kanji-component-lookup'),
     
     # Progress
     path('progress/', KanjiProgressListAPIView.as_view(), name='kanji-progress-list'),
+    path('progress/batch/', KanjiProgressBatchAPIView.as_view(), name='kanji-progress-batch'),
     path('progress/<int:progress_id>/', KanjiProgressDetailAPIView.as_view(), name='kanji-progress-detail'),
     
+    # Ôn tập (spaced repetition)
+    path('reviews/due/', KanjiReviewDueAPIView.as_view(), name='kanji-review-due'),
+    path('reviews/', KanjiReviewAPIView.as_view(), name='kanji-review'),
+    
     # Favorites
     path('favorites/', KanjiFavoriteListAPIView.as_view(), name='kanji-favorite-list'),
     path('favorites/<int:favorite_id>/', KanjiFavoriteDetailAPIView.as_view(), name='kanji-favorite-detail'),
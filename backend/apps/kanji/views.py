@@ -2,8 +2,16 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
+from apps.study.payloads import prebuilt_json_response
+from apps.study.srs import ReviewGrade, apply_review, is_mature, parse_due_limit
+from . import facets
+from .components import get_index as get_component_index, parse_components
+from .search import search_kanji
+from .services import apply_progress_batch
 from .models import KanjiUnit, KanjiLesson, Kanji, KanjiProgress, KanjiFavorite
 from .serializers import (
     KanjiUnitSerializer,
@@ -12,6 +20,8 @@ from .serializers import (
     KanjiSerializer,
     KanjiDetailSerializer,
     KanjiProgressSerializer,
+    KanjiProgressBatchSerializer,
+    KanjiReviewSerializer,
     KanjiFavoriteSerializer
 )
 
@@ -25,10 +35,13 @@ class KanjiUnitListAPIView(APIView):
     def get(self, request):
         level = request.query_params.get('level', 'N5')
         
-        units = KanjiUnit.objects.filter(level=level).prefetch_related('lessons__kanjis__vocabularies')
-        serializer = KanjiUnitSerializer(units, many=True)
+        def build():
+            units = KanjiUnit.objects.filter(level=level).prefetch_related('lessons__kanjis__vocabularies')
+            return KanjiUnitSerializer(units, many=True).data
         
-        return Response(serializer.data)
+        # Cây unit -> lesson -> kanji của cả level chỉ đổi theo version nội dung:
+        # build + nén một lần, các request sau trả thẳng bản đã nén
+        return prebuilt_json_response(request, f"kanji-units:{level}", build)
 
 
 class KanjiUnitDetailAPIView(APIView):
@@ -92,23 +105,74 @@ class KanjiSearchAPIView(APIView):
         if not query:
             return Response([], status=status.HTTP_200_OK)
         
-        kanjis = Kanji.objects.all()
+        # Chỉ mục trong bộ nhớ: khớp chữ kanji, âm Hán Việt / on / kun, nghĩa
+        # (không phân biệt dấu), xếp hạng theo độ liên quan
+        kanjis = search_kanji(query, level=level)
         
-        # Tìm kiếm theo kanji hoặc vietnamese hoặc meaning
-        kanjis = kanjis.filter(
-            models.Q(kanji__icontains=query) |
-            models.Q(vietnamese__icontains=query) |
-            models.Q(meaning__icontains=query)
-        )
+        serializer = KanjiSerializer(kanjis, many=True)
+        return Response(serializer.data)
+
+
+class KanjiBrowseAPIView(APIView):
+    """
+    GET /api/kanji/browse/?level=N5&strokes=5-8&onyomi=true&kunyomi=false&state=learned&limit=50&offset=0
+    Duyệt kanji theo bộ lọc, kèm số lượng của từng lựa chọn lọc (facets)
+    """
+    
+    def get(self, request):
+        try:
+            filters = facets.parse_filters(request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        limit, offset = facets.parse_page(request.query_params)
         
-        # Lọc theo level nếu có
-        if level:
-            kanjis = kanjis.filter(lesson__unit__level=level)
+        # Số lượng tính từ histogram trong bộ nhớ + một query trạng thái của user
+        index = facets.get_index()
+        user_state = facets.get_user_state(request.user)
+        rows = list(index.filter_rows(filters, user_state))
+        
+        return Response({
+            'count': len(rows),
+            'facets': index.facet_counts(filters, user_state),
+            'results': [
+                {
+                    **row,
+                    'is_learned': row['id'] in user_state[facets.STATE_LEARNED],
+                    'is_mastered': row['id'] in user_state[facets.STATE_MASTERED],
+                    'is_favorite': row['id'] in user_state[facets.STATE_FAVORITE],
+                }
+                for row in rows[offset:offset + limit]
+            ],
+        })
+
+
+class KanjiComponentListAPIView(APIView):
+    """
+    GET /api/kanji/components/
+    Danh sách bộ thủ / thành phần cho bộ chọn kanji
+    """
+    
+    def get(self, request):
+        return Response(get_component_index().components())
+
+
+class KanjiComponentLookupAPIView(APIView):
+    """
+    GET /api/kanji/components/lookup/?components=日,土
+    Tìm kanji chứa tất cả các thành phần đã chọn
+    """
+    
+    def get(self, request):
+        components = parse_components(request.query_params.get('components', ''))
+        index = get_component_index()
         
-        kanjis = kanjis.prefetch_related('vocabularies')[:20]
+        if not components:
+            return Response({
+                'kanjis': [],
+                'available_components': [item['component'] for item in index.components()],
+            })
         
-        serializer = KanjiSerializer(kanjis, many=True)
-        return Response(serializer.data)
+        return Response(index.lookup(components))
 
 
 class KanjiProgressListAPIView(APIView):
@@ -169,6 +233,26 @@ class KanjiProgressListAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class KanjiProgressBatchAPIView(APIView):
+    """
+    POST /api/kanji/progress/batch/
+    Cập nhật tiến độ nhiều kanji trong một request:
+    {"updates": [{"kanji_id": 1, "is_learned": true, "review_increment": 1}, ...]}
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        serializer = KanjiProgressBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        result = apply_progress_batch(request.user, serializer.validated_data['updates'])
+        
+        return Response({
+            'progress': KanjiProgressSerializer(result['progress'], many=True).data,
+            'unknown_kanji_ids': result['unknown'],
+        })
+
+
 class KanjiProgressDetailAPIView(APIView):
     """
     PUT /api/kanji/progress/{progress_id}/
@@ -208,6 +292,60 @@ class KanjiProgressDetailAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class KanjiReviewDueAPIView(APIView):
+    """
+    GET /api/kanji/reviews/due/?limit=20
+    Các kanji đến hạn ôn, hạn sớm nhất trước (đọc theo index user + due_at)
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        limit = parse_due_limit(request.query_params.get('limit'))
+        
+        cards = list(
+            KanjiProgress.objects
+            .filter(user=request.user, due_at__lte=timezone.now())
+            .order_by('due_at')
+            .select_related('kanji')
+            .prefetch_related('kanji__vocabularies')[:limit + 1]
+        )
+        
+        return Response({
+            'cards': KanjiProgressSerializer(cards[:limit], many=True).data,
+            'has_more': len(cards) > limit,
+        })
+
+
+class KanjiReviewAPIView(APIView):
+    """
+    POST /api/kanji/reviews/
+    Ghi kết quả một lần ôn: {"kanji_id": 1, "grade": "again" | "hard" | "good" | "easy"}
+    và tính lịch ôn tiếp theo
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        serializer = KanjiReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        kanji = get_object_or_404(Kanji, id=serializer.validated_data['kanji_id'])
+        grade = serializer.validated_data['grade']
+        
+        with transaction.atomic():
+            progress, _ = KanjiProgress.objects.select_for_update().get_or_create(
+                user=request.user,
+                kanji=kanji
+            )
+            apply_review(progress, grade)
+            progress.review_count += 1
+            if grade != ReviewGrade.AGAIN:
+                progress.is_learned = True
+            progress.is_mastered = is_mature(progress)
+            progress.save()
+        
+        return Response(KanjiProgressSerializer(progress).data)
+
+
 class KanjiFavoriteListAPIView(APIView):
     """
     GET /api/kanji/favorites/
@@ -263,7 +401,3 @@ class KanjiFavoriteDetailAPIView(APIView):
         favorite.delete()
         
         return Response(status=status.HTTP_204_NO_CONTENT)
-
-
-# Import models để sử dụng Q
-from django.db import models
@@ -1,4 +1,6 @@
 from django.core.management.base import BaseCommand
+from apps.study.catalog import schedule_catalog_bump
+from django.db import transaction
 from apps.listening.models import (
     ListeningLesson, ListeningVocabulary, ListeningQuestion, ListeningChoice
 )
@@ -15,18 +17,23 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        if options['clear']:
-            self.stdout.write('Đang xóa data listening cũ...')
-            ListeningLesson.objects.all().delete()
-            self.stdout.write(self.style.SUCCESS('Đã xóa xong!'))
+        with transaction.atomic():
+            if options['clear']:
+                self.stdout.write('Đang xóa data listening cũ...')
+                ListeningLesson.objects.all().delete()
+                self.stdout.write(self.style.SUCCESS('Đã xóa xong!'))
 
-        self.stdout.write('Bắt đầu populate listening data...')
+            self.stdout.write('Bắt đầu populate listening data...')
 
-        # N5 Lessons
-        self.create_n5_lessons()
+            # N5 Lessons
+            self.create_n5_lessons()
         
-        # N4 Lessons
-        self.create_n4_lessons()
+            # N4 Lessons
+            self.create_n4_lessons()
+
+            # Nội dung đã đổi -> thống kê catalog (số bài, số từ...) phải tính lại;
+            # version đổi một lần khi transaction commit
+            schedule_catalog_bump()
 
         self.stdout.write(self.style.SUCCESS('Hoàn thành populate listening data!'))
 
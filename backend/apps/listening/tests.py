@@ -1,3 +1,43 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.study.catalog import bump_catalog_version, clear_catalog_cache
+from apps.study.instrumentation import query_budget
+
+from .models import ListeningLesson, ListeningProgress, ListeningQuestion
+
+
+class ListeningLessonListQueryBudgetTest(TestCase):
+    """
+    GET /api/listening/lessons/: số câu hỏi đọc từ thống kê catalog,
+    progress của user lấy một lần cho cả danh sách.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='listening-budget@example.com', password='x')
+        for order in range(1, 6):
+            lesson = ListeningLesson.objects.create(level='N5', order=order, title=f'Bài {order}')
+            for number in range(1, 3):
+                ListeningQuestion.objects.create(lesson=lesson, question_number=number, sentence='x')
+            if order <= 3:
+                ListeningProgress.objects.create(user=cls.user, lesson=lesson, total_questions=2)
+        # on_commit không chạy trong TestCase -> tạo version nội dung như populate_* khi commit
+        bump_catalog_version()
+
+    def setUp(self):
+        cache.clear()
+        clear_catalog_cache()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_has_no_repeated_queries(self):
+        # Request đầu nạp version / thống kê nội dung vào cache
+        self.client.get('/api/listening/lessons/', {'level': 'N5'})
+        # watermark progress + progress của user + bài
+        with query_budget(3):
+            response = self.client.get('/api/listening/lessons/', {'level': 'N5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 5)
@@ -1,9 +1,12 @@
 # apps/listening/views.py
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.study.conditional import conditional_on_progress
+from apps.study.payloads import prebuilt_json_response
 from .models import (
     ListeningLesson, ListeningProgress, ListeningQuestion, ListeningChoice,
     ListeningAttempt, ListeningAttemptAnswer
@@ -20,6 +23,7 @@ class ListeningLessonListAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     # GET /api/listening/lessons/?level=N5
+    @conditional_on_progress((ListeningProgress, "updated_at"))
     def get(self, request):
         level = request.query_params.get("level", "N5")
         lessons = ListeningLesson.objects.filter(level=level, is_published=True).order_by("order")
@@ -39,9 +43,17 @@ class ListeningLessonDetailAPIView(APIView):
 
     # GET /api/listening/lessons/<id>/
     def get(self, request, lesson_id: int):
-        lesson = ListeningLesson.objects.get(id=lesson_id, is_published=True)
-        serializer = ListeningLessonDetailSerializer(lesson, context={"request": request})
-        return Response(serializer.data)
+        def build():
+            lesson = get_object_or_404(
+                ListeningLesson.objects.prefetch_related("vocabularies", "questions__choices"),
+                id=lesson_id,
+                is_published=True
+            )
+            return ListeningLessonDetailSerializer(lesson, context={"request": request}).data
+
+        # Nội dung bài không phụ thuộc user -> JSON build sẵn theo version nội dung;
+        # audio_url / image là URL tuyệt đối nên mỗi origin một bản
+        return prebuilt_json_response(request, f"listening-lesson:{lesson_id}", build, absolute_urls=True)
 
 class ListeningSubmitAttemptAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
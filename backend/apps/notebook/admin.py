@@ -1,3 +1,15 @@
 from django.contrib import admin
+from .models import NotebookProgressRollup
 
-# Register your models here.
+
+@admin.register(NotebookProgressRollup)
+class NotebookProgressRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "user",
+        "category",
+        "level",
+        "mastered_count",
+        "reviewed_count",
+        "updated_at",
+    )
+    list_filter = ("category", "level")
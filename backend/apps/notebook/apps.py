@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class NotebookConfig(AppConfig):
     name = 'apps.notebook'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from apps.study.catalog import get_catalog_version
+
+from .models import NotebookCategory, NotebookProgressRollup
+
+
+# Payload notebook được cache theo (user, version, version nội dung). Version của user
+# lấy từ bảng rollup (updated_at lớn nhất + số dòng): mọi lần ghi progress đều ghi lại
+# rollup nên version đổi theo, và mọi worker đọc cùng một giá trị từ DB (cache mặc định
+# LocMemCache là riêng từng process, version lưu trong cache sẽ không đồng bộ giữa các worker).
+# populate_* / admin đổi nội dung thì version catalog đổi (payload chứa tổng số bài / mục).
+# Các key cũ tự hết hạn -> không cần xóa từng key.
+NOTEBOOK_CACHE_TIMEOUT = 60 * 60 * 24
+
+PAYLOAD_NAMES = ['categories', *(f'detail:{category}' for category in NotebookCategory.values)]
+
+
+def get_notebook_version(user_id):
+    """Một query aggregate trên index (user, category, level) của rollup"""
+    row = NotebookProgressRollup.objects.filter(user_id=user_id).aggregate(
+        last=Max('updated_at'), total=Count('pk')
+    )
+    last = row['last']
+    return f"{last.timestamp() if last else 0}:{row['total']}"
+
+
+def notebook_watermark(request):
+    """
+    Watermark cho conditional GET (apps.study.conditional): version notebook
+    đổi mỗi khi rollup của user được ghi. Giữ lại trên request để view không query lần hai.
+    """
+    request.notebook_version = get_notebook_version(request.user.pk)
+    return None, [request.notebook_version]
+
+
+def _payload_key(user_id, version, name):
+    return f"notebook:{user_id}:{version}:{get_catalog_version()}:{name}"
+
+
+def notebook_payload_keys(user_id, version=None):
+    """Key cache của mọi payload notebook của user ở version hiện tại"""
+    if version is None:
+        version = get_notebook_version(user_id)
+    return [_payload_key(user_id, version, name) for name in PAYLOAD_NAMES]
+
+
+def get_cached_notebook_payload(user_id, name, build, version=None):
+    """
+    Lấy payload đã serialize từ cache, nếu chưa có thì build() rồi lưu lại.
+    name: 'categories', 'detail:vocab', ...
+    version: version notebook đã đọc trong request (bỏ trống = đọc từ DB)
+    """
+    if version is None:
+        version = get_notebook_version(user_id)
+    key = _payload_key(user_id, version, name)
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, NOTEBOOK_CACHE_TIMEOUT)
+    return payload
+
+
+def get_cached_notebook_payloads(user_id, names, build_missing, version=None):
+    """
+    Như get_cached_notebook_payload cho nhiều payload: đọc cache một lần,
+    build_missing(names) chỉ được gọi với các payload chưa có và trả về {name: payload}.
+    """
+    if version is None:
+        version = get_notebook_version(user_id)
+    keys = {name: _payload_key(user_id, version, name) for name in names}
+    cached = cache.get_many(keys.values())
+    payloads = {name: cached[key] for name, key in keys.items() if key in cached}
+
+    missing = [name for name in names if name not in payloads]
+    if missing:
+        built = build_missing(missing)
+        cache.set_many({keys[name]: built[name] for name in missing}, NOTEBOOK_CACHE_TIMEOUT)
+        payloads.update(built)
+    return payloads
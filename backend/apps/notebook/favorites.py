@@ -0,0 +1,91 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+from apps.kanji.models import KanjiFavorite
+from apps.vocab.models import VocabularyFavorite
+
+
+# Danh sách yêu thích chung (từ vựng + kanji), mới nhất trước, phân trang keyset:
+# cursor là khóa (created_at, loại, id) của mục cuối trang trước, trang sau chỉ đọc
+# các dòng "nhỏ hơn" khóa đó theo index (user, -created_at, -id) của từng bảng.
+# Chi phí mỗi trang không phụ thuộc đang ở trang thứ mấy (khác OFFSET).
+
+VOCAB = 'vocab'
+KANJI = 'kanji'
+
+FAVORITE_SOURCES = {
+    VOCAB: lambda: VocabularyFavorite.objects.select_related('word').prefetch_related('word__examples'),
+    KANJI: lambda: KanjiFavorite.objects.select_related('kanji').prefetch_related('kanji__vocabularies'),
+}
+
+DEFAULT_FEED_LIMIT = 20
+MAX_FEED_LIMIT = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _sort_key(kind, favorite):
+    # Hai bảng có dãy id riêng -> thêm loại vào khóa để thứ tự luôn xác định
+    return (favorite.created_at, kind, favorite.id)
+
+
+def encode_cursor(kind, favorite):
+    raw = f"{favorite.created_at.isoformat()}|{kind}|{favorite.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """cursor -> (created_at, loại, id); sai định dạng -> InvalidCursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, kind, favorite_id = raw.split('|')
+        if kind not in FAVORITE_SOURCES:
+            raise ValueError(kind)
+        return datetime.fromisoformat(created_at), kind, int(favorite_id)
+    except ValueError as exc:
+        raise InvalidCursor(str(exc))
+
+
+def _after_cursor(kind, cursor):
+    """Điều kiện WHERE: các dòng đứng sau cursor theo thứ tự (created_at, loại, id) giảm dần"""
+    created_at, cursor_kind, cursor_id = cursor
+    if kind == cursor_kind:
+        return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=cursor_id)
+    if kind < cursor_kind:
+        return Q(created_at__lte=created_at)
+    return Q(created_at__lt=created_at)
+
+
+def get_favorite_page(user, kinds, cursor=None, limit=DEFAULT_FEED_LIMIT):
+    """
+    Một trang danh sách yêu thích.
+    Trả về ([(loại, favorite)], next_cursor hoặc None)
+    """
+    position = decode_cursor(cursor) if cursor else None
+
+    candidates = []
+    for kind in kinds:
+        queryset = FAVORITE_SOURCES[kind]().filter(user=user)
+        if position:
+            queryset = queryset.filter(_after_cursor(kind, position))
+        # Mỗi nguồn lấy limit + 1 dòng: gộp lại dư ra nghĩa là còn trang sau
+        rows = queryset.order_by('-created_at', '-id')[:limit + 1]
+        candidates.extend((kind, favorite) for favorite in rows)
+
+    candidates.sort(key=lambda item: _sort_key(*item), reverse=True)
+    page = candidates[:limit]
+    next_cursor = encode_cursor(*page[-1]) if len(candidates) > limit else None
+    return page, next_cursor
+
+
+def parse_feed_limit(value):
+    """Số mục mỗi trang, giới hạn trong [1, MAX_FEED_LIMIT]"""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_FEED_LIMIT
+    return min(max(limit, 1), MAX_FEED_LIMIT)
@@ -0,0 +1,263 @@
+"""
+Benchmark màn hình notebook trên bộ dữ liệu tổng hợp.
+Chạy: python manage.py benchmark_notebook
+      python manage.py benchmark_notebook --write-budgets   (ghi lại budget mới)
+
+Dữ liệu được tạo trong một transaction và rollback khi kết thúc,
+không để lại gì trong database.
+"""
+from pathlib import Path
+
+from django.core.cache import cache
+
+from apps.accounts.models import User
+from apps.study.benchmarking import ORDER_OFFSET, BenchmarkCommand, measure, merge_worst
+from apps.study.models import Question, Choice
+from apps.vocab.models import VocabularyLesson, VocabularyWord, VocabularyWordProgress
+from apps.kanji.models import KanjiUnit, KanjiLesson, Kanji, KanjiProgress
+from apps.grammar.models import GrammarLesson, GrammarProgress
+from apps.reading.models import ReadingLesson, ReadingProgress
+from apps.listening.models import ListeningLesson, ListeningProgress
+from apps.jlpt_practice.models import JLPTTest, JLPTAttempt
+from apps.notebook.cache import notebook_payload_keys
+from apps.notebook.models import NotebookCategory
+from apps.notebook.services import JLPT_LEVELS, rebuild_rollups
+from apps.notebook.views import (
+    NotebookCategoriesAPIView,
+    NotebookCategoryDetailAPIView,
+    NotebookCategoryDetailsBatchAPIView,
+)
+
+
+class Command(BenchmarkCommand):
+    help = 'Đo số query, thời gian và bộ nhớ của các API notebook, so với budget trong repo'
+    budgets_path = Path(__file__).resolve().parents[2] / 'benchmark_budgets.json'
+    label = 'notebook'
+    default_users = 20
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--words-per-level', type=int, default=2000)
+        parser.add_argument('--kanji-per-level', type=int, default=500)
+        parser.add_argument('--lessons-per-level', type=int, default=20,
+                            help='Số bài ngữ pháp / đọc / nghe mỗi level')
+        parser.add_argument('--sample', type=int, default=5,
+                            help='Số user được đo (lấy kết quả xấu nhất)')
+
+    # =========================
+    # SEED
+    # =========================
+    def seed_catalog(self):
+        opts = self.options
+        self.stdout.write('Đang tạo dữ liệu tổng hợp...')
+
+        self.words = {}
+        self.kanjis = {}
+        self.grammar_lessons = {}
+        self.reading_lessons = {}
+        self.listening_lessons = {}
+        self.tests = {}
+
+        for level in JLPT_LEVELS:
+            lessons = VocabularyLesson.objects.bulk_create([
+                VocabularyLesson(jlpt_level=level, order=ORDER_OFFSET + i, title=f'Bench {level} {i}')
+                for i in range(max(opts['words_per_level'] // 20, 1))
+            ])
+            VocabularyWord.objects.bulk_create([
+                VocabularyWord(
+                    lesson=lessons[i % len(lessons)],
+                    hiragana=f'ことば{i}',
+                    vietnamese='TỪ',
+                    meaning='Từ',
+                    order=i,
+                )
+                for i in range(opts['words_per_level'])
+            ], batch_size=1000)
+            self.words[level] = list(
+                VocabularyWord.objects.filter(lesson__in=lessons).values_list('id', flat=True)
+            )
+
+            units = KanjiUnit.objects.bulk_create([
+                KanjiUnit(level=level, unit_number=ORDER_OFFSET + i, unit_name=f'Bench {i}')
+                for i in range(max(opts['kanji_per_level'] // 50, 1))
+            ])
+            kanji_lessons = KanjiLesson.objects.bulk_create([
+                KanjiLesson(unit=unit, lesson_number=i)
+                for unit in units
+                for i in range(5)
+            ])
+            Kanji.objects.bulk_create([
+                Kanji(
+                    lesson=kanji_lessons[i % len(kanji_lessons)],
+                    kanji='字',
+                    vietnamese='TỰ',
+                    stroke_count=6,
+                    meaning='Chữ',
+                    order=i,
+                )
+                for i in range(opts['kanji_per_level'])
+            ], batch_size=1000)
+            self.kanjis[level] = list(
+                Kanji.objects.filter(lesson__in=kanji_lessons).values_list('id', flat=True)
+            )
+
+            grammar_lessons = []
+            for i in range(opts['lessons_per_level']):
+                lesson = GrammarLesson.objects.create(
+                    level=level,
+                    order=ORDER_OFFSET + i,
+                    title=f'Bench {level} {i}',
+                    grammar_point_count=3,
+                    content='',
+                )
+                questions = Question.objects.bulk_create([
+                    Question(prompt=f'{level}-{i}-{q}') for q in range(10)
+                ])
+                Choice.objects.bulk_create([
+                    Choice(question=question, text=str(c), is_correct=c == 0)
+                    for question in questions
+                    for c in range(4)
+                ])
+                lesson.questions.add(*questions)
+                grammar_lessons.append(lesson)
+            self.grammar_lessons[level] = grammar_lessons
+
+            self.reading_lessons[level] = ReadingLesson.objects.bulk_create([
+                ReadingLesson(level=level, order=ORDER_OFFSET + i, title=f'Bench {i}', preview='')
+                for i in range(opts['lessons_per_level'])
+            ])
+            self.listening_lessons[level] = ListeningLesson.objects.bulk_create([
+                ListeningLesson(level=level, order=ORDER_OFFSET + i, title=f'Bench {i}')
+                for i in range(opts['lessons_per_level'])
+            ])
+            self.tests[level] = JLPTTest.objects.bulk_create([
+                JLPTTest(level=level, order=ORDER_OFFSET + i, title=f'Bench {i}')
+                for i in range(5)
+            ])
+
+    def _touched(self, items, level_index, current_index):
+        """
+        Phân bố tiến độ thực tế: level thấp hơn level hiện tại gần như học hết,
+        level hiện tại học dở, level cao hơn chưa chạm tới.
+        Trả về [(item, mastered)].
+        """
+        if level_index > current_index:
+            return []
+        if level_index < current_index:
+            share, mastery = self.rng.uniform(0.9, 1.0), 0.95
+        else:
+            share, mastery = self.rng.uniform(0.1, 0.7), 0.6
+        touched = self.rng.sample(items, int(len(items) * share))
+        return [(item, self.rng.random() < mastery) for item in touched]
+
+    def seed_users(self):
+        users = []
+        for i in range(self.options['users']):
+            user = User.objects.create(email=f'bench-{i}@benchmark.local', full_name=f'Bench {i}')
+            current_index = self.rng.randrange(len(JLPT_LEVELS))
+
+            word_progress = []
+            kanji_progress = []
+            grammar_progress = []
+            reading_progress = []
+            listening_progress = []
+            attempts = []
+
+            for level_index, level in enumerate(JLPT_LEVELS):
+                for word_id, mastered in self._touched(self.words[level], level_index, current_index):
+                    word_progress.append(VocabularyWordProgress(user=user, word_id=word_id, is_learned=mastered))
+                for kanji_id, mastered in self._touched(self.kanjis[level], level_index, current_index):
+                    kanji_progress.append(KanjiProgress(user=user, kanji_id=kanji_id, is_mastered=mastered))
+                for lesson, mastered in self._touched(self.grammar_lessons[level], level_index, current_index):
+                    grammar_progress.append(GrammarProgress(
+                        user=user, lesson=lesson, correct_count=10 if mastered else self.rng.randrange(8)
+                    ))
+                for lesson, mastered in self._touched(self.reading_lessons[level], level_index, current_index):
+                    reading_progress.append(ReadingProgress(
+                        user=user, lesson=lesson, total_questions=5,
+                        status='completed' if mastered else 'in-progress',
+                    ))
+                for lesson, mastered in self._touched(self.listening_lessons[level], level_index, current_index):
+                    listening_progress.append(ListeningProgress(
+                        user=user, lesson=lesson,
+                        status='completed' if mastered else 'in-progress',
+                    ))
+                for test, mastered in self._touched(self.tests[level], level_index, current_index):
+                    attempts.append(JLPTAttempt(
+                        user=user, test=test, status='submitted',
+                        score=self.rng.randrange(108, 180) if mastered else self.rng.randrange(108),
+                    ))
+
+            # bulk_create không phát signal -> rollup được tính một lần ở cuối
+            VocabularyWordProgress.objects.bulk_create(word_progress, batch_size=1000)
+            KanjiProgress.objects.bulk_create(kanji_progress, batch_size=1000)
+            GrammarProgress.objects.bulk_create(grammar_progress)
+            ReadingProgress.objects.bulk_create(reading_progress)
+            ListeningProgress.objects.bulk_create(listening_progress)
+            JLPTAttempt.objects.bulk_create(attempts)
+            users.append(user)
+
+        rebuild_rollups([user.pk for user in users])
+        self.stdout.write(
+            f'Đã tạo {len(users)} users, '
+            f'{VocabularyWordProgress.objects.filter(user__in=users).count()} vocab progress, '
+            f'{KanjiProgress.objects.filter(user__in=users).count()} kanji progress'
+        )
+        return users
+
+    # =========================
+    # MEASURE
+    # =========================
+    def _call(self, view, user, cold, etag=None, **kwargs):
+        call = self.view_call(
+            view, user, '/api/notebook/',
+            expected_status=304 if etag else 200,
+            headers={'HTTP_IF_NONE_MATCH': etag} if etag else None,
+            **kwargs,
+        )
+        if not cold:
+            return call
+
+        # Version không đổi trong lúc đo -> tính key một lần, ngoài phần được đo
+        payload_keys = notebook_payload_keys(user.pk)
+
+        def cold_call():
+            cache.delete_many(payload_keys)
+            return call()
+
+        return cold_call
+
+    def run_benchmarks(self, users):
+        sample = users[:self.options['sample']]
+        repeat = self.options['repeat']
+
+        endpoints = {
+            'categories': (NotebookCategoriesAPIView.as_view(), {}),
+        }
+        for value, label in NotebookCategory.choices:
+            endpoints[f'detail:{value}'] = (NotebookCategoryDetailAPIView.as_view(), {'category': label})
+        endpoints['details:all'] = (NotebookCategoryDetailsBatchAPIView.as_view(), {})
+
+        results = {}
+        for name, (view, kwargs) in endpoints.items():
+            results[name] = merge_worst([
+                measure(self._call(view, user, cold=True, **kwargs), repeat)
+                for user in sample
+            ])
+        # Mở lại tab notebook khi progress không đổi -> đọc từ cache
+        cached = []
+        for user in sample:
+            call = self._call(NotebookCategoriesAPIView.as_view(), user, cold=False)
+            call()
+            cached.append(measure(call, repeat))
+        results['categories:cached'] = merge_worst(cached)
+
+        # Client gửi lại ETag khi progress không đổi -> 304, không serialize
+        not_modified = []
+        for user in sample:
+            etag = self._call(NotebookCategoriesAPIView.as_view(), user, cold=False)()['ETag']
+            not_modified.append(measure(
+                self._call(NotebookCategoriesAPIView.as_view(), user, cold=False, etag=etag), repeat
+            ))
+        results['categories:not-modified'] = merge_worst(not_modified)
+        return results
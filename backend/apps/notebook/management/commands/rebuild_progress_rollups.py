@@ -0,0 +1,163 @@
+"""
+Tính lại toàn bộ bảng rollup notebook từ các bảng progress gốc
+(VocabularyWordProgress, KanjiProgress, GrammarProgress, ReadingProgress,
+ListeningProgress, JLPTAttempt).
+
+Chạy: python manage.py rebuild_progress_rollups
+      python manage.py rebuild_progress_rollups --chunk-size 1000 --workers 4
+      python manage.py rebuild_progress_rollups --checkpoint /tmp/rollups.json   (chạy lại để tiếp tục)
+
+User được đọc theo thứ tự id từng trang (keyset: id > id cuối của trang trước)
+và xử lý từng nhóm: mỗi nhóm chỉ vài query GROUP BY + một lần upsert, nên bộ
+nhớ không phụ thuộc số user. Không giữ cursor mở suốt lần chạy để các process
+con ghi song song không bị khóa.
+Rollup được upsert từng nhóm, API notebook vẫn chạy bình thường trong lúc backfill.
+"""
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+# =========================
+# WORKER (chạy trong process con, import model muộn để dùng được cả spawn)
+# =========================
+def _init_worker():
+    django.setup()
+    # Không dùng lại connection kế thừa từ process cha
+    connections.close_all()
+
+
+def _user_id_chunks(after_id, chunk_size):
+    from apps.accounts.models import User
+
+    while True:
+        chunk = list(
+            User.objects.filter(pk__gt=after_id)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:chunk_size]
+        )
+        if not chunk:
+            return
+        yield chunk
+        after_id = chunk[-1]
+
+
+def _rebuild_chunk(user_ids):
+    from apps.notebook.services import rebuild_rollups
+
+    rebuild_rollups(user_ids)
+    return len(user_ids)
+
+
+class Command(BaseCommand):
+    help = 'Tính lại rollup tiến độ notebook của mọi user theo từng nhóm, có thể tiếp tục sau khi bị ngắt'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Số user mỗi nhóm')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Số process chạy song song')
+        parser.add_argument('--checkpoint', type=str, default=None,
+                            help='File lưu user id cuối cùng đã xong, dùng để tiếp tục')
+        parser.add_argument('--restart', action='store_true',
+                            help='Bỏ qua checkpoint cũ, chạy lại từ đầu')
+
+    def handle(self, *args, **options):
+        from apps.accounts.models import User
+
+        chunk_size = options['chunk_size']
+        workers = options['workers']
+        if chunk_size < 1 or workers < 1:
+            raise CommandError('--chunk-size và --workers phải >= 1')
+
+        self.checkpoint_path = Path(options['checkpoint']) if options['checkpoint'] else None
+        after_id = 0 if options['restart'] else self.load_checkpoint()
+        if after_id:
+            self.stdout.write(f'Tiếp tục sau user id {after_id}')
+
+        total = User.objects.filter(pk__gt=after_id).count()
+        self.stdout.write(f'Cần tính lại rollup cho {total} users ({workers} process)')
+
+        chunks = _user_id_chunks(after_id, chunk_size)
+
+        self.started = time.perf_counter()
+        self.done = 0
+        self.total = total
+
+        if workers == 1:
+            for chunk in chunks:
+                _rebuild_chunk(chunk)
+                self.chunk_finished(chunk)
+        else:
+            self.run_parallel(chunks, workers)
+
+        self.clear_checkpoint()
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'Xong {self.done} users trong {elapsed:.1f}s '
+            f'({self.done / elapsed if elapsed else 0:.0f} users/s)'
+        ))
+
+    def run_parallel(self, chunks, workers):
+        """
+        Gửi từng nhóm cho pool và chờ theo đúng thứ tự gửi: checkpoint luôn là
+        id cuối của một dãy nhóm liên tiếp đã xong. Số nhóm đang chờ bị giới
+        hạn để bộ nhớ không tăng theo số user.
+        """
+        # Process con không được dùng chung connection với process cha
+        connections.close_all()
+        pending = deque()
+
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            for chunk in chunks:
+                pending.append((chunk, pool.apply_async(_rebuild_chunk, (chunk,))))
+                if len(pending) >= workers * 2:
+                    self.wait_oldest(pending)
+            while pending:
+                self.wait_oldest(pending)
+
+    def wait_oldest(self, pending):
+        chunk, result = pending.popleft()
+        result.get()
+        self.chunk_finished(chunk)
+
+    def chunk_finished(self, chunk):
+        self.done += len(chunk)
+        self.save_checkpoint(chunk[-1])
+
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed else 0
+        remaining = (self.total - self.done) / rate if rate else 0
+        self.stdout.write(
+            f'{self.done}/{self.total} users  {rate:.0f} users/s  '
+            f'còn khoảng {remaining:.0f}s  (user id cuối {chunk[-1]})'
+        )
+
+    # =========================
+    # CHECKPOINT
+    # =========================
+    def load_checkpoint(self):
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return 0
+        with open(self.checkpoint_path, encoding='utf-8') as checkpoint_file:
+            return json.load(checkpoint_file)['last_user_id']
+
+    def save_checkpoint(self, last_user_id):
+        if not self.checkpoint_path:
+            return
+        # Ghi file tạm rồi đổi tên để checkpoint không bao giờ bị ghi dở
+        tmp_path = self.checkpoint_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as checkpoint_file:
+            json.dump({'last_user_id': last_user_id}, checkpoint_file)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        if self.checkpoint_path and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotebookProgressRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('vocab', 'Từ vựng'), ('kanji', 'Kanji'), ('grammar', 'Ngữ pháp'), ('reading', 'Đọc hiểu'), ('listening', 'Nghe hiểu'), ('jlpt', 'Thi JLPT')], max_length=20)),
+                ('level', models.CharField(choices=[('N5', 'N5'), ('N4', 'N4'), ('N3', 'N3'), ('N2', 'N2'), ('N1', 'N1')], max_length=2)),
+                ('mastered_count', models.PositiveIntegerField(default=0, help_text='Từ đã thuộc / kanji thành thạo / bài hoàn thành / đề đã đậu')),
+                ('reviewed_count', models.PositiveIntegerField(default=0, help_text='Số mục user đã học hoặc đang làm')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notebook_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'category', 'level')},
+            },
+        ),
+    ]
@@ -1,6 +1,59 @@
 from django.db import models
 from django.conf import settings
+from apps.study.models import JlptLevel
 
-# Notebook app không cần models riêng
-# Nó sẽ aggregate data từ các app khác:
+# Notebook không lưu nội dung riêng, chỉ aggregate data từ các app khác:
 # - vocab, kanji, grammar, reading, listening, jlpt_practice
+# NotebookProgressRollup là bảng tổng hợp sẵn để màn hình notebook
+# chỉ cần đọc O(levels) dòng thay vì duyệt toàn bộ bài / từ.
+
+
+class NotebookCategory(models.TextChoices):
+    # label = tên category FE đang dùng (cũng là tham số URL của notebook)
+    VOCAB = "vocab", "Từ vựng"
+    KANJI = "kanji", "Kanji"
+    GRAMMAR = "grammar", "Ngữ pháp"
+    READING = "reading", "Đọc hiểu"
+    LISTENING = "listening", "Nghe hiểu"
+    JLPT = "jlpt", "Thi JLPT"
+
+
+class NotebookProgressRollup(models.Model):
+    """
+    Tiến độ tổng hợp của user theo (category, level).
+    Được cập nhật mỗi khi bảng progress gốc thay đổi (xem signals.py).
+    Tổng số mục của level không lưu ở đây mà đọc từ thống kê catalog.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notebook_rollups"
+    )
+
+    category = models.CharField(
+        max_length=20,
+        choices=NotebookCategory.choices
+    )
+
+    level = models.CharField(
+        max_length=2,
+        choices=JlptLevel.choices
+    )
+
+    mastered_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Từ đã thuộc / kanji thành thạo / bài hoàn thành / đề đã đậu"
+    )
+
+    reviewed_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Số mục user đã học hoặc đang làm"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "category", "level")
+
+    def __str__(self):
+        return f"{self.user_id} - {self.category} {self.level} ({self.mastered_count}/{self.reviewed_count})"
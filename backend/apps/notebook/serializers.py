@@ -1,5 +1,8 @@
 from rest_framework import serializers
 
+from apps.kanji.serializers import KanjiSerializer
+from apps.vocab.serializers import VocabularyWordSerializer
+
 
 class NotebookCategorySummarySerializer(serializers.Serializer):
     """Serializer for notebook category summary"""
@@ -22,3 +25,25 @@ class NotebookLevelDetailSerializer(serializers.Serializer):
     review_total = serializers.IntegerField()
     locked = serializers.BooleanField()
 
+
+class FavoriteFeedItemSerializer(serializers.Serializer):
+    """Một mục trong danh sách yêu thích chung: (loại, favorite)"""
+    type = serializers.SerializerMethodField()
+    id = serializers.SerializerMethodField()
+    created_at = serializers.SerializerMethodField()
+    item = serializers.SerializerMethodField()
+
+    def get_type(self, obj):
+        return obj[0]
+
+    def get_id(self, obj):
+        return obj[1].id
+
+    def get_created_at(self, obj):
+        return serializers.DateTimeField().to_representation(obj[1].created_at)
+
+    def get_item(self, obj):
+        kind, favorite = obj
+        if kind == 'kanji':
+            return KanjiSerializer(favorite.kanji).data
+        return VocabularyWordSerializer(favorite.word, context=self.context).data
@@ -0,0 +1,434 @@
+from collections import defaultdict
+
+from django.db.models import Count, Max, Q
+
+from apps.study.catalog import GRAMMAR, get_lesson_stat, get_level_totals
+from apps.vocab.models import VocabularyWordProgress
+from apps.kanji.models import KanjiProgress
+from apps.grammar.models import GrammarProgress
+from apps.reading.models import ReadingProgress
+from apps.listening.models import ListeningProgress
+from apps.jlpt_practice.models import JLPTAttempt
+
+from .models import NotebookCategory, NotebookProgressRollup
+
+
+JLPT_LEVELS = ['N5', 'N4', 'N3', 'N2', 'N1']
+
+GRAMMAR_COMPLETE_PERCENT = 80  # Bài ngữ pháp đúng >= 80% coi như hoàn thành
+JLPT_PASS_PERCENT = 60  # Đề JLPT đạt >= 60% tổng điểm coi như đậu
+
+
+def _empty_counts():
+    return {'mastered': 0, 'reviewed': 0}
+
+
+# =========================
+# CATALOG TOTALS
+# =========================
+def get_catalog_totals(categories=None):
+    """
+    Tổng số bài / mục theo level của từng category.
+    Lấy từ thống kê catalog (apps.study.catalog), chỉ tính lại khi nội dung đổi.
+
+    Trả về: {category: {level: {'total_lessons': int, 'total_items': int}}}
+    """
+    categories = categories or NotebookCategory.values
+    return {category: get_level_totals(category) for category in categories}
+
+
+# =========================
+# USER COUNTS (từ bảng progress gốc)
+# =========================
+def _filter_levels(queryset, level_field, levels):
+    if levels:
+        queryset = queryset.filter(**{f'{level_field}__in': levels})
+    return queryset
+
+
+def _count_items(model, level_field, mastered_filter, user_ids, levels):
+    """Vocab / Kanji: đếm số mục đã chạm tới và đã thành thạo theo level"""
+    queryset = _filter_levels(model.objects.filter(user_id__in=user_ids), level_field, levels)
+    rows = (
+        queryset
+        .order_by()
+        .values('user_id', level_field)
+        .annotate(
+            reviewed=Count('id'),
+            mastered=Count('id', filter=mastered_filter),
+        )
+    )
+    for row in rows:
+        yield row['user_id'], row[level_field], {
+            'mastered': row['mastered'],
+            'reviewed': row['reviewed'],
+        }
+
+
+def _count_vocab(user_ids, levels=None):
+    return _count_items(
+        VocabularyWordProgress, 'word__lesson__jlpt_level', Q(is_learned=True),
+        user_ids, levels,
+    )
+
+
+def _count_kanji(user_ids, levels=None):
+    return _count_items(
+        KanjiProgress, 'kanji__lesson__unit__level', Q(is_mastered=True),
+        user_ids, levels,
+    )
+
+
+def _count_grammar(user_ids, levels=None):
+    # Số câu hỏi của bài lấy từ thống kê catalog, không JOIN bảng câu hỏi
+    queryset = _filter_levels(
+        GrammarProgress.objects.filter(user_id__in=user_ids), 'lesson__level', levels
+    )
+    rows = queryset.order_by().values('user_id', 'lesson_id', 'lesson__level', 'correct_count')
+    counts = defaultdict(_empty_counts)
+    for row in rows:
+        total_questions = get_lesson_stat(GRAMMAR, row['lesson_id'])
+        if not total_questions:
+            continue
+        level_counts = counts[(row['user_id'], row['lesson__level'])]
+        level_counts['reviewed'] += 1
+        if row['correct_count'] * 100 >= total_questions * GRAMMAR_COMPLETE_PERCENT:
+            level_counts['mastered'] += 1
+
+    for (user_id, level), level_counts in counts.items():
+        yield user_id, level, level_counts
+
+
+def _count_lessons(model, user_ids, levels):
+    """Đọc hiểu / Nghe hiểu: bài hoàn thành và bài đang làm theo status"""
+    queryset = _filter_levels(model.objects.filter(user_id__in=user_ids), 'lesson__level', levels)
+    rows = (
+        queryset
+        .order_by()
+        .values('user_id', 'lesson__level')
+        .annotate(
+            completed=Count('id', filter=Q(status='completed')),
+            started=Count('id', filter=Q(status='in-progress')),
+        )
+    )
+    for row in rows:
+        yield row['user_id'], row['lesson__level'], {
+            'mastered': row['completed'],
+            'reviewed': row['completed'] + row['started'],
+        }
+
+
+def _count_reading(user_ids, levels=None):
+    return _count_lessons(ReadingProgress, user_ids, levels)
+
+
+def _count_listening(user_ids, levels=None):
+    return _count_lessons(ListeningProgress, user_ids, levels)
+
+
+def _count_jlpt(user_ids, levels=None):
+    # Điểm cao nhất của user trên từng đề đã nộp: mastered = số đề đã đậu,
+    # reviewed = số đề đã nộp bài
+    queryset = _filter_levels(
+        JLPTAttempt.objects.filter(user_id__in=user_ids, status='submitted'),
+        'test__level', levels,
+    )
+    rows = (
+        queryset
+        .order_by()
+        .values('user_id', 'test_id', 'test__level', 'test__total_score')
+        .annotate(best_score=Max('score'))
+    )
+    counts = defaultdict(_empty_counts)
+    for row in rows:
+        level_counts = counts[(row['user_id'], row['test__level'])]
+        level_counts['reviewed'] += 1
+        total_score = row['test__total_score']
+        if total_score > 0 and row['best_score'] * 100 >= total_score * JLPT_PASS_PERCENT:
+            level_counts['mastered'] += 1
+
+    for (user_id, level), level_counts in counts.items():
+        yield user_id, level, level_counts
+
+
+USER_COUNTERS = {
+    NotebookCategory.VOCAB: _count_vocab,
+    NotebookCategory.KANJI: _count_kanji,
+    NotebookCategory.GRAMMAR: _count_grammar,
+    NotebookCategory.READING: _count_reading,
+    NotebookCategory.LISTENING: _count_listening,
+    NotebookCategory.JLPT: _count_jlpt,
+}
+
+
+def get_user_counts(user_ids, categories=None, levels=None):
+    """
+    Đếm tiến độ của nhiều user cùng lúc từ bảng progress gốc bằng các query
+    GROUP BY (mỗi category một query, không lặp theo bài / từ).
+
+    - mastered: từ đã thuộc / kanji thành thạo / bài hoàn thành / đề đã đậu
+    - reviewed: số mục user đã chạm tới (đã học, đang làm hoặc đã hoàn thành)
+
+    Trả về: {user_id: {category: {level: {'mastered': int, 'reviewed': int}}}}
+    """
+    user_ids = list(user_ids)
+    counts = defaultdict(lambda: defaultdict(lambda: defaultdict(_empty_counts)))
+
+    for category in categories or NotebookCategory.values:
+        for user_id, level, level_counts in USER_COUNTERS[category](user_ids, levels):
+            counts[user_id][category][level] = level_counts
+
+    return counts
+
+
+# =========================
+# ROLLUPS
+# =========================
+def _upsert_rollups(rollups):
+    NotebookProgressRollup.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=['user', 'category', 'level'],
+        update_fields=['mastered_count', 'reviewed_count', 'updated_at'],
+    )
+    # updated_at mới làm đổi version notebook (apps.notebook.cache) -> payload cũ hết hiệu lực
+
+
+def rebuild_rollups(user_ids):
+    """Tính lại toàn bộ rollup (6 category x 5 level) cho một nhóm user"""
+    user_ids = list(user_ids)
+    counts = get_user_counts(user_ids)
+
+    rollups = []
+    for user_id in user_ids:
+        for category in NotebookCategory.values:
+            for level in JLPT_LEVELS:
+                level_counts = counts[user_id][category][level]
+                rollups.append(NotebookProgressRollup(
+                    user_id=user_id,
+                    category=category,
+                    level=level,
+                    mastered_count=level_counts['mastered'],
+                    reviewed_count=level_counts['reviewed'],
+                ))
+
+    _upsert_rollups(rollups)
+    return rollups
+
+
+def refresh_rollup(user_id, category, level):
+    """
+    Cập nhật một dòng rollup sau khi progress của user thay đổi.
+    User chưa có rollup nào (data cũ trước khi có bảng này) sẽ được tính lại toàn bộ.
+    """
+    if not NotebookProgressRollup.objects.filter(user_id=user_id).exists():
+        rebuild_rollups([user_id])
+        return
+
+    level_counts = get_user_counts([user_id], [category], [level])[user_id][category][level]
+
+    _upsert_rollups([NotebookProgressRollup(
+        user_id=user_id,
+        category=category,
+        level=level,
+        mastered_count=level_counts['mastered'],
+        reviewed_count=level_counts['reviewed'],
+    )])
+
+
+def get_user_rollups(user, categories=None):
+    """
+    Đọc rollup của user: {category: {level: {'mastered': int, 'reviewed': int}}}
+    """
+    rollups = NotebookProgressRollup.objects.filter(user=user)
+    if categories:
+        rollups = rollups.filter(category__in=categories)
+
+    rows = list(rollups.values('category', 'level', 'mastered_count', 'reviewed_count'))
+    if not rows and not NotebookProgressRollup.objects.filter(user=user).exists():
+        rows = [
+            {
+                'category': rollup.category,
+                'level': rollup.level,
+                'mastered_count': rollup.mastered_count,
+                'reviewed_count': rollup.reviewed_count,
+            }
+            for rollup in rebuild_rollups([user.pk])
+            if not categories or rollup.category in categories
+        ]
+
+    counts = defaultdict(lambda: defaultdict(_empty_counts))
+    for row in rows:
+        counts[row['category']][row['level']] = {
+            'mastered': row['mastered_count'],
+            'reviewed': row['reviewed_count'],
+        }
+    return counts
+
+
+# =========================
+# STATUS RULES
+# =========================
+def get_level_summary_status(category, level_counts, level_totals):
+    """
+    Trạng thái của một level trên màn hình tổng quan:
+    'completed', 'in-progress' hoặc None (chưa bắt đầu / level chưa có nội dung)
+    """
+    total_lessons = level_totals.get('total_lessons', 0)
+    if total_lessons == 0:
+        return None
+
+    mastered = level_counts['mastered']
+    reviewed = level_counts['reviewed']
+
+    if category in (NotebookCategory.VOCAB, NotebookCategory.KANJI):
+        total_items = level_totals['total_items']
+        if total_items == 0:
+            return None
+        if mastered >= total_items:
+            return 'completed'
+        return 'in-progress' if mastered > 0 else None
+
+    if category == NotebookCategory.JLPT:
+        if reviewed == 0:
+            return None
+        return 'completed' if mastered > 0 else 'in-progress'
+
+    # Ngữ pháp / Đọc hiểu / Nghe hiểu: hoàn thành khi mọi bài trong level đều xong
+    if mastered >= total_lessons:
+        return 'completed'
+    return 'in-progress' if reviewed > 0 else None
+
+
+def _percent(part, total):
+    return int((part / total) * 100) if total > 0 else 0
+
+
+def get_level_detail(category, level, level_counts, level_totals):
+    """Một dòng chi tiết level cho NotebookLevelDetailSerializer"""
+    total_lessons = level_totals.get('total_lessons', 0)
+    total_items = level_totals.get('total_items', 0)
+    mastered = level_counts['mastered']
+    reviewed = level_counts['reviewed']
+
+    if total_lessons == 0:
+        return {
+            'level': level,
+            'status': 'locked',
+            'lessons_completed': 0,
+            'total_lessons': 0,
+            'mastered_items': 0,
+            'total_items': 0,
+            'completion_percent': 0,
+            'reviewed_items': 0,
+            'review_total': 0,
+            'locked': True
+        }
+
+    if category in (NotebookCategory.VOCAB, NotebookCategory.KANJI):
+        completion_percent = _percent(mastered, total_items)
+        lessons_completed = (
+            total_lessons if completion_percent >= 100
+            else int((completion_percent / 100) * total_lessons)
+        )
+        mastered_items = mastered
+        review_total = total_items
+    elif category == NotebookCategory.GRAMMAR:
+        # Ngữ pháp tính theo bài; điểm ngữ pháp suy ra theo tỉ lệ bài hoàn thành
+        completion_percent = _percent(mastered, total_lessons)
+        lessons_completed = mastered
+        mastered_items = (
+            total_items if completion_percent >= 100
+            else int((completion_percent / 100) * total_items)
+        )
+        reviewed = mastered
+        review_total = total_lessons
+    else:
+        completion_percent = _percent(mastered, total_lessons)
+        lessons_completed = mastered
+        mastered_items = mastered
+        review_total = total_lessons
+
+    if completion_percent >= 100:
+        status_text = 'completed'
+    elif completion_percent > 0 or (
+        category not in (NotebookCategory.VOCAB, NotebookCategory.KANJI, NotebookCategory.GRAMMAR)
+        and reviewed > 0
+    ):
+        status_text = 'in-progress'
+    else:
+        status_text = 'not-started'
+
+    return {
+        'level': level,
+        'status': status_text,
+        'lessons_completed': lessons_completed,
+        'total_lessons': total_lessons,
+        'mastered_items': mastered_items,
+        'total_items': total_items,
+        'completion_percent': completion_percent,
+        'reviewed_items': reviewed,
+        'review_total': review_total,
+        'locked': False
+    }
+
+
+# =========================
+# NOTEBOOK PAYLOADS
+# =========================
+def build_category_summaries(user):
+    """Tổng quan 6 category của notebook cho một user"""
+    totals = get_catalog_totals()
+    user_counts = get_user_rollups(user)
+
+    summaries = []
+    for category, name in NotebookCategory.choices:
+        completed = 0
+        in_progress = 0
+
+        for level in JLPT_LEVELS:
+            level_status = get_level_summary_status(
+                category,
+                user_counts[category][level],
+                totals[category].get(level, {}),
+            )
+            if level_status == 'completed':
+                completed += 1
+            elif level_status == 'in-progress':
+                in_progress += 1
+
+        summaries.append({
+            'category': name,
+            'completed_levels': completed,
+            'in_progress_levels': in_progress,
+            'total_levels': len(JLPT_LEVELS),
+        })
+
+    return summaries
+
+
+def build_level_details(user, category):
+    """Chi tiết 5 level của một category cho một user"""
+    return build_many_level_details(user, [category])[category]
+
+
+def build_many_level_details(user, categories=None):
+    """
+    Chi tiết level của nhiều category cùng lúc: rollup của user và tổng catalog
+    chỉ đọc một lần cho tất cả category.
+
+    Trả về: {category: [level detail, ...]}
+    """
+    categories = categories or NotebookCategory.values
+    totals = get_catalog_totals(categories)
+    user_counts = get_user_rollups(user, categories)
+
+    return {
+        category: [
+            get_level_detail(
+                category, level, user_counts[category][level], totals[category].get(level, {})
+            )
+            for level in JLPT_LEVELS
+        ]
+        for category in categories
+    }
@@ -0,0 +1,104 @@
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+
+from apps.vocab.models import VocabularyWord, VocabularyWordProgress
+from apps.kanji.models import Kanji, KanjiProgress
+from apps.grammar.models import GrammarLesson, GrammarProgress
+from apps.reading.models import ReadingLesson, ReadingProgress
+from apps.listening.models import ListeningLesson, ListeningProgress
+from apps.jlpt_practice.models import JLPTTest, JLPTAttempt
+
+from .models import NotebookCategory
+from .services import refresh_rollup
+
+
+# sender -> (category, hàm lấy level của dòng progress)
+ROLLUP_SOURCES = {
+    VocabularyWordProgress: (
+        NotebookCategory.VOCAB,
+        lambda progress: VocabularyWord.objects.filter(
+            pk=progress.word_id
+        ).values_list('lesson__jlpt_level', flat=True).first(),
+    ),
+    KanjiProgress: (
+        NotebookCategory.KANJI,
+        lambda progress: Kanji.objects.filter(
+            pk=progress.kanji_id
+        ).values_list('lesson__unit__level', flat=True).first(),
+    ),
+    GrammarProgress: (
+        NotebookCategory.GRAMMAR,
+        lambda progress: GrammarLesson.objects.filter(
+            pk=progress.lesson_id
+        ).values_list('level', flat=True).first(),
+    ),
+    ReadingProgress: (
+        NotebookCategory.READING,
+        lambda progress: ReadingLesson.objects.filter(
+            pk=progress.lesson_id
+        ).values_list('level', flat=True).first(),
+    ),
+    ListeningProgress: (
+        NotebookCategory.LISTENING,
+        lambda progress: ListeningLesson.objects.filter(
+            pk=progress.lesson_id
+        ).values_list('level', flat=True).first(),
+    ),
+    JLPTAttempt: (
+        NotebookCategory.JLPT,
+        lambda progress: JLPTTest.objects.filter(
+            pk=progress.test_id
+        ).values_list('level', flat=True).first(),
+    ),
+}
+
+# Các rollup cần cập nhật, gom lại để chạy một lần sau khi transaction commit
+# (xóa hàng loạt progress chỉ refresh mỗi (user, category, level) một lần)
+_pending = threading.local()
+
+
+def _flush_pending_rollups():
+    keys = getattr(_pending, 'keys', None)
+    if not keys:
+        return
+    _pending.keys = set()
+    for user_id, category, level in keys:
+        refresh_rollup(user_id, category, level)
+
+
+def schedule_rollup_refresh(user_id, category, level):
+    """Đánh dấu rollup cần tính lại khi transaction hiện tại commit"""
+    if not hasattr(_pending, 'keys'):
+        _pending.keys = set()
+    _pending.keys.add((user_id, category, level))
+    transaction.on_commit(_flush_pending_rollups)
+
+
+def _is_user_deletion(origin):
+    # Xóa user cascade xuống progress: rollup cũng bị xóa theo, không cần tính lại
+    user_model = settings.AUTH_USER_MODEL.lower()
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model._meta.label_lower == user_model
+
+
+def progress_saved(sender, instance, **kwargs):
+    category, get_level = ROLLUP_SOURCES[sender]
+    level = get_level(instance)
+    if level:
+        schedule_rollup_refresh(instance.user_id, category, level)
+
+
+def progress_deleted(sender, instance, origin=None, **kwargs):
+    if origin is not None and _is_user_deletion(origin):
+        return
+    progress_saved(sender, instance)
+
+
+def connect_signals():
+    for model in ROLLUP_SOURCES:
+        post_save.connect(progress_saved, sender=model, dispatch_uid=f'notebook_rollup_save_{model.__name__}')
+        post_delete.connect(progress_deleted, sender=model, dispatch_uid=f'notebook_rollup_delete_{model.__name__}')
@@ -1,3 +1,64 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.study.catalog import bump_catalog_version, clear_catalog_cache
+from apps.vocab.models import VocabularyLesson, VocabularyWord, VocabularyWordProgress
+
+from .models import NotebookCategory
+from .services import rebuild_rollups, refresh_rollup
+
+
+# Cache của một worker khác (LocMemCache là riêng từng process)
+OTHER_WORKER_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'notebook-other-worker',
+    }
+}
+
+
+class NotebookCacheInvalidationTest(TestCase):
+    """
+    Payload notebook đã cache phải hết hiệu lực khi progress đổi,
+    kể cả khi lần ghi progress chạy ở worker có cache riêng.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='notebook-cache@example.com', password='x')
+        lesson = VocabularyLesson.objects.create(jlpt_level='N5', order=1, title='Bài 1')
+        cls.words = [
+            VocabularyWord.objects.create(
+                lesson=lesson, kanji='語', hiragana='ご', vietnamese='NGỮ', meaning='x', order=order
+            )
+            for order in range(1, 4)
+        ]
+        VocabularyWordProgress.objects.create(user=cls.user, word=cls.words[0], is_learned=True)
+        rebuild_rollups([cls.user.pk])
+        # on_commit không chạy trong TestCase -> tạo version nội dung như populate_* khi commit
+        bump_catalog_version()
+
+    def setUp(self):
+        cache.clear()
+        clear_catalog_cache()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _reviewed_n5(self, response):
+        self.assertEqual(response.status_code, 200)
+        return next(level for level in response.data if level['level'] == 'N5')['reviewed_items']
+
+    def test_progress_written_by_other_worker_invalidates_cache(self):
+        url = '/api/notebook/categories/Từ vựng/'
+        first = self.client.get(url)
+        self.assertEqual(self._reviewed_n5(first), 1)
+
+        with override_settings(CACHES=OTHER_WORKER_CACHE):
+            VocabularyWordProgress.objects.create(user=self.user, word=self.words[1])
+            # Signal gom refresh tới on_commit -> gọi trực tiếp như khi commit
+            refresh_rollup(self.user.pk, NotebookCategory.VOCAB, 'N5')
+
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(self._reviewed_n5(second), 2)
@@ -2,10 +2,15 @@ from django.urls import path
 from .views import (
     NotebookCategoriesAPIView,
     NotebookCategoryDetailAPIView,
+    NotebookCategoryDetailsBatchAPIView,
+    NotebookFavoriteFeedAPIView,
 )
 
 urlpatterns = [
     path('categories/', NotebookCategoriesAPIView.as_view(), name='notebook-categories'),
+    # Đặt trước categories/<str:category>/ để 'details' không bị hiểu là tên category
+    path('categories/details/', NotebookCategoryDetailsBatchAPIView.as_view(), name='notebook-category-details'),
     path('categories/<str:category>/', NotebookCategoryDetailAPIView.as_view(), name='notebook-category-detail'),
+    path('favorites/', NotebookFavoriteFeedAPIView.as_view(), name='notebook-favorites'),
 ]
 
@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand
+from apps.study.catalog import schedule_catalog_bump
 from django.db import transaction
 from apps.reading.models import (
     ReadingLesson, ReadingText, ReadingQuestion, ReadingChoice, ReadingProgress
@@ -12,18 +13,18 @@ class Command(BaseCommand):
         parser.add_argument('--clear', action='store_true', help='Clear existing data before populating')
 
     def handle(self, *args, **options):
-        if options['clear']:
-            self.stdout.write('Clearing existing reading data...')
-            ReadingProgress.objects.all().delete()
-            ReadingChoice.objects.all().delete()
-            ReadingQuestion.objects.all().delete()
-            ReadingText.objects.all().delete()
-            ReadingLesson.objects.all().delete()
-            self.stdout.write(self.style.SUCCESS('Data cleared'))
+        with transaction.atomic():
+            if options['clear']:
+                self.stdout.write('Clearing existing reading data...')
+                ReadingProgress.objects.all().delete()
+                ReadingChoice.objects.all().delete()
+                ReadingQuestion.objects.all().delete()
+                ReadingText.objects.all().delete()
+                ReadingLesson.objects.all().delete()
+                self.stdout.write(self.style.SUCCESS('Data cleared'))
 
-        self.stdout.write('Starting reading data population...')
+            self.stdout.write('Starting reading data population...')
         
-        with transaction.atomic():
             # N5 LESSONS
             self.create_n5_lessons()
             # N4 LESSONS
@@ -31,6 +32,10 @@ class Command(BaseCommand):
             # N3 LESSONS
             self.create_n3_lessons()
 
+            # Nội dung đã đổi -> thống kê catalog (số bài, số từ...) phải tính lại;
+            # version đổi một lần khi transaction commit
+            schedule_catalog_bump()
+
         self.stdout.write(self.style.SUCCESS('\nSuccessfully populated reading data!'))
         self.stdout.write(f'Total lessons: {ReadingLesson.objects.count()}')
         self.stdout.write(f'Total questions: {ReadingQuestion.objects.count()}')
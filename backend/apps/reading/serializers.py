@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from apps.study.catalog import READING, get_lesson_stat
 from .models import (
     ReadingLesson,
     ReadingText,
@@ -70,11 +72,12 @@ class ReadingLessonListSerializer(serializers.ModelSerializer):
             "progress",
         ]
 
+    # Số đoạn đọc / câu hỏi lấy từ thống kê catalog, không query theo từng bài
     def get_reading_count(self, obj):
-        return obj.readings.count()
+        return get_lesson_stat(READING, obj.id, {}).get("readings", 0)
 
     def get_exercise_count(self, obj):
-        return obj.questions.count()
+        return get_lesson_stat(READING, obj.id, {}).get("questions", 0)
 
     def get_status(self, obj):
         progress = self.context.get("progress_map", {}).get(obj.id)
@@ -1,3 +1,45 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.study.catalog import bump_catalog_version, clear_catalog_cache
+from apps.study.instrumentation import query_budget
+
+from .models import ReadingLesson, ReadingProgress, ReadingQuestion, ReadingText
+
+
+class ReadingLessonListQueryBudgetTest(TestCase):
+    """
+    GET /api/reading/lessons/: số đoạn đọc / câu hỏi đọc từ thống kê catalog,
+    không query theo từng bài.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='reading-budget@example.com', password='x')
+        for order in range(1, 6):
+            lesson = ReadingLesson.objects.create(level='N5', order=order, title=f'Bài {order}', preview='x')
+            ReadingText.objects.create(lesson=lesson, content_japanese='x', content_vietnamese='x', order=1)
+            for question_order in range(1, 3):
+                ReadingQuestion.objects.create(lesson=lesson, text='x', order=question_order)
+            if order <= 3:
+                ReadingProgress.objects.create(user=cls.user, lesson=lesson, total_questions=2, progress=50)
+        # on_commit không chạy trong TestCase -> tạo version nội dung như populate_* khi commit
+        bump_catalog_version()
+
+    def setUp(self):
+        cache.clear()
+        clear_catalog_cache()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_has_no_repeated_queries(self):
+        # Request đầu nạp version / thống kê nội dung vào cache
+        self.client.get('/api/reading/lessons/', {'level': 'N5'})
+        # watermark progress + progress của user + bài
+        with query_budget(3):
+            response = self.client.get('/api/reading/lessons/', {'level': 'N5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['lessons']), 5)
+        self.assertEqual(response.data['lessons'][0]['exercise_count'], 2)
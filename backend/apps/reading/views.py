@@ -4,6 +4,9 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 
+from apps.study.catalog import READING, get_level_totals, get_lesson_stat
+from apps.study.conditional import conditional_on_progress
+from apps.study.payloads import prebuilt_json_response
 from .models import (
     ReadingLesson,
     ReadingProgress,
@@ -21,6 +24,7 @@ from .serializers import (
 class ReadingLessonListAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_on_progress((ReadingProgress, "updated_at"))
     def get(self, request):
         level = request.query_params.get("level", "N5")
         user = request.user
@@ -41,7 +45,7 @@ class ReadingLessonListAPIView(APIView):
         )
 
         # tổng tiến độ
-        total = lessons.count()
+        total = get_level_totals(READING).get(level, {}).get("total_lessons", 0)
         completed = sum(
             1 for p in progress_map.values()
             if p.status == "completed"
@@ -62,9 +66,15 @@ class ReadingLessonDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, lesson_id):
-        lesson = get_object_or_404(ReadingLesson, id=lesson_id)
-        serializer = ReadingLessonDetailSerializer(lesson)
-        return Response(serializer.data)
+        def build():
+            lesson = get_object_or_404(
+                ReadingLesson.objects.prefetch_related("readings", "questions__choices"),
+                id=lesson_id
+            )
+            return ReadingLessonDetailSerializer(lesson).data
+
+        # Nội dung bài không phụ thuộc user -> JSON build sẵn theo version nội dung
+        return prebuilt_json_response(request, f"reading-lesson:{lesson_id}", build)
 
 
 # =========================
@@ -92,7 +102,7 @@ class SubmitReadingAnswerAPIView(APIView):
             user=user,
             lesson=lesson,
             defaults={
-                "total_questions": lesson.questions.count()
+                "total_questions": get_lesson_stat(READING, lesson.id, {}).get("questions", 0)
             }
         )
 
@@ -2,8 +2,9 @@ from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.http import FileResponse
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from apps.study.media import media_response
 from .models import Voice, ShadowingSession
 from .serializers import (
     VoiceSerializer,
@@ -11,7 +12,6 @@ from .serializers import (
     ShadowingSessionSerializer,
     ShadowingSessionListSerializer
 )
-import os
 
 
 class VoiceListAPIView(APIView):
@@ -124,19 +124,16 @@ class ShadowingSessionDownloadAPIView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get the file path
-        file_path = session.audio_file.path
-        
-        if not os.path.exists(file_path):
+        # Stream có hỗ trợ Range / conditional GET / X-Accel-Redirect
+        try:
+            return media_response(
+                request,
+                session.audio_file.name,
+                private=True,
+                filename=f"shadowing_{session.id}.mp3"
+            )
+        except Http404:
             return Response(
                 {"error": "Audio file does not exist"},
                 status=status.HTTP_404_NOT_FOUND
             )
-        
-        # Return file as download
-        response = FileResponse(
-            open(file_path, 'rb'),
-            content_type='audio/mpeg'
-        )
-        response['Content-Disposition'] = f'attachment; filename="shadowing_{session.id}.mp3"'
-        return response
@@ -1,9 +1,40 @@
+from django import forms
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.forms.models import BaseInlineFormSet
+
 from .models import Question, Choice
+from .questions import choice_hash, defer_question_hash, defer_question_hashes, find_question
+
+
+# content_hash của câu hỏi là unique: sửa câu hỏi / lựa chọn thành đúng nội dung
+# của một câu đã có phải báo lỗi trên form, không để DB báo IntegrityError (500).
+def _check_question(question, choices):
+    """choices: [(text, is_correct)] sau khi lưu"""
+    digests = [choice_hash(text) for text, _ in choices]
+    if len(set(digests)) != len(digests):
+        raise ValidationError("Các lựa chọn của câu hỏi bị trùng nhau.")
+    duplicate = find_question(question.prompt, question.audio, choices, exclude=question.pk)
+    if duplicate:
+        raise ValidationError(f"Đã có câu hỏi cùng nội dung (id={duplicate.pk}).")
+
+
+class ChoiceInlineFormSet(BaseInlineFormSet):
+    def clean(self):
+        super().clean()
+        if any(self.errors):
+            return
+        _check_question(self.instance, [
+            (form.cleaned_data["text"], form.cleaned_data.get("is_correct", False))
+            for form in self.forms
+            if form.cleaned_data.get("text") and not form.cleaned_data.get("DELETE")
+        ])
 
 
 class ChoiceInline(admin.TabularInline):
     model = Choice
+    formset = ChoiceInlineFormSet
     extra = 4   # mặc định tạo 4 đáp án cho mỗi câu hỏi
 
 
@@ -13,9 +44,48 @@ class QuestionAdmin(admin.ModelAdmin):
     search_fields = ("prompt",)
     inlines = [ChoiceInline]
 
+    def changeform_view(self, request, object_id=None, form_url="", extra_context=None):
+        # Hash tính một lần sau khi đã lưu cả câu hỏi lẫn các lựa chọn
+        with transaction.atomic(), defer_question_hashes():
+            return super().changeform_view(request, object_id, form_url, extra_context)
+
+
+class ChoiceAdminForm(forms.ModelForm):
+    class Meta:
+        model = Choice
+        fields = "__all__"
+
+    def clean(self):
+        cleaned_data = super().clean()
+        question = cleaned_data.get("question")
+        if question is None or not cleaned_data.get("text"):
+            return cleaned_data
+
+        # self.instance vẫn là dữ liệu cũ cho tới _post_clean()
+        others = question.choices.exclude(pk=self.instance.pk).values_list("text", "is_correct")
+        _check_question(question, [*others, (cleaned_data["text"], cleaned_data.get("is_correct", False))])
+
+        if self.instance.pk and self.instance.question_id != question.pk:
+            # Chuyển lựa chọn sang câu khác -> câu cũ cũng đổi nội dung
+            previous = Question.objects.get(pk=self.instance.question_id)
+            _check_question(
+                previous, list(previous.choices.exclude(pk=self.instance.pk).values_list("text", "is_correct"))
+            )
+        return cleaned_data
+
 
 @admin.register(Choice)
 class ChoiceAdmin(admin.ModelAdmin):
+    form = ChoiceAdminForm
     list_display = ("id", "question", "text", "is_correct")
     list_filter = ("is_correct",)
     search_fields = ("text", "question__prompt")
+
+    def changeform_view(self, request, object_id=None, form_url="", extra_context=None):
+        with transaction.atomic(), defer_question_hashes():
+            return super().changeform_view(request, object_id, form_url, extra_context)
+
+    def save_model(self, request, obj, form, change):
+        # Signal chỉ ghi nhận câu hỏi mới của lựa chọn, câu cũ (nếu đổi) tính lại ở đây
+        defer_question_hash(form.initial.get("question"))
+        super().save_model(request, obj, form, change)
@@ -0,0 +1,223 @@
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .catalog import bump_catalog_version, clear_catalog_cache
+from .instrumentation import record_queries
+
+
+# Tiện ích đo hiệu năng dùng chung cho các lệnh benchmark_* :
+# đo số query, thời gian và bộ nhớ đỉnh của một lời gọi, so với ngân sách
+# (budget) lưu trong repo và báo lỗi khi vượt.
+
+
+def measure(func, repeat=5):
+    """
+    Gọi func() nhiều lần và trả về:
+    {'queries': int, 'ms': float (median), 'peak_kb': float}
+    """
+    with CaptureQueriesContext(connection) as captured:
+        func()
+    queries = len(captured)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Đo bộ nhớ riêng một lần vì tracemalloc làm chậm lời gọi
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'queries': queries,
+        'ms': round(statistics.median(timings), 2),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def merge_worst(results):
+    """Gộp kết quả đo của nhiều user: lấy giá trị xấu nhất của từng chỉ số"""
+    return {
+        'queries': max(result['queries'] for result in results),
+        'ms': max(result['ms'] for result in results),
+        'peak_kb': max(result['peak_kb'] for result in results),
+    }
+
+
+def load_budgets(path):
+    with open(path, encoding='utf-8') as budget_file:
+        return json.load(budget_file)
+
+
+def write_budgets(path, results, headroom=2, ms_slack=5):
+    """
+    Ghi kết quả hiện tại thành budget mới.
+    Số query giữ nguyên (phải khớp tuyệt đối), thời gian / bộ nhớ có dư địa
+    để không báo lỗi vì nhiễu của máy chạy.
+    """
+    budgets = {
+        name: {
+            'queries': result['queries'],
+            'ms': round(result['ms'] * headroom + ms_slack, 1),
+            'peak_kb': round(result['peak_kb'] * headroom, 1),
+        }
+        for name, result in results.items()
+    }
+    with open(path, 'w', encoding='utf-8') as budget_file:
+        json.dump(budgets, budget_file, indent=2, sort_keys=True)
+        budget_file.write('\n')
+    return budgets
+
+
+def check_budgets(results, budgets):
+    """Danh sách các chỉ số vượt budget: [(name, metric, actual, budget)]"""
+    violations = []
+    for name, result in results.items():
+        budget = budgets.get(name)
+        if budget is None:
+            violations.append((name, 'budget', None, None))
+            continue
+        for metric in ('queries', 'ms', 'peak_kb'):
+            if metric in budget and result[metric] > budget[metric]:
+                violations.append((name, metric, result[metric], budget[metric]))
+    return violations
+
+
+def format_report(results, budgets=None):
+    budgets = budgets or {}
+    lines = []
+    for name, result in results.items():
+        budget = budgets.get(name, {})
+        lines.append(
+            f"{name:<28}"
+            f"queries={result['queries']} (<= {budget.get('queries', '-')})  "
+            f"ms={result['ms']} (<= {budget.get('ms', '-')})  "
+            f"peak_kb={result['peak_kb']} (<= {budget.get('peak_kb', '-')})"
+        )
+    return '\n'.join(lines)
+
+
+# =========================
+# COMMAND
+# =========================
+# Thứ tự bài của dữ liệu tổng hợp bắt đầu từ đây để không trùng dữ liệu thật
+ORDER_OFFSET = 100000
+
+
+class _Rollback(Exception):
+    pass
+
+
+class BenchmarkCommand(BaseCommand):
+    """
+    Khung chung của các lệnh benchmark_*: tạo dữ liệu tổng hợp trong một transaction,
+    đo các endpoint, rollback rồi so kết quả với budget (hoặc ghi budget mới).
+
+    Lớp con khai báo budgets_path, label và cài:
+    - seed_catalog(): tạo nội dung tổng hợp
+    - seed_users() -> [user]
+    - run_benchmarks(users) -> {name: kết quả measure()}
+    """
+    budgets_path = None
+    label = ''  # Tên nhóm endpoint trong thông báo, VD: 'ngữ pháp'
+    default_users = 5
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=self.default_users)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--write-budgets', action='store_true',
+                            help='Ghi kết quả lần chạy này thành budget mới')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        self.repeated = {}
+
+        try:
+            with transaction.atomic():
+                self.seed_catalog()
+                # on_commit không chạy trong transaction sẽ rollback -> tự xóa cache catalog
+                bump_catalog_version()
+                clear_catalog_cache()
+                users = self.seed_users()
+                results = self.run_benchmarks(users)
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            # Thống kê của dữ liệu tổng hợp không được sống sót sau rollback
+            clear_catalog_cache()
+
+        if self.repeated:
+            # Query lặp lại theo từng bài = số query tăng theo số bài (N+1)
+            details = '\n'.join(
+                f'  {name}: {count}x {sql[:120]}'
+                for name, duplicates in self.repeated.items()
+                for sql, count in duplicates.items()
+            )
+            raise CommandError(f'{self.label.capitalize()} có query lặp lại:\n{details}')
+
+        if options['write_budgets']:
+            budgets = write_budgets(self.budgets_path, results)
+            self.stdout.write(format_report(results, budgets))
+            self.stdout.write(self.style.SUCCESS(f'\nĐã ghi budget vào {self.budgets_path}'))
+            return
+
+        budgets = load_budgets(self.budgets_path)
+        self.stdout.write(format_report(results, budgets))
+
+        violations = check_budgets(results, budgets)
+        if violations:
+            details = '\n'.join(
+                f'  {name}: {metric} = {actual} (budget {budget})'
+                for name, metric, actual, budget in violations
+            )
+            raise CommandError(f'{self.label.capitalize()} vượt budget:\n{details}')
+
+        self.stdout.write(self.style.SUCCESS(f'\nTất cả endpoint {self.label} nằm trong budget'))
+
+    def seed_catalog(self):
+        raise NotImplementedError
+
+    def seed_users(self):
+        raise NotImplementedError
+
+    def run_benchmarks(self, users):
+        raise NotImplementedError
+
+    def view_call(self, view, user, path, query=None, expected_status=200, headers=None, **kwargs):
+        """Hàm gọi view như một GET của user (không qua middleware), báo lỗi nếu sai status"""
+        factory = APIRequestFactory()
+
+        def call():
+            request = factory.get(path, query or {}, **(headers or {}))
+            force_authenticate(request, user=user)
+            response = view(request, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            if response.status_code != expected_status:
+                raise CommandError(f'{view} trả về {response.status_code}')
+            return response
+
+        return call
+
+    def check_repeated(self, name, call):
+        """Chạy call() một lần, ghi lại các query lặp lại (báo lỗi ở cuối lệnh)"""
+        with record_queries() as stats:
+            call()
+        if stats.duplicates():
+            self.repeated[name] = stats.duplicates()
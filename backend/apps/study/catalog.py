@@ -0,0 +1,232 @@
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import CatalogVersion
+
+
+# Thống kê catalog (số bài / số mục theo level, số từ / kanji / câu hỏi theo bài)
+# chỉ phụ thuộc nội dung học, vốn chỉ đổi qua populate_* và admin.
+# Thống kê được tính một lần cho mỗi version nội dung, lưu trong CatalogVersion
+# và cache; mọi ghi nội dung làm đổi version.
+
+CATALOG_VERSION_KEY = "catalog:version"
+# Giới hạn thời gian một process có thể dùng version cũ khi cache không dùng chung
+CATALOG_VERSION_TIMEOUT = 60
+CATALOG_STATS_TIMEOUT = 60 * 60 * 24
+
+VOCAB = "vocab"
+KANJI = "kanji"
+GRAMMAR = "grammar"
+READING = "reading"
+LISTENING = "listening"
+JLPT = "jlpt"
+
+_memo = {}
+_pending = threading.local()
+_build_lock = threading.Lock()
+
+
+# =========================
+# VERSION
+# =========================
+def _get_catalog_state():
+    state = cache.get(CATALOG_VERSION_KEY)
+    if state is None:
+        state = CatalogVersion.objects.filter(pk=1).values("version", "updated_at").first()
+        if state is None:
+            row = CatalogVersion.objects.get_or_create(
+                pk=1, defaults={"version": uuid.uuid4().hex}
+            )[0]
+            state = {"version": row.version, "updated_at": row.updated_at}
+        cache.set(CATALOG_VERSION_KEY, state, CATALOG_VERSION_TIMEOUT)
+    return state
+
+
+def get_catalog_version():
+    return _get_catalog_state()["version"]
+
+
+def get_catalog_updated_at():
+    """Thời điểm nội dung đổi lần cuối (dùng cho Last-Modified)"""
+    return _get_catalog_state()["updated_at"]
+
+
+def clear_catalog_cache():
+    """Quên version / thống kê đã cache trong process này"""
+    cache.delete(CATALOG_VERSION_KEY)
+    _memo.pop("entry", None)
+
+
+def bump_catalog_version():
+    """
+    Đổi version nội dung. Dùng uuid thay vì bộ đếm để một transaction bị
+    rollback không thể để lại thống kê sai dưới một version hợp lệ sau này.
+    """
+    version = uuid.uuid4().hex
+    updated = CatalogVersion.objects.filter(pk=1).update(version=version, updated_at=timezone.now())
+    if not updated:
+        CatalogVersion.objects.update_or_create(pk=1, defaults={"version": version})
+    transaction.on_commit(clear_catalog_cache)
+    return version
+
+
+def get_versioned(name, build):
+    """
+    Giá trị build() (chỉ mục, bảng tra trong bộ nhớ...) của version nội dung hiện tại,
+    dựng một lần cho mỗi version trong process này.
+    """
+    version = get_catalog_version()
+    entry = _memo.get(name)
+    if entry and entry[0] == version:
+        return entry[1]
+
+    with _build_lock:
+        entry = _memo.get(name)
+        if entry and entry[0] == version:
+            return entry[1]
+        value = build()
+        _memo[name] = (version, value)
+        return value
+
+
+def _flush_pending_bump():
+    if getattr(_pending, "dirty", False):
+        _pending.dirty = False
+        bump_catalog_version()
+
+
+def schedule_catalog_bump():
+    """
+    Đánh dấu nội dung đã đổi; version chỉ đổi một lần khi transaction commit
+    (populate_* ghi hàng nghìn dòng trong một transaction)
+    """
+    _pending.dirty = True
+    transaction.on_commit(_flush_pending_bump)
+
+
+# =========================
+# STATS
+# =========================
+def _level_totals(queryset, level_field, item_field=None, item_sum=False):
+    """Một query GROUP BY level: số bài + số mục trong level"""
+    if item_field is None:
+        annotations = {"total_lessons": Count("id")}
+    elif item_sum:
+        annotations = {"total_lessons": Count("id"), "total_items": Sum(item_field)}
+    else:
+        annotations = {
+            "total_lessons": Count("id", distinct=True),
+            "total_items": Count(item_field),
+        }
+
+    rows = queryset.order_by().values(level_field).annotate(**annotations)
+    return {
+        row[level_field]: {
+            "total_lessons": row["total_lessons"],
+            "total_items": row.get("total_items", row["total_lessons"]) or 0,
+        }
+        for row in rows
+    }
+
+
+def _lesson_counts(queryset, **annotations):
+    rows = queryset.order_by().values("id").annotate(**annotations)
+    if len(annotations) == 1:
+        name = next(iter(annotations))
+        return {row["id"]: row[name] for row in rows}
+    return {row["id"]: {name: row[name] for name in annotations} for row in rows}
+
+
+def compute_catalog_stats():
+    from apps.vocab.models import VocabularyLesson
+    from apps.kanji.models import KanjiLesson
+    from apps.grammar.models import GrammarLesson
+    from apps.reading.models import ReadingLesson
+    from apps.listening.models import ListeningLesson
+    from apps.jlpt_practice.models import JLPTTest
+
+    return {
+        VOCAB: {
+            "levels": _level_totals(VocabularyLesson.objects, "jlpt_level", "words"),
+            "lessons": _lesson_counts(VocabularyLesson.objects, words=Count("words")),
+        },
+        KANJI: {
+            "levels": _level_totals(KanjiLesson.objects, "unit__level", "kanjis"),
+            "lessons": _lesson_counts(KanjiLesson.objects, kanjis=Count("kanjis")),
+        },
+        # Ngữ pháp: total_items = tổng số điểm ngữ pháp trong level
+        GRAMMAR: {
+            "levels": _level_totals(GrammarLesson.objects, "level", "grammar_point_count", item_sum=True),
+            "lessons": _lesson_counts(GrammarLesson.objects, questions=Count("questions")),
+        },
+        READING: {
+            "levels": _level_totals(ReadingLesson.objects, "level"),
+            "lessons": _lesson_counts(
+                ReadingLesson.objects,
+                readings=Count("readings", distinct=True),
+                questions=Count("questions", distinct=True),
+            ),
+        },
+        LISTENING: {
+            "levels": _level_totals(ListeningLesson.objects, "level"),
+            "lessons": _lesson_counts(ListeningLesson.objects, questions=Count("questions")),
+        },
+        JLPT: {
+            "levels": _level_totals(JLPTTest.objects, "level"),
+            "lessons": {},
+        },
+    }
+
+
+def _decode_stats(stats):
+    # JSONField biến key int thành str -> đổi lại id bài về int
+    return {
+        category: {
+            "levels": data["levels"],
+            "lessons": {int(lesson_id): value for lesson_id, value in data["lessons"].items()},
+        }
+        for category, data in stats.items()
+    }
+
+
+def get_catalog_stats():
+    """
+    Thống kê catalog của version nội dung hiện tại:
+    {category: {'levels': {level: {'total_lessons', 'total_items'}}, 'lessons': {lesson_id: ...}}}
+    """
+    version = get_catalog_version()
+    entry = _memo.get("entry")
+    if entry and entry[0] == version:
+        return entry[1]
+
+    stats_key = f"catalog:stats:{version}"
+    stats = cache.get(stats_key)
+    if stats is None:
+        row = CatalogVersion.objects.filter(pk=1).values("version", "stats", "stats_version").first()
+        if row and row["stats_version"] == version:
+            stats = _decode_stats(row["stats"])
+        else:
+            stats = compute_catalog_stats()
+            # Chỉ lưu nếu nội dung không đổi trong lúc tính
+            CatalogVersion.objects.filter(pk=1, version=version).update(
+                stats=stats, stats_version=version
+            )
+        cache.set(stats_key, stats, CATALOG_STATS_TIMEOUT)
+
+    _memo["entry"] = (version, stats)
+    return stats
+
+
+def get_level_totals(category):
+    """{level: {'total_lessons': int, 'total_items': int}} của một category"""
+    return get_catalog_stats()[category]["levels"]
+
+
+def get_lesson_stat(category, lesson_id, default=0):
+    """Số mục của một bài, VD: get_lesson_stat('vocab', 3) -> số từ của bài 3"""
+    return get_catalog_stats()[category]["lessons"].get(lesson_id, default)
@@ -0,0 +1,85 @@
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .catalog import get_catalog_updated_at, get_catalog_version
+
+
+# Conditional GET cho các màn hình dashboard của learner (notebook, danh sách
+# bài, danh sách đề thi). Phần lớn lần mở lại màn hình không có gì thay đổi:
+# ETag được tính từ một "watermark" rẻ (updated_at lớn nhất + số dòng progress
+# của user) và version nội dung, nếu khớp If-None-Match thì trả 304 ngay,
+# không query nội dung và không serialize.
+
+
+def get_progress_watermark(user, sources):
+    """
+    sources: [(model progress, tên field thời gian)], VD: [(ReadingProgress, 'updated_at')]
+    Mỗi model một query aggregate trên index user.
+    Số dòng đi kèm để việc xóa progress cũng làm đổi ETag.
+
+    Trả về (last_modified: datetime | None, state: [str])
+    """
+    last_modified = None
+    state = []
+    for model, field in sources:
+        row = model.objects.filter(user=user).aggregate(last=Max(field), total=Count("pk"))
+        last = row["last"]
+        state.append(f"{last.timestamp() if last else 0}:{row['total']}")
+        if last and (last_modified is None or last > last_modified):
+            last_modified = last
+    return last_modified, state
+
+
+def conditional_get(get_watermark):
+    """
+    Decorator cho method get của APIView.
+    get_watermark(request) -> (last_modified: datetime | None, state: [str])
+
+    ETag phụ thuộc user, version nội dung, URL (kèm query string) và watermark.
+    Last-Modified chỉ được gửi khi watermark có mốc thời gian thật.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            user = request.user
+            last_modified, state = get_watermark(request)
+
+            if last_modified is not None:
+                catalog_updated_at = get_catalog_updated_at()
+                if catalog_updated_at and catalog_updated_at > last_modified:
+                    last_modified = catalog_updated_at
+
+            raw = ":".join([str(user.pk), get_catalog_version(), request.get_full_path(), *state])
+            etag = f'"{hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()}"'
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+            # Dữ liệu riêng của user: client được giữ nhưng phải hỏi lại server mỗi lần
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def conditional_on_progress(*sources):
+    """
+    Conditional GET theo watermark của các bảng progress:
+
+        @conditional_on_progress((ReadingProgress, "updated_at"))
+        def get(self, request): ...
+    """
+    return conditional_get(lambda request: get_progress_watermark(request.user, sources))
@@ -0,0 +1,151 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+# Đo query của từng request: số query, tổng thời gian DB và các câu SQL lặp lại
+# cùng một dạng (dấu hiệu N+1). Bật khi DEBUG hoặc QUERY_INSTRUMENTATION=True;
+# kết quả gửi qua header Server-Timing (xem được trong tab Network của DevTools).
+# query_budget() dùng lại cùng bộ đếm để kiểm tra ngân sách query của một endpoint.
+
+logger = logging.getLogger(__name__)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+# Lệnh điều khiển transaction lặp lại là bình thường, không phải N+1
+_TRANSACTION_RE = re.compile(r"^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b", re.IGNORECASE)
+
+
+def fingerprint(sql):
+    """
+    Dạng chuẩn của câu SQL, bỏ tham số và literal:
+    hai câu chỉ khác id (N+1) cho cùng một fingerprint.
+    """
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+class QueryStats:
+    """Bộ đếm query, gắn vào connection qua execute_wrapper"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            self.fingerprints[fingerprint(sql)] += 1
+            self.queries.append((sql, round(elapsed * 1000, 3)))
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+    def duplicates(self):
+        """{fingerprint: số lần} của các dạng query chạy nhiều hơn một lần"""
+        return {
+            sql: count
+            for sql, count in self.fingerprints.most_common()
+            if count > 1 and not _TRANSACTION_RE.match(sql)
+        }
+
+
+@contextmanager
+def record_queries():
+    """
+    Ghi lại mọi query trên mọi database trong khối with:
+
+        with record_queries() as stats:
+            ...
+        stats.count, stats.duration_ms, stats.duplicates()
+    """
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
+
+
+@contextmanager
+def query_budget(max_queries, allow_duplicates=False):
+    """
+    Báo AssertionError nếu khối with chạy quá max_queries query,
+    hoặc (mặc định) có dạng query lặp lại:
+
+        with query_budget(3):
+            client.get('/api/kanji/progress/')
+    """
+    with record_queries() as stats:
+        yield stats
+
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} queries, budget {max_queries}")
+    duplicates = stats.duplicates()
+    if duplicates and not allow_duplicates:
+        problems.append(f"{len(duplicates)} dạng query lặp lại")
+    if problems:
+        details = "\n".join(f"  {count}x {sql}" for sql, count in duplicates.items())
+        queries = "\n".join(f"  {sql}" for sql, _ in stats.queries)
+        raise AssertionError(
+            "; ".join(problems)
+            + (f"\nLặp lại:\n{details}" if details else "")
+            + f"\nQueries:\n{queries}"
+        )
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Thêm header Server-Timing cho mọi request:
+        Server-Timing: db;dur=4.12;desc="7 queries", dup;desc="1 repeated", app;dur=18.40
+    và ghi log cảnh báo khi view chạy cùng một dạng query nhiều lần.
+    """
+
+    def __init__(self, get_response):
+        if not (settings.DEBUG or getattr(settings, "QUERY_INSTRUMENTATION", False)):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with record_queries() as stats:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        duplicates = stats.duplicates()
+        response.query_stats = stats
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries"',
+            f'dup;desc="{len(duplicates)} repeated"',
+            f"app;dur={total_ms:.2f}",
+        ])
+
+        if duplicates:
+            view_name = request.resolver_match.view_name if request.resolver_match else request.path
+            logger.warning(
+                "%s %s: %d queries, lặp lại: %s",
+                request.method,
+                view_name,
+                stats.count,
+                "; ".join(f"{count}x {sql[:120]}" for sql, count in duplicates.items()),
+            )
+        return response
@@ -0,0 +1,40 @@
+"""
+Gộp các câu hỏi trùng nội dung trong kho câu hỏi chung (study.Question / Choice).
+
+Chạy: python manage.py dedupe_questions --dry-run   (chỉ đếm)
+      python manage.py dedupe_questions
+
+Tính lại content_hash của mọi câu hỏi / lựa chọn, giữ câu có id nhỏ nhất trong
+mỗi nhóm trùng, chuyển bài ngữ pháp (GrammarLesson.questions) và các bảng khác
+đang trỏ tới bản trùng sang câu giữ lại rồi xóa bản trùng.
+Cần khi nội dung được ghi bằng update / bulk_* (không qua signal giữ hash).
+"""
+from django.core.management.base import BaseCommand
+
+from apps.study.catalog import bump_catalog_version
+from apps.study.models import Choice, Question
+from apps.study.questions import merge_duplicate_questions
+
+
+class Command(BaseCommand):
+    help = 'Gộp các câu hỏi trùng nội dung và nối lại các bài đang dùng chúng'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Chỉ báo số câu trùng, không ghi')
+
+    def handle(self, *args, **options):
+        stats = merge_duplicate_questions(Question, Choice, dry_run=options['dry_run'])
+
+        self.stdout.write(
+            f"{stats['questions']} câu hỏi, {stats['duplicates']} câu trùng, "
+            f"{stats['duplicate_choices']} lựa chọn trùng"
+        )
+        if options['dry_run']:
+            return
+
+        if stats['duplicates'] or stats['duplicate_choices']:
+            # Ghi bằng update / delete hàng loạt không phát signal -> tự đổi version nội dung
+            bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(
+            f"Đã gộp {stats['duplicates']} câu trùng, nối lại {stats['relinked']} liên kết"
+        ))
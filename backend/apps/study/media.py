@@ -0,0 +1,173 @@
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+
+# Phục vụ file audio (từ vựng, nghe hiểu, đề JLPT, shadowing) có hỗ trợ:
+# - HTTP Range (206) để tua trong bài nghe dài không phải tải lại cả file
+# - conditional GET (ETag / Last-Modified -> 304)
+# - giao việc gửi file cho nginx (X-Accel-Redirect) / Apache (X-Sendfile)
+# - header cache dài hạn
+
+# Chỉ các thư mục nội dung công khai mới được phục vụ qua media_view;
+# audio shadowing là dữ liệu riêng của user, đi qua API download có kiểm tra quyền
+PUBLIC_MEDIA_PREFIXES = [
+    "audio/",
+    "vocabulary/audio/",
+    "listening/audio/",
+    "listening/questions/",
+    "jlpt_practice/audio/",
+    "jlpt_practice/images/",
+]
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header, size):
+    """
+    Trả về (start, end) của một khoảng byte, None nếu không có / không dùng
+    được Range (nhiều khoảng -> trả cả file), "unsatisfiable" nếu vượt kích thước.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # bytes=-500: 500 byte cuối
+        length = int(end)
+        if length == 0:
+            return "unsatisfiable"
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return "unsatisfiable"
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    """If-Range: chỉ trả một phần khi file chưa đổi so với bản client đang có"""
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return etag in parse_etags(if_range)
+    since = parse_http_date_safe(if_range)
+    return since is not None and since >= last_modified
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as media_file:
+        media_file.seek(start)
+        remaining = length
+        while remaining > 0:
+            data = media_file.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def _offload(name, content_type):
+    """Để web server gửi file (tự xử lý Range); Django chỉ trả header"""
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_SENDFILE == "x-accel-redirect":
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(name)
+    else:
+        response["X-Sendfile"] = safe_join(settings.MEDIA_ROOT, name)
+    return response
+
+
+def media_response(request, name, *, private=False, filename=None):
+    """
+    Response cho file `name` (đường dẫn tương đối trong MEDIA_ROOT, như FieldFile.name).
+    private=True: dữ liệu riêng của user, không cho cache dùng chung.
+    filename: tải về dạng attachment với tên này.
+    """
+    try:
+        path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404("File not found")
+    if not os.path.isfile(path):
+        raise Http404("File not found")
+
+    stat = os.stat(path)
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    etag = f'"{size:x}-{stat.st_mtime_ns:x}"'
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if settings.MEDIA_SENDFILE:
+            response = _offload(name, content_type)
+        else:
+            byte_range = None
+            range_header = request.META.get("HTTP_RANGE")
+            if range_header and _if_range_matches(request, etag, last_modified):
+                byte_range = _parse_range(range_header, size)
+
+            if byte_range == "unsatisfiable":
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{size}"
+            elif byte_range:
+                start, end = byte_range
+                length = end - start + 1
+                response = StreamingHttpResponse(
+                    _read_range(path, start, length),
+                    status=206,
+                    content_type=content_type,
+                )
+                response["Content-Range"] = f"bytes {start}-{end}/{size}"
+                response["Content-Length"] = str(length)
+            else:
+                # FileResponse dùng wsgi.file_wrapper (sendfile) nếu server hỗ trợ
+                response = FileResponse(open(path, "rb"), content_type=content_type)
+
+        if filename:
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    if private:
+        patch_cache_control(response, private=True, max_age=settings.MEDIA_CACHE_MAX_AGE)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE)
+    return response
+
+
+@require_safe
+def media_view(request, path):
+    """
+    GET /media/<thư mục nội dung>/<file>
+    Audio / ảnh của bài học, công khai như trước đây nhưng có Range và cache.
+    """
+    # Chuẩn hóa trước khi kiểm tra thư mục: audio/../shadowing/... không được lọt qua
+    if ".." in path.replace("\\", "/").split("/"):
+        raise Http404("File not found")
+    path = posixpath.normpath(path)
+    if not any(path.startswith(prefix) for prefix in PUBLIC_MEDIA_PREFIXES):
+        raise Http404("File not found")
+    return media_response(request, path)
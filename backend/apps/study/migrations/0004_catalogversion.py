@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0003_remove_userquestionprogress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=32)),
+                ('stats', models.JSONField(blank=True, default=dict)),
+                ('stats_version', models.CharField(blank=True, max_length=32)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
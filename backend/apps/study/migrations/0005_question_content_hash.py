@@ -0,0 +1,166 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:05
+
+import hashlib
+import unicodedata
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+# Bản sao cách tính hash và gộp câu trùng của apps/study/questions.py tại thời điểm
+# viết migration: migration không import code runtime, code đó có thể đổi về sau.
+def normalize_text(text):
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def choice_hash(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def question_hash(prompt, audio, choices):
+    parts = [normalize_text(prompt), audio or ""]
+    parts.extend(sorted(f"{int(bool(is_correct))}:{normalize_text(text)}" for text, is_correct in choices))
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def relations(question_model, choice_model):
+    """[(model, cột FK tới câu hỏi, các cột cùng unique với FK)], trừ Choice"""
+    result = []
+    for rel in question_model._meta.related_objects:
+        if rel.many_to_many:
+            field = rel.field
+            through = field.remote_field.through
+            result.append((
+                through,
+                through._meta.get_field(field.m2m_reverse_field_name()).attname,
+                [through._meta.get_field(field.m2m_field_name()).attname],
+            ))
+            continue
+        if rel.related_model is choice_model:
+            continue
+
+        model = rel.related_model
+        unique_sets = [set(fields) for fields in model._meta.unique_together]
+        unique_sets += [
+            set(constraint.fields)
+            for constraint in model._meta.constraints
+            if getattr(constraint, "fields", None) and not getattr(constraint, "condition", None)
+        ]
+        others = next(
+            (sorted(fields - {rel.field.name}) for fields in unique_sets if rel.field.name in fields),
+            None,
+        )
+        result.append((
+            model,
+            rel.field.attname,
+            [model._meta.get_field(name).attname for name in others] if others is not None else None,
+        ))
+    return result
+
+
+def relink(model, column, others, canonical_of):
+    """Chuyển dòng trỏ tới bản trùng sang câu giữ lại, dòng sẽ trùng unique thì xóa"""
+    rows = list(model.objects.filter(**{f"{column}__in": canonical_of}).values_list("pk", column, *(others or [])))
+    if not rows:
+        return
+
+    existing = set()
+    if others is not None:
+        existing = set(
+            model.objects
+            .filter(**{f"{column}__in": set(canonical_of.values())})
+            .values_list(column, *others)
+        )
+
+    moves = defaultdict(list)
+    conflicts = []
+    for pk, duplicate_id, *other_values in rows:
+        target = canonical_of[duplicate_id]
+        key = (target, *other_values)
+        if others is not None and key in existing:
+            conflicts.append(pk)
+            continue
+        existing.add(key)
+        moves[target].append(pk)
+
+    for target, pks in moves.items():
+        model.objects.filter(pk__in=pks).update(**{column: target})
+    if conflicts:
+        model.objects.filter(pk__in=conflicts).delete()
+
+
+def merge_existing_duplicates(apps, schema_editor):
+    # populate_grammar chạy nhiều lần đã chèn cùng một câu hỏi nhiều lần:
+    # gộp vào câu có id nhỏ nhất trước khi thêm ràng buộc unique ở migration sau
+    Question = apps.get_model('study', 'Question')
+    Choice = apps.get_model('study', 'Choice')
+
+    choices_by_question = defaultdict(list)
+    # Lựa chọn đúng đứng trước để được giữ lại khi trùng chữ
+    for choice in Choice.objects.order_by("-is_correct", "id"):
+        choices_by_question[choice.question_id].append(choice)
+
+    duplicate_choices = []
+    changed_choices = []
+    kept_choices = {}
+    for question_id, choices in choices_by_question.items():
+        seen = set()
+        kept = []
+        for choice in choices:
+            digest = choice_hash(choice.text)
+            if digest in seen:
+                duplicate_choices.append(choice.pk)
+                continue
+            seen.add(digest)
+            kept.append((choice.text, choice.is_correct))
+            choice.content_hash = digest
+            changed_choices.append(choice)
+        kept_choices[question_id] = kept
+
+    canonical = {}
+    canonical_of = {}
+    changed_questions = []
+    for question in Question.objects.order_by("id"):
+        digest = question_hash(question.prompt, question.audio.name, kept_choices.get(question.pk, []))
+        if digest in canonical:
+            canonical_of[question.pk] = canonical[digest]
+            continue
+        canonical[digest] = question.pk
+        question.content_hash = digest
+        changed_questions.append(question)
+
+    if canonical_of:
+        for model, column, others in relations(Question, Choice):
+            relink(model, column, others, canonical_of)
+        Question.objects.filter(pk__in=canonical_of).delete()
+
+    Choice.objects.filter(pk__in=duplicate_choices).delete()
+    Choice.objects.bulk_update(
+        [choice for choice in changed_choices if choice.question_id not in canonical_of],
+        ["content_hash"],
+        batch_size=500,
+    )
+    Question.objects.bulk_update(changed_questions, ["content_hash"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0004_catalogversion'),
+        # Bài ngữ pháp và câu sai trỏ tới câu hỏi được chuyển sang bản giữ lại
+        ('grammar', '0004_grammarmistake'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='choice',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(merge_existing_duplicates, migrations.RunPython.noop),
+    ]
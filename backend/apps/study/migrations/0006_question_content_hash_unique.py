@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0005_question_content_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='question',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddConstraint(
+            model_name='choice',
+            constraint=models.UniqueConstraint(fields=('question', 'content_hash'), name='study_choice_unique_content'),
+        ),
+    ]
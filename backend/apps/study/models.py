@@ -1,5 +1,8 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+from .srs import DEFAULT_EASE
 
 class JlptLevel(models.TextChoices):
     N5 = "N5", "N5"
@@ -8,11 +11,36 @@ class JlptLevel(models.TextChoices):
     N2 = "N2", "N2"
     N1 = "N1", "N1"
 
+class ReviewSchedule(models.Model):
+    """
+    Lịch ôn tập (spaced repetition) của một mục, dùng chung cho các bảng
+    progress từng từ / từng kanji. Cách tính xem apps/study/srs.py.
+    """
+    ease_factor = models.FloatField(default=DEFAULT_EASE)
+    interval_days = models.PositiveIntegerField(
+        default=0,
+        help_text="Khoảng cách hiện tại giữa hai lần ôn (ngày)"
+    )
+    due_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Thời điểm cần ôn lại"
+    )
+    lapse_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Số lần quên sau khi đã nhớ"
+    )
+
+    class Meta:
+        abstract = True
+
 class Question(models.Model):
     prompt = models.TextField()
 
     audio = models.FileField(upload_to="audio/", null=True, blank=True)
 
+    # Hash nội dung (đề + audio + các lựa chọn), xem apps/study/questions.py
+    content_hash = models.CharField(max_length=64, null=True, blank=True, unique=True, editable=False)
+
     def __str__(self):
         return self.prompt[:50]
 
@@ -25,3 +53,24 @@ class Choice(models.Model):
     text = models.CharField(max_length=255)
     is_correct = models.BooleanField(default=False)
 
+    content_hash = models.CharField(max_length=64, null=True, blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["question", "content_hash"], name="study_choice_unique_content"),
+        ]
+
+
+class CatalogVersion(models.Model):
+    """
+    Phiên bản nội dung học (bài, từ, kanji, câu hỏi, đề thi...).
+    Chỉ có một dòng; version đổi mỗi khi nội dung được ghi (populate_* / admin),
+    stats là thống kê catalog đã tính sẵn cho stats_version.
+    """
+    version = models.CharField(max_length=32)
+    stats = models.JSONField(default=dict, blank=True)
+    stats_version = models.CharField(max_length=32, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.version
@@ -0,0 +1,115 @@
+import gzip
+import hashlib
+import re
+
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+from .catalog import get_catalog_version
+
+try:
+    import brotli
+except ImportError:  # brotli không bắt buộc, thiếu thì chỉ dùng gzip
+    brotli = None
+
+
+# Payload chi tiết bài học (từ vựng, đọc hiểu, nghe hiểu) chỉ phụ thuộc nội dung:
+# JSON được build một lần cho mỗi version nội dung, lưu trong cache dưới dạng
+# bytes đã encode kèm ETag là hash của chính nội dung. GET sau đó chỉ còn là
+# đọc cache và trả bytes, không query, không serialize.
+
+PREBUILT_TIMEOUT = 60 * 60 * 24
+
+# Payload nhỏ hơn ngưỡng này nén không đáng (header + CPU giải nén)
+MIN_COMPRESS_SIZE = 1024
+
+_ACCEPT_ENCODING_RE = re.compile(r"(?:^|,)\s*([\w*-]+)\s*(?:;\s*q=([\d.]+))?")
+
+
+def _encode(body):
+    """
+    Các bản mã hóa của body: {'identity': bytes, 'gzip': bytes, 'br': bytes}.
+    Nén một lần lúc build nên dùng mức nén cao nhất.
+    """
+    encodings = {"identity": body}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        encodings["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            encodings["br"] = brotli.compress(body, quality=11)
+    return encodings
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for coding, quality in _ACCEPT_ENCODING_RE.findall(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.lower())
+    return accepted
+
+
+def _choose_encoding(request, encodings):
+    accepted = _accepted_encodings(request)
+    for coding in ("br", "gzip"):
+        if coding in encodings and (coding in accepted or "*" in accepted):
+            return coding
+    return "identity"
+
+
+def get_prebuilt_payload(request, name, build, absolute_urls=False):
+    """
+    (encodings: dict, etag: str) của payload `name` ở version nội dung hiện tại.
+    encodings chứa body gốc ('identity') và các bản đã nén ('gzip', 'br').
+    build() trả về dữ liệu đã serialize, chỉ được gọi khi cache chưa có.
+    absolute_urls=True khi payload chứa URL tuyệt đối của file (audio, ảnh):
+    mỗi origin (scheme + host đã kiểm tra theo ALLOWED_HOSTS) có bản riêng.
+    """
+    key = f"prebuilt:{get_catalog_version()}:{name}"
+    if absolute_urls:
+        # get_host() báo DisallowedHost với Host không nằm trong ALLOWED_HOSTS
+        key = f"{key}:{request.scheme}://{request.get_host()}"
+    entry = cache.get(key)
+    if entry is None:
+        body = JSONRenderer().render(build())
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        entry = (_encode(body), etag)
+        cache.set(key, entry, PREBUILT_TIMEOUT)
+    return entry
+
+
+def prebuilt_json_response(request, name, build, absolute_urls=False):
+    """
+    Trả payload đã build sẵn với ETag mạnh; If-None-Match khớp -> 304.
+    Bản nén (br / gzip) được chọn theo Accept-Encoding và trả thẳng, không nén lại.
+
+        return prebuilt_json_response(request, f"vocab-lesson:{lesson_id}", build)
+    """
+    encodings, digest = get_prebuilt_payload(request, name, build, absolute_urls)
+    coding = _choose_encoding(request, encodings)
+    # Mỗi bản mã hóa là một representation khác -> ETag mạnh riêng
+    etag = f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    known_etags = {f'"{digest}"'} | {
+        f'"{digest}-{other}"' for other in encodings if other != "identity"
+    }
+    if if_none_match and (
+        known_etags.intersection(parse_etags(if_none_match)) or if_none_match.strip() == "*"
+    ):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(encodings[coding], content_type="application/json")
+        if coding != "identity":
+            response["Content-Encoding"] = coding
+
+    response["ETag"] = etag
+    if len(encodings) > 1:
+        patch_vary_headers(response, ("Accept-Encoding",))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,252 @@
+import hashlib
+import threading
+import unicodedata
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+
+from .models import Choice, Question
+
+
+# Kho câu hỏi (Question / Choice) dùng chung, định danh theo nội dung:
+# content_hash của câu hỏi là hash của đề, audio và tập lựa chọn (không phụ thuộc
+# thứ tự), của lựa chọn là hash của chữ. Hai câu cùng nội dung có cùng hash nên
+# populate_* dùng lại câu đã có thay vì chèn thêm, và DB chặn bản trùng khi ghi.
+# Các hàm merge nhận model làm tham số; migration 0005 giữ bản sao riêng của chúng.
+
+
+def normalize_text(text):
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def choice_hash(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def question_hash(prompt, audio, choices):
+    """choices: [(text, is_correct)]"""
+    parts = [normalize_text(prompt), audio or ""]
+    parts.extend(sorted(f"{int(bool(is_correct))}:{normalize_text(text)}" for text, is_correct in choices))
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+# =========================
+# GHI
+# =========================
+def get_or_create_question(prompt, choices, audio=None):
+    """
+    Câu hỏi có đúng nội dung (đề, audio, choices = [(text, is_correct)]);
+    chưa có thì tạo cùng các lựa chọn. Trả về Question.
+    """
+    digest = question_hash(prompt, getattr(audio, "name", audio), choices)
+    question = Question.objects.filter(content_hash=digest).first()
+    if question:
+        return question
+
+    try:
+        with transaction.atomic():
+            question = Question.objects.create(prompt=prompt, audio=audio, content_hash=digest)
+            Choice.objects.bulk_create([
+                Choice(question=question, text=text, is_correct=is_correct, content_hash=choice_hash(text))
+                for text, is_correct in choices
+            ])
+    except IntegrityError:
+        # Request / lệnh khác vừa tạo cùng câu hỏi
+        return Question.objects.get(content_hash=digest)
+    return question
+
+
+def refresh_question_hash(question):
+    """Tính lại content_hash của câu hỏi từ các lựa chọn đang có trong DB"""
+    choices = question.choices.values_list("text", "is_correct") if question.pk else []
+    question.content_hash = question_hash(question.prompt, question.audio.name, choices)
+    return question.content_hash
+
+
+def find_question(prompt, audio, choices, exclude=None):
+    """Câu hỏi (khác câu có pk exclude) có đúng nội dung này; không có thì None"""
+    digest = question_hash(prompt, getattr(audio, "name", audio), choices)
+    return Question.objects.filter(content_hash=digest).exclude(pk=exclude).first()
+
+
+# =========================
+# SỬA NHIỀU DÒNG
+# =========================
+_deferred = threading.local()
+
+
+@contextmanager
+def defer_question_hashes():
+    """
+    Admin lưu câu hỏi rồi mới lưu từng lựa chọn: tính hash sau mỗi lần ghi thì
+    trạng thái dở dang có thể trùng hash câu khác và vi phạm unique.
+    Trong khối with, signal chỉ ghi nhận câu hỏi đã đổi; hash tính một lần khi thoát.
+    """
+    if getattr(_deferred, "ids", None) is not None:
+        yield
+        return
+
+    _deferred.ids = ids = set()
+    try:
+        yield
+    finally:
+        _deferred.ids = None
+    for question in Question.objects.filter(pk__in=ids):
+        Question.objects.filter(pk=question.pk).update(content_hash=refresh_question_hash(question))
+
+
+def defer_question_hash(question_id):
+    """True nếu đang trong defer_question_hashes() (hash của câu hỏi sẽ tính khi thoát)"""
+    ids = getattr(_deferred, "ids", None)
+    if ids is None:
+        return False
+    if question_id is not None:
+        ids.add(question_id)
+    return True
+
+
+# =========================
+# GỘP BẢN TRÙNG
+# =========================
+def _relations(question_model, choice_model):
+    """
+    Các bảng trỏ tới câu hỏi (trừ Choice): [(model, tên cột FK, các cột cùng unique với FK)].
+    Bảng trung gian M2M (GrammarLesson.questions) cũng nằm trong đây.
+    """
+    relations = []
+    for rel in question_model._meta.related_objects:
+        if rel.many_to_many:
+            field = rel.field
+            through = field.remote_field.through
+            relations.append((
+                through,
+                through._meta.get_field(field.m2m_reverse_field_name()).attname,
+                [through._meta.get_field(field.m2m_field_name()).attname],
+            ))
+            continue
+        if rel.related_model is choice_model:
+            # Lựa chọn của bản trùng bị xóa theo câu hỏi (CASCADE)
+            continue
+
+        model = rel.related_model
+        unique_sets = [set(fields) for fields in model._meta.unique_together]
+        unique_sets += [
+            set(constraint.fields)
+            for constraint in model._meta.constraints
+            if getattr(constraint, "fields", None) and not getattr(constraint, "condition", None)
+        ]
+        others = next(
+            (sorted(fields - {rel.field.name}) for fields in unique_sets if rel.field.name in fields),
+            None,
+        )
+        relations.append((
+            model,
+            rel.field.attname,
+            [model._meta.get_field(name).attname for name in others] if others is not None else None,
+        ))
+    return relations
+
+
+def _relink(model, column, others, canonical_of):
+    """
+    Chuyển các dòng đang trỏ tới bản trùng sang câu giữ lại;
+    dòng sẽ trùng khóa unique với dòng đã có thì xóa. Trả về số dòng đã chuyển.
+    """
+    rows = list(model.objects.filter(**{f"{column}__in": canonical_of}).values_list("pk", column, *(others or [])))
+    if not rows:
+        return 0
+
+    existing = set()
+    if others is not None:
+        existing = set(
+            model.objects
+            .filter(**{f"{column}__in": set(canonical_of.values())})
+            .values_list(column, *others)
+        )
+
+    moves = defaultdict(list)
+    conflicts = []
+    for pk, duplicate_id, *other_values in rows:
+        target = canonical_of[duplicate_id]
+        key = (target, *other_values)
+        if others is not None and key in existing:
+            conflicts.append(pk)
+            continue
+        existing.add(key)
+        moves[target].append(pk)
+
+    for target, pks in moves.items():
+        model.objects.filter(pk__in=pks).update(**{column: target})
+    if conflicts:
+        model.objects.filter(pk__in=conflicts).delete()
+    return sum(len(pks) for pks in moves.values())
+
+
+def merge_duplicate_questions(question_model, choice_model, dry_run=False):
+    """
+    Tính lại content_hash của toàn bộ kho câu hỏi, gộp các câu cùng nội dung vào
+    câu có id nhỏ nhất (chuyển lại bài ngữ pháp, câu sai... trỏ tới chúng) và xóa
+    lựa chọn trùng chữ trong cùng một câu. Trả về thống kê.
+    """
+    choices_by_question = defaultdict(list)
+    # Lựa chọn đúng đứng trước để được giữ lại khi trùng chữ
+    for choice in choice_model.objects.order_by("-is_correct", "id").only(
+        "id", "question_id", "text", "is_correct", "content_hash"
+    ):
+        choices_by_question[choice.question_id].append(choice)
+
+    duplicate_choices = []
+    changed_choices = []
+    kept_choices = {}
+    for question_id, choices in choices_by_question.items():
+        seen = set()
+        kept = []
+        for choice in choices:
+            digest = choice_hash(choice.text)
+            if digest in seen:
+                duplicate_choices.append(choice.pk)
+                continue
+            seen.add(digest)
+            kept.append((choice.text, choice.is_correct))
+            if choice.content_hash != digest:
+                choice.content_hash = digest
+                changed_choices.append(choice)
+        kept_choices[question_id] = kept
+
+    canonical = {}
+    canonical_of = {}
+    changed_questions = []
+    for question in question_model.objects.order_by("id").only("id", "prompt", "audio", "content_hash"):
+        digest = question_hash(question.prompt, question.audio.name, kept_choices.get(question.pk, []))
+        if digest in canonical:
+            canonical_of[question.pk] = canonical[digest]
+            continue
+        canonical[digest] = question.pk
+        if question.content_hash != digest:
+            question.content_hash = digest
+            changed_questions.append(question)
+
+    stats = {
+        "questions": len(canonical) + len(canonical_of),
+        "duplicates": len(canonical_of),
+        "duplicate_choices": len(duplicate_choices),
+        "relinked": 0,
+    }
+    if dry_run:
+        return stats
+
+    with transaction.atomic():
+        if canonical_of:
+            for model, column, others in _relations(question_model, choice_model):
+                stats["relinked"] += _relink(model, column, others, canonical_of)
+            question_model.objects.filter(pk__in=canonical_of).delete()
+
+        choice_model.objects.filter(pk__in=duplicate_choices).delete()
+        choice_model.objects.bulk_update(
+            [choice for choice in changed_choices if choice.question_id not in canonical_of],
+            ["content_hash"],
+            batch_size=500,
+        )
+        question_model.objects.bulk_update(changed_questions, ["content_hash"], batch_size=500)
+    return stats
@@ -0,0 +1,94 @@
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+
+from .catalog import schedule_catalog_bump
+from .models import Choice, Question
+from .questions import choice_hash, defer_question_hash, refresh_question_hash
+
+
+# Các model nội dung học: ghi vào đây (populate_*, admin) làm đổi version catalog
+CONTENT_MODELS = [
+    "study.Question",
+    "study.Choice",
+    "vocab.VocabularyLesson",
+    "vocab.VocabularyWord",
+    "vocab.VocabularyExample",
+    "kanji.KanjiUnit",
+    "kanji.KanjiLesson",
+    "kanji.Kanji",
+    "kanji.KanjiVocabulary",
+    "kanji.KanjiComponent",
+    "grammar.GrammarLesson",
+    "reading.ReadingLesson",
+    "reading.ReadingText",
+    "reading.ReadingQuestion",
+    "reading.ReadingChoice",
+    "listening.ListeningLesson",
+    "listening.ListeningVocabulary",
+    "listening.ListeningQuestion",
+    "listening.ListeningChoice",
+    "jlpt_practice.JLPTTest",
+    "jlpt_practice.JLPTSection",
+    "jlpt_practice.JLPTSubSection",
+    "jlpt_practice.JLPTQuestion",
+    "jlpt_practice.JLPTChoice",
+]
+
+
+def content_changed(sender, **kwargs):
+    schedule_catalog_bump()
+
+
+def hash_question(sender, instance, raw=False, **kwargs):
+    # Câu tạo qua get_or_create_question đã có hash; câu sửa (admin) tính lại theo choices trong DB
+    if raw or (instance.pk is None and instance.content_hash):
+        return
+    if defer_question_hash(instance.pk):
+        return
+    refresh_question_hash(instance)
+
+
+def question_saved(sender, instance, raw=False, **kwargs):
+    # Câu mới tạo trong defer_question_hashes() chỉ có pk sau khi lưu
+    if not raw:
+        defer_question_hash(instance.pk)
+
+
+def hash_choice(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance.content_hash = choice_hash(instance.text)
+
+
+def choice_changed(sender, instance, raw=False, **kwargs):
+    # Tập lựa chọn đổi -> hash của câu hỏi đổi; update() để không phát lại signal
+    if raw:
+        return
+    origin = kwargs.get("origin")
+    if origin is not None and getattr(origin, "model", type(origin)) is Question:
+        # Lựa chọn bị xóa theo câu hỏi
+        return
+    if defer_question_hash(instance.question_id):
+        return
+    question = Question.objects.filter(pk=instance.question_id).first()
+    if question:
+        Question.objects.filter(pk=question.pk).update(content_hash=refresh_question_hash(question))
+
+
+def connect_signals():
+    for label in CONTENT_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(content_changed, sender=model, dispatch_uid=f"catalog_save_{label}")
+        post_delete.connect(content_changed, sender=model, dispatch_uid=f"catalog_delete_{label}")
+
+    grammar_questions = apps.get_model("grammar.GrammarLesson").questions.through
+    m2m_changed.connect(content_changed, sender=grammar_questions, dispatch_uid="catalog_grammar_questions")
+
+    # Giữ content_hash của kho câu hỏi khớp nội dung khi ghi qua save() / delete()
+    pre_save.connect(hash_question, sender=Question, dispatch_uid="question_content_hash")
+    post_save.connect(question_saved, sender=Question, dispatch_uid="question_content_hash_deferred")
+    pre_save.connect(hash_choice, sender=Choice, dispatch_uid="choice_content_hash")
+    post_save.connect(choice_changed, sender=Choice, dispatch_uid="choice_question_hash_save")
+    post_delete.connect(choice_changed, sender=Choice, dispatch_uid="choice_question_hash_delete")
+
+    kanji_components = apps.get_model("kanji.Kanji").components.through
+    m2m_changed.connect(content_changed, sender=kanji_components, dispatch_uid="catalog_kanji_components")
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+
+
+# Lập lịch ôn tập kiểu SM-2 (SuperMemo 2) cho từng mục (từ vựng, kanji).
+# Mỗi mục có ease_factor, interval_days, due_at, lapse_count (xem ReviewSchedule
+# trong apps/study/models.py); hàng đợi "cần ôn" đọc theo index (user, due_at).
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# Trả lời sai: ôn lại sau vài phút trong cùng buổi học
+RELEARN_DELAY = timedelta(minutes=10)
+# Khoảng cách >= 21 ngày coi như đã thuộc lâu dài (thẻ "mature")
+MATURE_INTERVAL_DAYS = 21
+HARD_INTERVAL_FACTOR = 1.2
+EASY_BONUS = 1.3
+
+DEFAULT_DUE_LIMIT = 20
+MAX_DUE_LIMIT = 100
+
+
+class ReviewGrade(models.TextChoices):
+    AGAIN = "again", "Quên"
+    HARD = "hard", "Khó"
+    GOOD = "good", "Nhớ"
+    EASY = "easy", "Dễ"
+
+
+# Mức chất lượng 0-5 của SM-2 tương ứng với 4 nút trên app
+GRADE_QUALITY = {
+    ReviewGrade.AGAIN: 1,
+    ReviewGrade.HARD: 3,
+    ReviewGrade.GOOD: 4,
+    ReviewGrade.EASY: 5,
+}
+
+
+def next_interval(interval_days, ease_factor, grade):
+    """Khoảng cách (ngày) tới lần ôn sau khi trả lời đúng"""
+    if interval_days == 0:
+        interval = 1
+    elif interval_days == 1:
+        interval = 6
+    elif grade == ReviewGrade.HARD:
+        interval = interval_days * HARD_INTERVAL_FACTOR
+    else:
+        interval = interval_days * ease_factor
+
+    if grade == ReviewGrade.EASY:
+        interval *= EASY_BONUS
+    # Luôn tăng ít nhất một ngày so với lần trước
+    return max(round(interval), interval_days + 1)
+
+
+def apply_review(card, grade, now=None):
+    """
+    Cập nhật lịch ôn của một dòng progress sau một lần ôn (chưa save).
+    card: instance có các field của ReviewSchedule
+    """
+    now = now or timezone.now()
+    quality = GRADE_QUALITY[grade]
+
+    if quality < 3:
+        card.lapse_count += 1
+        card.interval_days = 0
+        card.ease_factor = max(MIN_EASE, card.ease_factor - 0.2)
+        card.due_at = now + RELEARN_DELAY
+        return card
+
+    card.interval_days = next_interval(card.interval_days, card.ease_factor, grade)
+    card.ease_factor = max(
+        MIN_EASE,
+        card.ease_factor + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02),
+    )
+    card.due_at = now + timedelta(days=card.interval_days)
+    return card
+
+
+def is_mature(card):
+    return card.interval_days >= MATURE_INTERVAL_DAYS
+
+
+def parse_due_limit(value):
+    """Số thẻ trả về của API cần ôn, giới hạn trong [1, MAX_DUE_LIMIT]"""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_DUE_LIMIT
+    return min(max(limit, 1), MAX_DUE_LIMIT)
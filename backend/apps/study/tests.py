@@ -1,3 +1,187 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.accounts.models import User
+from apps.grammar.models import GrammarLesson, GrammarMistake, GrammarProgress
+
+from .models import Choice, Question
+from .questions import get_or_create_question, question_hash
+
+
+class MediaViewTest(TestCase):
+    """GET /media/...: chỉ phục vụ thư mục nội dung công khai"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        root = Path(cls.media_root)
+        (root / "audio").mkdir()
+        (root / "audio" / "lesson.mp3").write_bytes(b"0123456789")
+        (root / "shadowing" / "audio").mkdir(parents=True)
+        (root / "shadowing" / "audio" / "private.mp3").write_bytes(b"secret")
+        cls.settings_override = override_settings(MEDIA_ROOT=cls.media_root, MEDIA_SENDFILE="")
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.media_root)
+        super().tearDownClass()
+
+    def test_serves_public_audio_with_range(self):
+        response = self.client.get("/media/audio/lesson.mp3", HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+
+    def test_rejects_traversal_out_of_public_prefix(self):
+        for path in (
+            "/media/audio/../shadowing/audio/private.mp3",
+            "/media/audio/%2e%2e/shadowing/audio/private.mp3",
+            "/media/audio/..%5Cshadowing/audio/private.mp3",
+        ):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
+
+
+class DedupeQuestionsCommandTest(TestCase):
+    """dedupe_questions: gộp câu trùng vào câu id nhỏ nhất, nối lại bài ngữ pháp và câu sai"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create không phát signal -> chưa có content_hash, giống dữ liệu ghi hàng loạt
+        cls.keeper, cls.duplicate, cls.other, cls.messy = Question.objects.bulk_create([
+            Question(prompt="学生です"),
+            Question(prompt="学生です "),
+            Question(prompt="先生です"),
+            Question(prompt=" 学生です"),
+        ])
+        Choice.objects.bulk_create([
+            Choice(question=cls.keeper, text="は", is_correct=True),
+            Choice(question=cls.keeper, text="が"),
+            Choice(question=cls.duplicate, text="が"),
+            Choice(question=cls.duplicate, text="は", is_correct=True),
+            Choice(question=cls.other, text="は", is_correct=True),
+            Choice(question=cls.other, text="を"),
+            # Trùng chữ trong cùng câu: chỉ giữ một lựa chọn -> câu trở thành bản trùng
+            Choice(question=cls.messy, text="は", is_correct=True),
+            Choice(question=cls.messy, text="が"),
+            Choice(question=cls.messy, text=" が"),
+        ])
+
+        cls.user = User.objects.create_user(email="dedupe-a@example.com", password="x")
+        cls.other_user = User.objects.create_user(email="dedupe-b@example.com", password="x")
+        cls.lesson = GrammarLesson.objects.create(level="N5", order=1, title="Bài 1", grammar_point_count=1, content="")
+        cls.second_lesson = GrammarLesson.objects.create(
+            level="N5", order=2, title="Bài 2", grammar_point_count=1, content=""
+        )
+        cls.lesson.questions.add(cls.keeper, cls.duplicate)
+        cls.second_lesson.questions.add(cls.duplicate, cls.other, cls.messy)
+        GrammarProgress.objects.create(user=cls.user, lesson=cls.lesson, correct_count=2)
+
+        GrammarMistake.objects.create(user=cls.user, question=cls.keeper, wrong_count=3)
+        GrammarMistake.objects.create(user=cls.user, question=cls.duplicate, wrong_count=1)
+        GrammarMistake.objects.create(user=cls.other_user, question=cls.messy, wrong_count=2)
+
+    def _run(self, *args):
+        out = StringIO()
+        call_command("dedupe_questions", *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_only_counts(self):
+        output = self._run("--dry-run")
+        self.assertIn("4 câu hỏi, 2 câu trùng, 1 lựa chọn trùng", output)
+        self.assertEqual(Question.objects.count(), 4)
+        self.assertEqual(GrammarMistake.objects.filter(question=self.duplicate).count(), 1)
+
+    def test_merges_duplicates_and_relinks_dependents(self):
+        self._run()
+
+        self.assertEqual(
+            set(Question.objects.values_list("pk", flat=True)), {self.keeper.pk, self.other.pk}
+        )
+        self.assertEqual(self.keeper.choices.count(), 2)
+        self.keeper.refresh_from_db()
+        self.assertEqual(self.keeper.content_hash, question_hash("学生です", "", [("は", True), ("が", False)]))
+
+        # M2M: bài đã có câu giữ lại không bị thêm dòng trùng
+        self.assertEqual(list(self.lesson.questions.values_list("pk", flat=True)), [self.keeper.pk])
+        self.assertEqual(
+            set(self.second_lesson.questions.values_list("pk", flat=True)), {self.keeper.pk, self.other.pk}
+        )
+
+        # Câu sai: (user, question) là unique -> dòng của bản trùng bị bỏ nếu user đã có câu giữ lại
+        self.assertEqual(
+            set(GrammarMistake.objects.values_list("user_id", "question_id", "wrong_count")),
+            {(self.user.pk, self.keeper.pk, 3), (self.other_user.pk, self.keeper.pk, 2)},
+        )
+        # Tiến độ theo bài không bị ảnh hưởng
+        self.assertEqual(GrammarProgress.objects.get(user=self.user, lesson=self.lesson).correct_count, 2)
+
+        self.assertIn("0 câu trùng, 0 lựa chọn trùng", self._run("--dry-run"))
+
+
+class QuestionAdminDuplicateTest(TestCase):
+    """Sửa câu hỏi / lựa chọn trong admin thành nội dung đã có: lỗi trên form, không IntegrityError"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="question-admin@example.com", password="x")
+        cls.existing = get_or_create_question("学生です", [("は", True), ("が", False)])
+        cls.question = get_or_create_question("先生です", [("は", True), ("を", False)])
+
+    def setUp(self):
+        # raise_request_exception mặc định bật: IntegrityError sẽ làm test lỗi
+        self.client.force_login(self.admin)
+
+    def _post_question(self, prompt, choices):
+        existing = list(self.question.choices.order_by("id"))
+        data = {
+            "prompt": prompt,
+            "choices-TOTAL_FORMS": str(len(choices)),
+            "choices-INITIAL_FORMS": str(len(existing)),
+            "choices-MIN_NUM_FORMS": "0",
+            "choices-MAX_NUM_FORMS": "1000",
+        }
+        for index, (text, is_correct) in enumerate(choices):
+            data[f"choices-{index}-id"] = existing[index].pk
+            data[f"choices-{index}-question"] = self.question.pk
+            data[f"choices-{index}-text"] = text
+            if is_correct:
+                data[f"choices-{index}-is_correct"] = "on"
+        return self.client.post(f"/admin/study/question/{self.question.pk}/change/", data)
+
+    def test_question_edit_into_existing_content_shows_form_error(self):
+        response = self._post_question("学生です", [("は", True), ("が", False)])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f"Đã có câu hỏi cùng nội dung (id={self.existing.pk}).")
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.prompt, "先生です")
+
+    def test_question_edit_with_repeated_choices_shows_form_error(self):
+        response = self._post_question("先生です", [("は", True), ("は ", False)])
+        self.assertContains(response, "Các lựa chọn của câu hỏi bị trùng nhau.")
+
+    def test_choice_edit_into_existing_content_shows_form_error(self):
+        choice = self.question.choices.get(text="を")
+        self.question.prompt = "学生です"
+        self.question.save()
+
+        response = self.client.post(
+            f"/admin/study/choice/{choice.pk}/change/", {"question": self.question.pk, "text": "が"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f"Đã có câu hỏi cùng nội dung (id={self.existing.pk}).")
+        choice.refresh_from_db()
+        self.assertEqual(choice.text, "を")
+
+    def test_valid_question_edit_updates_hash(self):
+        response = self._post_question("先生です", [("は", True), ("に", False)])
+        self.assertEqual(response.status_code, 302)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.content_hash, question_hash("先生です", "", [("は", True), ("に", False)]))
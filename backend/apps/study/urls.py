@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.urls import re_path
+
+from .media import PUBLIC_MEDIA_PREFIXES, media_view
+
+
+# File nội dung được phục vụ ngay tại MEDIA_URL để URL trong các API
+# (audio_url, image...) không đổi
+MEDIA_PREFIX = settings.MEDIA_URL.lstrip("/")
+
+urlpatterns = [
+    re_path(
+        rf"^{MEDIA_PREFIX}(?P<path>{prefix}.+)$",
+        media_view,
+        name=f"media-{prefix.strip('/').replace('/', '-')}"
+    )
+    for prefix in PUBLIC_MEDIA_PREFIXES
+]
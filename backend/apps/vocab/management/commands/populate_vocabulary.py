@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand
+from apps.study.catalog import schedule_catalog_bump
 from django.db import transaction
 from apps.vocab.models import (
     VocabularyLesson, VocabularyWord, VocabularyExample,
@@ -13,19 +14,19 @@ class Command(BaseCommand):
         parser.add_argument('--clear', action='store_true', help='Clear existing data before populating')
 
     def handle(self, *args, **options):
-        if options['clear']:
-            self.stdout.write('Clearing existing vocabulary data...')
-            VocabularyFavorite.objects.all().delete()
-            VocabularyWordProgress.objects.all().delete()
-            VocabularyLessonProgress.objects.all().delete()
-            VocabularyExample.objects.all().delete()
-            VocabularyWord.objects.all().delete()
-            VocabularyLesson.objects.all().delete()
-            self.stdout.write(self.style.SUCCESS('Data cleared'))
+        with transaction.atomic():
+            if options['clear']:
+                self.stdout.write('Clearing existing vocabulary data...')
+                VocabularyFavorite.objects.all().delete()
+                VocabularyWordProgress.objects.all().delete()
+                VocabularyLessonProgress.objects.all().delete()
+                VocabularyExample.objects.all().delete()
+                VocabularyWord.objects.all().delete()
+                VocabularyLesson.objects.all().delete()
+                self.stdout.write(self.style.SUCCESS('Data cleared'))
 
-        self.stdout.write('Starting vocabulary data population...')
+            self.stdout.write('Starting vocabulary data population...')
         
-        with transaction.atomic():
             # N5 LESSONS
             self.create_n5_lessons()
             # N4 LESSONS
@@ -33,6 +34,10 @@ class Command(BaseCommand):
             # N3 LESSONS
             self.create_n3_lessons()
 
+            # Nội dung đã đổi -> thống kê catalog (số bài, số từ...) phải tính lại;
+            # version đổi một lần khi transaction commit
+            schedule_catalog_bump()
+
         self.stdout.write(self.style.SUCCESS('\nSuccessfully populated vocabulary data!'))
         self.stdout.write(f'Total lessons: {VocabularyLesson.objects.count()}')
         self.stdout.write(f'Total words: {VocabularyWord.objects.count()}')
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:20
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def schedule_existing_progress(apps, schema_editor):
+    # Các mục đã học trước khi có lịch ôn: cần ôn ngay từ lần ôn gần nhất
+    VocabularyWordProgress = apps.get_model('vocab', 'VocabularyWordProgress')
+    VocabularyWordProgress.objects.update(due_at=F('last_reviewed_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocab', '0002_alter_vocabularywordprogress_last_reviewed_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vocabularywordprogress',
+            name='due_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Thời điểm cần ôn lại'),
+        ),
+        migrations.AddField(
+            model_name='vocabularywordprogress',
+            name='ease_factor',
+            field=models.FloatField(default=2.5),
+        ),
+        migrations.AddField(
+            model_name='vocabularywordprogress',
+            name='interval_days',
+            field=models.PositiveIntegerField(default=0, help_text='Khoảng cách hiện tại giữa hai lần ôn (ngày)'),
+        ),
+        migrations.AddField(
+            model_name='vocabularywordprogress',
+            name='lapse_count',
+            field=models.PositiveIntegerField(default=0, help_text='Số lần quên sau khi đã nhớ'),
+        ),
+        migrations.AddField(
+            model_name='vocabularywordprogress',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(schedule_existing_progress, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vocabularywordprogress',
+            index=models.Index(fields=['user', 'due_at'], name='vocab_word_progress_due_idx'),
+        ),
+    ]
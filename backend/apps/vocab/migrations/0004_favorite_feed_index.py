@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocab', '0003_vocabularywordprogress_review_schedule'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vocabularyfavorite',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='vocab_favorite_feed_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
-from apps.study.models import JlptLevel
+from django.utils import timezone
+from apps.study.models import JlptLevel, ReviewSchedule
 
 class VocabularyLesson(models.Model):
     """
@@ -116,7 +117,7 @@ class VocabularyLessonProgress(models.Model):
     class Meta:
         unique_together = ("user", "lesson")
 
-class VocabularyWordProgress(models.Model):
+class VocabularyWordProgress(ReviewSchedule):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
@@ -131,12 +132,22 @@ class VocabularyWordProgress(models.Model):
         default=False
     )
 
+    # Thời điểm ôn trên thiết bị (không dùng auto_now: đồng bộ offline gửi kèm
+    # thời điểm thật và dùng nó để giải quyết xung đột)
     last_reviewed_at = models.DateTimeField(
-        auto_now=True
+        default=timezone.now
+    )
+
+    review_count = models.PositiveIntegerField(
+        default=0
     )
 
     class Meta:
         unique_together = ("user", "word")
+        indexes = [
+            # Hàng đợi cần ôn: WHERE user_id = ? AND due_at <= now ORDER BY due_at
+            models.Index(fields=["user", "due_at"], name="vocab_word_progress_due_idx"),
+        ]
 
 class VocabularyFavorite(models.Model):
     user = models.ForeignKey(
@@ -155,4 +166,8 @@ class VocabularyFavorite(models.Model):
 
     class Meta:
         unique_together = ("user", "word")
+        indexes = [
+            # Danh sách yêu thích phân trang keyset: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+            models.Index(fields=["user", "-created_at", "-id"], name="vocab_favorite_feed_idx"),
+        ]
 
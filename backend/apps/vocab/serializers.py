@@ -3,9 +3,11 @@ from .models import (
     VocabularyLesson,
     VocabularyWord,
     VocabularyExample,
-    VocabularyLessonProgress,
+    VocabularyWordProgress,
     VocabularyFavorite,
 )
+from apps.study.srs import ReviewGrade
+from .services import MAX_SYNC_UPDATES
 
 class VocabularyExampleSerializer(serializers.ModelSerializer):
     class Meta:
@@ -48,15 +50,12 @@ class VocabularyLessonListSerializer(serializers.ModelSerializer):
             "progress",
         ]
 
+    # word_count được annotate sẵn, progress_map do view nạp một lần cho cả danh sách
     def get_wordCount(self, obj):
-        return obj.words.count()
+        return obj.word_count
 
     def get_status(self, obj):
-        user = self.context["request"].user
-        progress = VocabularyLessonProgress.objects.filter(
-            user=user,
-            lesson=obj
-        ).first()
+        progress = self.context.get("progress_map", {}).get(obj.id)
 
         if not progress:
             return "not-started"
@@ -67,13 +66,9 @@ class VocabularyLessonListSerializer(serializers.ModelSerializer):
         return "in-progress"
 
     def get_progress(self, obj):
-        user = self.context["request"].user
-        progress = VocabularyLessonProgress.objects.filter(
-            user=user,
-            lesson=obj
-        ).first()
+        progress = self.context.get("progress_map", {}).get(obj.id)
 
-        total = obj.words.count()
+        total = obj.word_count
 
         if not progress or total == 0:
             return 0
@@ -91,3 +86,44 @@ class VocabularyLessonDetailSerializer(serializers.ModelSerializer):
             "title",
             "words",
         ]
+
+class VocabularyWordProgressSyncItemSerializer(serializers.Serializer):
+    word_id = serializers.IntegerField()
+    is_learned = serializers.BooleanField()
+    reviewed_at = serializers.DateTimeField()
+    # Nút đã bấm khi ôn offline; không gửi thì suy ra từ is_learned
+    grade = serializers.ChoiceField(choices=ReviewGrade.choices, required=False)
+
+class VocabularyWordProgressSyncStateSerializer(serializers.Serializer):
+    word_id = serializers.IntegerField()
+    is_learned = serializers.BooleanField()
+    reviewed_at = serializers.DateTimeField()
+    due_at = serializers.DateTimeField()
+
+class VocabularyWordProgressSyncSerializer(serializers.Serializer):
+    updates = VocabularyWordProgressSyncItemSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=MAX_SYNC_UPDATES
+    )
+
+class VocabularyReviewCardSerializer(serializers.ModelSerializer):
+    word = VocabularyWordSerializer(read_only=True)
+
+    class Meta:
+        model = VocabularyWordProgress
+        fields = [
+            "id",
+            "word",
+            "is_learned",
+            "review_count",
+            "last_reviewed_at",
+            "ease_factor",
+            "interval_days",
+            "due_at",
+            "lapse_count",
+        ]
+
+class VocabularyReviewSerializer(serializers.Serializer):
+    word_id = serializers.IntegerField()
+    grade = serializers.ChoiceField(choices=ReviewGrade.choices)
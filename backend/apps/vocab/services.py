@@ -0,0 +1,117 @@
+from django.db import transaction
+from django.utils import timezone
+
+from apps.notebook.models import NotebookCategory
+from apps.notebook.signals import schedule_rollup_refresh
+from apps.study.srs import ReviewGrade, apply_review
+
+from .models import VocabularyWord, VocabularyWordProgress
+
+
+# Số bản ghi tối đa trong một lần đồng bộ
+MAX_SYNC_UPDATES = 1000
+
+
+# =========================
+# ĐỒNG BỘ PROGRESS OFFLINE
+# =========================
+def _pending_reviews(updates, now):
+    """
+    Các lần ôn trong lô theo từng từ, xếp theo thời điểm ôn.
+    Thời điểm ở tương lai (đồng hồ thiết bị chạy nhanh) bị kẹp về thời điểm server.
+    Không gửi grade thì suy ra từ is_learned: nhớ -> good, chưa nhớ -> again.
+    """
+    reviews = {}
+    for item in updates:
+        grade = item.get('grade') or (ReviewGrade.GOOD if item['is_learned'] else ReviewGrade.AGAIN)
+        reviews.setdefault(item['word_id'], []).append({
+            'is_learned': item['is_learned'],
+            'grade': grade,
+            'reviewed_at': min(item['reviewed_at'], now),
+        })
+    for items in reviews.values():
+        items.sort(key=lambda item: item['reviewed_at'])
+    return reviews
+
+
+def sync_word_progress(user, updates):
+    """
+    Ghi một lô progress từ thiết bị offline.
+    updates: [{'word_id': int, 'is_learned': bool, 'reviewed_at': datetime, 'grade': ReviewGrade?}]
+
+    Các lần ôn sau lần ôn cuối server đã biết được tính lịch ôn (SM-2) lần lượt
+    theo thời điểm ôn thật, như khi ôn online; lần ôn cũ hơn hoặc bằng thì giữ
+    dữ liệu server. Các dòng đổi được upsert trong một câu lệnh.
+
+    Trả về {'applied': [word_id], 'stale': [word_id], 'unknown': [word_id],
+            'progress': [{'word_id', 'is_learned', 'reviewed_at', 'due_at'}]}
+    """
+    reviews = _pending_reviews(updates, timezone.now())
+
+    word_levels = dict(
+        VocabularyWord.objects.filter(pk__in=reviews).values_list('pk', 'lesson__jlpt_level')
+    )
+    unknown = sorted(set(reviews) - set(word_levels))
+
+    with transaction.atomic():
+        # Khóa các dòng hiện có để hai lần đồng bộ cùng lúc không ghi đè nhau
+        existing = {
+            progress.word_id: progress
+            for progress in VocabularyWordProgress.objects.select_for_update().filter(
+                user=user, word_id__in=word_levels
+            )
+        }
+
+        winners = []
+        for word_id, items in reviews.items():
+            if word_id not in word_levels:
+                continue
+            card = existing.get(word_id)
+            if card is not None:
+                items = [item for item in items if item['reviewed_at'] > card.last_reviewed_at]
+            else:
+                card = VocabularyWordProgress(user=user, word_id=word_id)
+            if not items:
+                continue
+
+            for item in items:
+                apply_review(card, item['grade'], item['reviewed_at'])
+                card.review_count += 1
+                card.last_reviewed_at = item['reviewed_at']
+            card.is_learned = items[-1]['is_learned']
+            winners.append(card)
+
+        if winners:
+            VocabularyWordProgress.objects.bulk_create(
+                winners,
+                update_conflicts=True,
+                unique_fields=['user', 'word'],
+                update_fields=[
+                    'is_learned', 'last_reviewed_at', 'review_count',
+                    'ease_factor', 'interval_days', 'due_at', 'lapse_count',
+                ],
+            )
+
+        # bulk_create không phát signal -> tự đánh dấu rollup notebook cần tính lại
+        for level in {word_levels[progress.word_id] for progress in winners}:
+            schedule_rollup_refresh(user.pk, NotebookCategory.VOCAB, level)
+
+        progress = [
+            {
+                'word_id': row['word_id'],
+                'is_learned': row['is_learned'],
+                'reviewed_at': row['last_reviewed_at'],
+                'due_at': row['due_at'],
+            }
+            for row in VocabularyWordProgress.objects.filter(
+                user=user, word_id__in=word_levels
+            ).order_by('word_id').values('word_id', 'is_learned', 'last_reviewed_at', 'due_at')
+        ]
+
+    applied = sorted(progress.word_id for progress in winners)
+    return {
+        'applied': applied,
+        'stale': sorted(set(word_levels) - set(applied)),
+        'unknown': unknown,
+        'progress': progress,
+    }
@@ -1,3 +1,45 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.study.catalog import bump_catalog_version, clear_catalog_cache
+from apps.study.instrumentation import query_budget
+
+from .models import VocabularyLesson, VocabularyLessonProgress, VocabularyWord
+
+
+class VocabularyLessonListQueryBudgetTest(TestCase):
+    """
+    GET /api/vocab/lessons/: số từ đếm trong cùng query danh sách bài,
+    progress của user lấy một lần cho cả danh sách.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='vocab-budget@example.com', password='x')
+        for order in range(1, 6):
+            lesson = VocabularyLesson.objects.create(jlpt_level='N5', order=order, title=f'Bài {order}')
+            for word_order in range(1, 4):
+                VocabularyWord.objects.create(
+                    lesson=lesson, kanji='語', hiragana='ご', vietnamese='NGỮ', meaning='x', order=word_order
+                )
+            if order <= 3:
+                VocabularyLessonProgress.objects.create(user=cls.user, lesson=lesson, completed_words=order)
+        # on_commit không chạy trong TestCase -> tạo version nội dung như populate_* khi commit
+        bump_catalog_version()
+
+    def setUp(self):
+        cache.clear()
+        clear_catalog_cache()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_has_no_repeated_queries(self):
+        # Request đầu nạp version / thống kê nội dung vào cache
+        self.client.get('/api/vocab/lessons/', {'level': 'N5'})
+        # watermark progress + progress của user + bài
+        with query_budget(3):
+            response = self.client.get('/api/vocab/lessons/', {'level': 'N5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 5)
@@ -3,6 +3,9 @@ from .views import (
     VocabularyLessonListAPIView,
     VocabularyLessonDetailAPIView,
     VocabularyLessonProgressAPIView,
+    VocabularyWordProgressSyncAPIView,
+    VocabularyReviewDueAPIView,
+    VocabularyReviewAPIView,
     VocabularyFavoriteToggleAPIView,
 )
 
@@ -25,6 +28,24 @@ urlpatterns = [
         name="vocabulary-lesson-progress"
     ),
 
+    path(
+        "words/progress/sync/",
+        VocabularyWordProgressSyncAPIView.as_view(),
+        name="vocabulary-word-progress-sync"
+    ),
+
+    path(
+        "reviews/due/",
+        VocabularyReviewDueAPIView.as_view(),
+        name="vocabulary-review-due"
+    ),
+
+    path(
+        "reviews/",
+        VocabularyReviewAPIView.as_view(),
+        name="vocabulary-review"
+    ),
+
     path(
         "words/<int:word_id>/favorite/",
         VocabularyFavoriteToggleAPIView.as_view(),
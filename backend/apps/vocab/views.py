@@ -1,33 +1,56 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
+from apps.study.catalog import VOCAB, get_lesson_stat
+from apps.study.conditional import conditional_on_progress
+from apps.study.payloads import prebuilt_json_response
+from apps.study.srs import ReviewGrade, apply_review, parse_due_limit
 from .models import (
     VocabularyLesson,
     VocabularyLessonProgress,
+    VocabularyWord,
+    VocabularyWordProgress,
     VocabularyFavorite,
 )
 from .serializers import (
     VocabularyLessonListSerializer,
     VocabularyLessonDetailSerializer,
+    VocabularyWordProgressSyncStateSerializer,
+    VocabularyWordProgressSyncSerializer,
+    VocabularyReviewCardSerializer,
+    VocabularyReviewSerializer,
 )
+from .services import sync_word_progress
 
 class VocabularyLessonListAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_on_progress((VocabularyLessonProgress, "last_studied_at"))
     def get(self, request):
         level = request.query_params.get("level")
 
-        qs = VocabularyLesson.objects.all()
+        qs = VocabularyLesson.objects.annotate(word_count=Count("words")).order_by("jlpt_level", "order")
 
         if level:
             qs = qs.filter(jlpt_level=level)
 
+        progress_map = {
+            p.lesson_id: p
+            for p in VocabularyLessonProgress.objects.filter(
+                user=request.user,
+                lesson__in=qs.values("id")
+            )
+        }
+
         serializer = VocabularyLessonListSerializer(
             qs,
             many=True,
-            context={"request": request}
+            context={"request": request, "progress_map": progress_map}
         )
         return Response(serializer.data)
 
@@ -35,10 +58,15 @@ class VocabularyLessonDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, lesson_id):
-        lesson = get_object_or_404(VocabularyLesson, id=lesson_id)
+        def build():
+            lesson = get_object_or_404(
+                VocabularyLesson.objects.prefetch_related("words__examples"),
+                id=lesson_id
+            )
+            return VocabularyLessonDetailSerializer(lesson).data
 
-        serializer = VocabularyLessonDetailSerializer(lesson)
-        return Response(serializer.data)
+        # Nội dung bài không phụ thuộc user -> JSON build sẵn theo version nội dung
+        return prebuilt_json_response(request, f"vocab-lesson:{lesson_id}", build)
 
 class VocabularyLessonProgressAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -55,7 +83,7 @@ class VocabularyLessonProgressAPIView(APIView):
 
         progress.completed_words = completed_words
 
-        if completed_words >= lesson.words.count():
+        if completed_words >= get_lesson_stat(VOCAB, lesson.id):
             progress.is_completed = True
 
         progress.save()
@@ -66,6 +94,83 @@ class VocabularyLessonProgressAPIView(APIView):
             "is_completed": progress.is_completed
         })
 
+class VocabularyWordProgressSyncAPIView(APIView):
+    """
+    POST /api/vocab/words/progress/sync/
+    Đồng bộ progress từng từ đã ôn offline:
+    {"updates": [{"word_id": 1, "is_learned": true, "reviewed_at": "2026-01-01T08:00:00Z", "grade": "good"}, ...]}
+    (grade không bắt buộc). Các lần ôn được tính lịch ôn như POST /api/vocab/reviews/.
+
+    Trả về trạng thái sau khi đối chiếu của các từ trong lô để thiết bị ghi đè bản local.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = VocabularyWordProgressSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = sync_word_progress(request.user, serializer.validated_data["updates"])
+
+        return Response({
+            "applied": result["applied"],
+            "stale": result["stale"],
+            "unknown_word_ids": result["unknown"],
+            "progress": VocabularyWordProgressSyncStateSerializer(result["progress"], many=True).data,
+        })
+
+class VocabularyReviewDueAPIView(APIView):
+    """
+    GET /api/vocab/reviews/due/?limit=20
+    Các từ đến hạn ôn, hạn sớm nhất trước (đọc theo index user + due_at)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        limit = parse_due_limit(request.query_params.get("limit"))
+
+        cards = list(
+            VocabularyWordProgress.objects
+            .filter(user=request.user, due_at__lte=timezone.now())
+            .order_by("due_at")
+            .select_related("word")
+            .prefetch_related("word__examples")[:limit + 1]
+        )
+
+        return Response({
+            "cards": VocabularyReviewCardSerializer(cards[:limit], many=True).data,
+            "has_more": len(cards) > limit,
+        })
+
+class VocabularyReviewAPIView(APIView):
+    """
+    POST /api/vocab/reviews/
+    Ghi kết quả một lần ôn: {"word_id": 1, "grade": "again" | "hard" | "good" | "easy"}
+    và tính lịch ôn tiếp theo
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = VocabularyReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        word = get_object_or_404(VocabularyWord, id=serializer.validated_data["word_id"])
+        grade = serializer.validated_data["grade"]
+        now = timezone.now()
+
+        with transaction.atomic():
+            progress, _ = VocabularyWordProgress.objects.select_for_update().get_or_create(
+                user=request.user,
+                word=word
+            )
+            apply_review(progress, grade, now)
+            progress.review_count += 1
+            progress.last_reviewed_at = now
+            if grade != ReviewGrade.AGAIN:
+                progress.is_learned = True
+            progress.save()
+
+        return Response(VocabularyReviewCardSerializer(progress).data)
+
 class VocabularyFavoriteToggleAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -58,6 +58,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Ngoài cùng để đo cả query của các middleware bên trong (auth, session)
+    'apps.study.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -124,6 +126,18 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=7),
 }
 
+# Cache
+# Mặc định dùng LocMem (mỗi process một cache). Production nên trỏ tới cache dùng
+# chung giữa các worker, VD: CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://127.0.0.1:6379/1
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -149,3 +163,13 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Phục vụ file media (audio bài học): "" = Django tự stream (có hỗ trợ Range),
+# "x-accel-redirect" = giao cho nginx (location internal trỏ tới MEDIA_ROOT),
+# "x-sendfile" = giao cho Apache mod_xsendfile
+MEDIA_SENDFILE = os.getenv("MEDIA_SENDFILE", "")
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", 60 * 60 * 24 * 30))
+
+# Đo query từng request (header Server-Timing, cảnh báo N+1): luôn bật khi DEBUG,
+# bật thêm ở môi trường khác bằng QUERY_INSTRUMENTATION=1
+QUERY_INSTRUMENTATION = os.getenv("QUERY_INSTRUMENTATION", "") == "1"
@@ -36,6 +36,8 @@ urlpatterns = [
     path("api/jlpt-practice/", include("apps.jlpt_practice.urls")),
     path("api/notebook/", include("apps.notebook.urls")),
     path("api/shadowing/", include("apps.shadowing.urls")),
+    # Audio / ảnh bài học (Range, ETag, X-Accel-Redirect)
+    path("", include("apps.study.urls")),
 ]
 
 if settings.DEBUG:
@@ -23,3 +23,29 @@ export const getGrammarLessonDetail = (lessonId) => {
 export const submitGrammarProgress = (data) => {
     return api.post(`/grammar/progress/`, data);
 };
+
+/**
+ * Lấy một điểm ngữ pháp đã tách sẵn của bài (theo mục lục `sections` trong chi tiết bài)
+ * GET /grammar/lessons/:id/sections/:index/
+ */
+export const getGrammarLessonSection = (lessonId, index) => {
+    return api.get(`/grammar/lessons/${lessonId}/sections/${index}/`);
+};
+
+/**
+ * Lấy bộ luyện tập ngẫu nhiên (trộn các câu từng làm sai)
+ * GET /grammar/practice/?level=N4&count=30&lessons=1-5&mistakes=0.5
+ */
+export const getGrammarPracticeSet = (level, { count, lessons, mistakes, seed } = {}) => {
+    return api.get(`/grammar/practice/`, {
+        params: { level, count, lessons, mistakes, seed },
+    });
+};
+
+/**
+ * Nộp bài luyện tập: { answers: { question_id: choice_id } }
+ * POST /grammar/practice/submit/
+ */
+export const submitGrammarPractice = (answers) => {
+    return api.post(`/grammar/practice/submit/`, { answers });
+};
@@ -28,3 +28,35 @@ export const getNotebookCategoryDetail = async (category) => {
   const response = await api.get(`/notebook/categories/${category}/`);
   return response.data;
 };
+
+/**
+ * Get level details of several categories in one request
+ * GET /api/notebook/categories/details/?categories=...
+ * 
+ * @param {Array<string>} [categories] - Category names, omit for all 6 categories
+ * @returns {Promise<Object>} { [category]: List of levels with detail }
+ */
+export const getNotebookCategoryDetails = async (categories) => {
+  const params = categories?.length ? { categories: categories.join(',') } : {};
+  const response = await api.get('/notebook/categories/details/', { params });
+  return response.data;
+};
+
+/**
+ * Get favorite vocabulary words and kanji, newest first
+ * GET /api/notebook/favorites/?type=...&limit=...&cursor=...
+ * 
+ * @param {Object} [options]
+ * @param {string} [options.type] - 'vocab' | 'kanji', omit for both
+ * @param {number} [options.limit] - Items per page (default 20, max 100)
+ * @param {string} [options.cursor] - next_cursor of the previous page
+ * @returns {Promise<Object>} { results: [{ type, id, created_at, item }], next_cursor }
+ */
+export const getFavorites = async ({ type, limit, cursor } = {}) => {
+  const params = {};
+  if (type) params.type = type;
+  if (limit) params.limit = limit;
+  if (cursor) params.cursor = cursor;
+  const response = await api.get('/notebook/favorites/', { params });
+  return response.data;
+};